@@ -0,0 +1,45 @@
+"""Home timeline table and users.follower_count
+
+Revision ID: 5c1f0e9a7b42
+Revises: 74bddff60833
+Create Date: 2026-10-18 19:52:40.113906
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1f0e9a7b42'
+down_revision: Union[str, Sequence[str], None] = '74bddff60833'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('follower_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        "UPDATE users u SET follower_count = f.n "
+        "FROM (SELECT followee_id, count(*) AS n FROM follows GROUP BY followee_id) f "
+        "WHERE u.id = f.followee_id"
+    )
+    op.create_table('timeline_entries',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('author_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'created_at', 'post_id')
+    )
+    op.create_index('ix_timeline_entries_post_id', 'timeline_entries', ['post_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_timeline_entries_post_id', table_name='timeline_entries')
+    op.drop_table('timeline_entries')
+    op.drop_column('users', 'follower_count')
@@ -0,0 +1,72 @@
+"""Index pack for repository queries and FK lookups
+
+Revision ID: 74bddff60833
+Revises: e0d32edd1b01
+Create Date: 2026-10-18 19:30:12.418207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '74bddff60833'
+down_revision: Union[str, Sequence[str], None] = 'e0d32edd1b01'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        # PostRepository.get_by_author_id (keyset page) + posts.author_id cascade
+        op.create_index(
+            'ix_posts_author_id_created_at_id', 'posts',
+            ['author_id', 'created_at', 'id'],
+            postgresql_concurrently=True,
+        )
+        # PostRepository.get_all (keyset page over live posts)
+        op.create_index(
+            'ix_posts_live_created_at_id', 'posts',
+            ['created_at', 'id'],
+            postgresql_where=sa.text('deleted_at IS NULL'),
+            postgresql_concurrently=True,
+        )
+        # comments.post_id cascade + per-post comment listing order
+        op.create_index(
+            'ix_comments_post_id_created_at_id', 'comments',
+            ['post_id', 'created_at', 'id'],
+            postgresql_concurrently=True,
+        )
+        # comments.author_id cascade
+        op.create_index(
+            'ix_comments_author_id', 'comments',
+            ['author_id'],
+            postgresql_concurrently=True,
+        )
+        # likes PK is (user_id, post_id); this serves lookups by post
+        op.create_index(
+            'ix_likes_post_id', 'likes',
+            ['post_id'],
+            postgresql_concurrently=True,
+        )
+        # follows PK is (follower_id, followee_id); this serves "followers of"
+        op.create_index(
+            'ix_follows_followee_id_follower_id', 'follows',
+            ['followee_id', 'follower_id'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_follows_followee_id_follower_id', table_name='follows', postgresql_concurrently=True)
+        op.drop_index('ix_likes_post_id', table_name='likes', postgresql_concurrently=True)
+        op.drop_index('ix_comments_author_id', table_name='comments', postgresql_concurrently=True)
+        op.drop_index('ix_comments_post_id_created_at_id', table_name='comments', postgresql_concurrently=True)
+        op.drop_index('ix_posts_live_created_at_id', table_name='posts', postgresql_concurrently=True)
+        op.drop_index('ix_posts_author_id_created_at_id', table_name='posts', postgresql_concurrently=True)
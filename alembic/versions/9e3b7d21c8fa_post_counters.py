@@ -0,0 +1,40 @@
+"""Denormalized like/comment counters on posts
+
+Revision ID: 9e3b7d21c8fa
+Revises: 5c1f0e9a7b42
+Create Date: 2026-10-18 20:14:05.772310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e3b7d21c8fa'
+down_revision: Union[str, Sequence[str], None] = '5c1f0e9a7b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('posts', sa.Column('like_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('posts', sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        "UPDATE posts p SET like_count = l.n "
+        "FROM (SELECT post_id, count(*) AS n FROM likes GROUP BY post_id) l "
+        "WHERE p.id = l.post_id"
+    )
+    op.execute(
+        "UPDATE posts p SET comment_count = c.n "
+        "FROM (SELECT post_id, count(*) AS n FROM comments GROUP BY post_id) c "
+        "WHERE p.id = c.post_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('posts', 'comment_count')
+    op.drop_column('posts', 'like_count')
@@ -0,0 +1,37 @@
+"""Row version and updated_at on posts and users
+
+Revision ID: b4e61f2d9a07
+Revises: 9e3b7d21c8fa
+Create Date: 2026-10-18 21:02:47.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e61f2d9a07'
+down_revision: Union[str, Sequence[str], None] = '9e3b7d21c8fa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Constant / stable defaults are stored in the catalog (no table rewrite);
+    # existing rows report the migration time as updated_at.
+    for table in ('posts', 'users'):
+        op.add_column(table, sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+        op.add_column(
+            table,
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ('users', 'posts'):
+        op.drop_column(table, 'updated_at')
+        op.drop_column(table, 'version')
@@ -0,0 +1,54 @@
+"""User tombstones and the background deletion queue
+
+Revision ID: c83f5a0d2e19
+Revises: b4e61f2d9a07
+Create Date: 2026-10-18 23:41:09.502317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c83f5a0d2e19'
+down_revision: Union[str, Sequence[str], None] = 'b4e61f2d9a07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Nullable without a default: catalog-only, no table rewrite.
+    op.add_column('users', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_table(
+        'user_deletions',
+        sa.Column('user_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('step', sa.String(length=32), nullable=False),
+        sa.Column('rows_deleted', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('requested_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('lease_owner', sa.String(length=32), nullable=True),
+        sa.Column('leased_until', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+    op.create_index(
+        'ix_user_deletions_pending_requested_at',
+        'user_deletions',
+        ['requested_at'],
+        unique=False,
+        postgresql_where=sa.text('finished_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        'ix_user_deletions_pending_requested_at',
+        table_name='user_deletions',
+        postgresql_where=sa.text('finished_at IS NULL'),
+    )
+    op.drop_table('user_deletions')
+    op.drop_column('users', 'deleted_at')
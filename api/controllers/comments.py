@@ -0,0 +1,36 @@
+from typing import Optional
+
+from fastapi import Request
+
+from core.responses import FastJSONResponse, success_response
+from models.comment import Comment
+from services.comment import CommentService
+
+
+def _comment_to_dict(comment: Comment) -> dict:
+    return {
+        "id": comment.id,
+        "post_id": comment.post_id,
+        "content": comment.content,
+        "created_at": comment.created_at,
+        "author": {
+            "id": comment.author.id,
+            "name": comment.author.name,
+        },
+    }
+
+
+def get_post_comments_controller(
+    request: Request, id: int, limit: int = 50, cursor: Optional[str] = None
+) -> FastJSONResponse:
+    """
+    Controller: get one page of a post's comments with author summaries.
+    """
+    db = request.state.db
+    service = CommentService()
+    page = service.get_comments(db, id, limit, cursor)
+
+    return success_response(
+        {"comments": [_comment_to_dict(comment) for comment in page.comments]},
+        meta={"limit": limit, "next_cursor": page.next_cursor},
+    )
@@ -0,0 +1,50 @@
+from typing import Optional
+
+from fastapi import Request
+
+from api.schemas.feed import FollowIn
+from core.responses import FastJSONResponse, success_response
+from dtos.feed import FollowDTO
+from services.feed import FeedService
+
+
+def get_feed_controller(
+    request: Request, user_id: int, limit: int = 50, cursor: Optional[str] = None
+) -> FastJSONResponse:
+    """
+    Controller: get one page of a user's home timeline.
+    """
+    db = request.state.db
+    service = FeedService()
+    page = service.get_feed(db, user_id, limit, cursor)
+
+    return success_response(
+        {"posts": page.posts},
+        meta={"limit": limit, "next_cursor": page.next_cursor},
+    )
+
+
+def follow_controller(request: Request, payload: FollowIn) -> FastJSONResponse:
+    """
+    Controller: translate HTTP payload into a service call.
+    """
+    db = request.state.db
+    service = FeedService()
+    service.follow(
+        db, FollowDTO(follower_id=payload.follower_id, followee_id=payload.followee_id)
+    )
+
+    return success_response({"message": "Followed successfully"})
+
+
+def unfollow_controller(request: Request, payload: FollowIn) -> FastJSONResponse:
+    """
+    Controller: translate HTTP payload into a service call.
+    """
+    db = request.state.db
+    service = FeedService()
+    service.unfollow(
+        db, FollowDTO(follower_id=payload.follower_id, followee_id=payload.followee_id)
+    )
+
+    return success_response({"message": "Unfollowed successfully"})
@@ -0,0 +1,28 @@
+from fastapi import Request
+
+from api.schemas.likes import LikeIn
+from core.responses import FastJSONResponse, success_response
+from dtos.likes import LikeDTO
+from services.like import LikeService
+
+
+def like_post_controller(request: Request, payload: LikeIn) -> FastJSONResponse:
+    """
+    Controller: translate HTTP payload into a service call.
+    """
+    db = request.state.db
+    service = LikeService()
+    result = service.like(db, LikeDTO(user_id=payload.user_id, post_id=payload.post_id))
+
+    return success_response(result)
+
+
+def unlike_post_controller(request: Request, payload: LikeIn) -> FastJSONResponse:
+    """
+    Controller: translate HTTP payload into a service call.
+    """
+    db = request.state.db
+    service = LikeService()
+    result = service.unlike(db, LikeDTO(user_id=payload.user_id, post_id=payload.post_id))
+
+    return success_response(result)
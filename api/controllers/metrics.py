@@ -0,0 +1,10 @@
+from fastapi import Request, Response
+
+from core.metrics import CONTENT_TYPE, registry
+
+
+def get_metrics_controller(request: Request) -> Response:
+    """
+    Controller: current metrics in the Prometheus text format.
+    """
+    return Response(registry.render(), media_type=CONTENT_TYPE)
@@ -1,39 +1,84 @@
-from fastapi import Request
+from datetime import datetime
+from typing import AsyncIterator, Iterator, List, Optional
 
-from api.schemas.posts import CreatePostIn, UpdatePostIn, DeletePostIn
-from core.responses import success
-from dtos.posts import CreatePostDTO, UpdatePostDTO, DeletePostDTO
-from services.post import PostService
+from fastapi import Request, Response
+from starlette.responses import StreamingResponse
 
+from api.schemas.posts import BulkCreatePostsIn, CreatePostIn, UpdatePostIn, DeletePostIn
+from core.conditional import (
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    set_validators,
+    wants_revalidation,
+)
+from core.responses import (
+    NDJSON_MEDIA_TYPE,
+    FastJSONResponse,
+    bulk_response,
+    ndjson_lines,
+    success_response,
+)
+from dtos.posts import CreatePostDTO, UpdatePostDTO, DeletePostDTO, PostExportFilter, PostRecord
+from services.post import AsyncPostService, PostService
 
-def create_post_controller(request: Request, payload: CreatePostIn) -> dict:
+
+def _post_to_dict(post: PostRecord) -> dict:
+    return {
+        "id": post.id,
+        "author_id": post.author_id,
+        "content": post.content,
+        "caption": post.caption,
+        "created_at": post.created_at,
+        "updated_at": post.updated_at,
+        "like_count": post.like_count,
+        "comment_count": post.comment_count,
+        "version": post.version,
+    }
+
+
+def _create_post_dto(payload: CreatePostIn) -> CreatePostDTO:
+    return CreatePostDTO(
+        author_id=payload.author_id,
+        content=payload.content,
+        caption=payload.caption,
+    )
+
+
+def _ndjson_stream(chunks: Iterator[List[PostRecord]]) -> Iterator[bytes]:
+    for records in chunks:
+        yield ndjson_lines(records)
+
+
+async def _ndjson_stream_async(chunks: AsyncIterator[List[PostRecord]]) -> AsyncIterator[bytes]:
+    async for records in chunks:
+        yield ndjson_lines(records)
+
+
+def create_post_controller(request: Request, payload: CreatePostIn) -> FastJSONResponse:
     """
     Controller: translate HTTP payload into a service call.
     No try/except, no DB access besides receiving request-scoped session.
     """
     db = request.state.db
     service = PostService()
-    post = service.create_post(
-        db,
-        CreatePostDTO(
-            author_id=payload.author_id,
-            content=payload.content,
-            caption=payload.caption,
-        ),
-    )
+    post = service.create_post(db, _create_post_dto(payload))
 
-    return success(
-        {
-            "id": post.id,
-            "author_id": post.author_id,
-            "content": post.content,
-            "caption": post.caption,
-            "created_at": post.created_at.isoformat(),
-        }
-    )
+    return success_response(_post_to_dict(post))
+
+
+def create_posts_controller(request: Request, payload: BulkCreatePostsIn) -> FastJSONResponse:
+    """
+    Controller: bulk create; one result per submitted post, in order.
+    """
+    db = request.state.db
+    service = PostService()
+    results = service.create_posts(db, [_create_post_dto(item) for item in payload.posts])
+
+    return bulk_response(results)
 
 
-def update_post_controller(request: Request, payload: UpdatePostIn) -> dict:
+def update_post_controller(request: Request, payload: UpdatePostIn) -> FastJSONResponse:
     """
     Controller: translate HTTP payload into a service call.
     """
@@ -48,18 +93,10 @@ def update_post_controller(request: Request, payload: UpdatePostIn) -> dict:
         ),
     )
 
-    return success(
-        {
-            "id": post.id,
-            "author_id": post.author_id,
-            "content": post.content,
-            "caption": post.caption,
-            "created_at": post.created_at.isoformat(),
-        }
-    )
+    return success_response(_post_to_dict(post))
 
 
-def delete_post_controller(request: Request, payload: DeletePostIn) -> dict:
+def delete_post_controller(request: Request, payload: DeletePostIn) -> FastJSONResponse:
     """
     Controller: translate HTTP payload into a service call.
     """
@@ -67,73 +104,197 @@ def delete_post_controller(request: Request, payload: DeletePostIn) -> dict:
     service = PostService()
     service.delete_post(db, DeletePostDTO(id=payload.id))
 
-    return success({"message": "Post deleted successfully"})
+    return success_response({"message": "Post deleted successfully"})
 
 
-def get_post_by_id_controller(request: Request, id: int) -> dict:
+def get_post_by_id_controller(request: Request, id: int) -> Response:
     """
-    Controller: get a post by id.
+    Controller: get a post by id. Conditional requests are validated with a
+    version-only query and answered 304 without loading the post.
     """
     db = request.state.db
     service = PostService()
-    post = service.get_post_by_id(db, id)
-    
-    return success(
-        {
-            "id": post.id,
-            "author_id": post.author_id,
-            "content": post.content,
-            "caption": post.caption,
-            "created_at": post.created_at.isoformat(),
-        }
+    min_version = None
+    if wants_revalidation(request):
+        version, updated_at = service.get_post_version(db, id)
+        etag = make_etag("post", id, version)
+        if is_not_modified(request, etag, updated_at):
+            return not_modified_response(etag, updated_at)
+        min_version = version
+    post = service.get_post_by_id(db, id, min_version)
+
+    return set_validators(
+        success_response(_post_to_dict(post)),
+        make_etag("post", post.id, post.version),
+        post.updated_at,
     )
 
 
-def get_posts_by_author_controller(request: Request, author_id: int) -> dict:
+def get_posts_by_ids_controller(request: Request, ids: str) -> FastJSONResponse:
+    """
+    Controller: get several posts by id (comma-separated) in one call.
+    """
+    db = request.state.db
+    service = PostService()
+    batch = service.get_posts_by_ids(db, [int(id) for id in ids.split(",")])
+
+    return success_response({"posts": batch.posts, "missing": batch.missing})
+
+
+def get_posts_by_author_controller(
+    request: Request, author_id: int, limit: int = 50, cursor: Optional[str] = None
+) -> FastJSONResponse:
     """
-    Controller: get all posts by a specific author.
+    Controller: get one page of posts by a specific author.
     """
     db = request.state.db
     service = PostService()
-    posts = service.get_posts_by_author(db, author_id)
+    page = service.get_posts_by_author(db, author_id, limit, cursor)
     
-    return success(
-        {
-            "posts": [
-                {
-                    "id": post.id,
-                    "author_id": post.author_id,
-                    "content": post.content,
-                    "caption": post.caption,
-                    "created_at": post.created_at.isoformat(),
-                }
-                for post in posts
-            ]
-        }
+    return success_response(
+        {"posts": page.posts},
+        meta={"limit": limit, "next_cursor": page.next_cursor},
     )
 
 
-def get_all_posts_controller(request: Request, limit: int = 100, offset: int = 0) -> dict:
+def get_all_posts_controller(request: Request, limit: int = 100, cursor: Optional[str] = None) -> FastJSONResponse:
     """
-    Controller: get all posts with pagination.
+    Controller: get all posts with cursor pagination.
     """
     db = request.state.db
     service = PostService()
-    posts = service.get_all_posts(db, limit, offset)
+    page = service.get_all_posts(db, limit, cursor)
     
-    return success(
-        {
-            "posts": [
-                {
-                    "id": post.id,
-                    "author_id": post.author_id,
-                    "content": post.content,
-                    "caption": post.caption,
-                    "created_at": post.created_at.isoformat(),
-                }
-                for post in posts
-            ],
-            "limit": limit,
-            "offset": offset,
-        }
+    return success_response(
+        {"posts": page.posts},
+        meta={"limit": limit, "next_cursor": page.next_cursor},
     )
+
+
+def export_posts_controller(
+    request: Request,
+    author_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> StreamingResponse:
+    """
+    Controller: stream matching posts as NDJSON, one post per line.
+    Rows are read from the request session as the body is sent;
+    DbSessionMiddleware keeps it open until the last chunk.
+    """
+    db = request.state.db
+    service = PostService()
+    chunks = service.export_posts(db, PostExportFilter(author_id, since, until))
+
+    return StreamingResponse(_ndjson_stream(chunks), media_type=NDJSON_MEDIA_TYPE)
+
+
+# --- Async controllers (DB_ASYNC) ------------------------------------------
+# Same HTTP contract as above; they await AsyncPostService on request.state.async_db.
+
+
+async def create_post_async_controller(request: Request, payload: CreatePostIn) -> FastJSONResponse:
+    db = request.state.async_db
+    service = AsyncPostService()
+    post = await service.create_post(db, _create_post_dto(payload))
+
+    return success_response(_post_to_dict(post))
+
+
+async def create_posts_async_controller(
+    request: Request, payload: BulkCreatePostsIn
+) -> FastJSONResponse:
+    db = request.state.async_db
+    service = AsyncPostService()
+    results = await service.create_posts(db, [_create_post_dto(item) for item in payload.posts])
+
+    return bulk_response(results)
+
+
+async def update_post_async_controller(request: Request, payload: UpdatePostIn) -> FastJSONResponse:
+    db = request.state.async_db
+    service = AsyncPostService()
+    post = await service.update_post(
+        db,
+        UpdatePostDTO(
+            id=payload.id,
+            content=payload.content,
+            caption=payload.caption,
+        ),
+    )
+
+    return success_response(_post_to_dict(post))
+
+
+async def delete_post_async_controller(request: Request, payload: DeletePostIn) -> FastJSONResponse:
+    db = request.state.async_db
+    service = AsyncPostService()
+    await service.delete_post(db, DeletePostDTO(id=payload.id))
+
+    return success_response({"message": "Post deleted successfully"})
+
+
+async def get_post_by_id_async_controller(request: Request, id: int) -> Response:
+    db = request.state.async_db
+    service = AsyncPostService()
+    min_version = None
+    if wants_revalidation(request):
+        version, updated_at = await service.get_post_version(db, id)
+        etag = make_etag("post", id, version)
+        if is_not_modified(request, etag, updated_at):
+            return not_modified_response(etag, updated_at)
+        min_version = version
+    post = await service.get_post_by_id(db, id, min_version)
+
+    return set_validators(
+        success_response(_post_to_dict(post)),
+        make_etag("post", post.id, post.version),
+        post.updated_at,
+    )
+
+
+async def get_posts_by_ids_async_controller(request: Request, ids: str) -> FastJSONResponse:
+    db = request.state.async_db
+    service = AsyncPostService()
+    batch = await service.get_posts_by_ids(db, [int(id) for id in ids.split(",")])
+
+    return success_response({"posts": batch.posts, "missing": batch.missing})
+
+
+async def get_posts_by_author_async_controller(
+    request: Request, author_id: int, limit: int = 50, cursor: Optional[str] = None
+) -> FastJSONResponse:
+    db = request.state.async_db
+    service = AsyncPostService()
+    page = await service.get_posts_by_author(db, author_id, limit, cursor)
+
+    return success_response(
+        {"posts": page.posts},
+        meta={"limit": limit, "next_cursor": page.next_cursor},
+    )
+
+
+async def get_all_posts_async_controller(
+    request: Request, limit: int = 100, cursor: Optional[str] = None
+) -> FastJSONResponse:
+    db = request.state.async_db
+    service = AsyncPostService()
+    page = await service.get_all_posts(db, limit, cursor)
+
+    return success_response(
+        {"posts": page.posts},
+        meta={"limit": limit, "next_cursor": page.next_cursor},
+    )
+
+
+async def export_posts_async_controller(
+    request: Request,
+    author_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> StreamingResponse:
+    db = request.state.async_db
+    service = AsyncPostService()
+    chunks = service.export_posts(db, PostExportFilter(author_id, since, until))
+
+    return StreamingResponse(_ndjson_stream_async(chunks), media_type=NDJSON_MEDIA_TYPE)
@@ -1,12 +1,30 @@
-from fastapi import Request
+from fastapi import Request, Response
 
-from api.schemas.users import CreateUserIn, DeleteUserIn
-from core.responses import success
-from dtos.users import CreateUserDTO, DeleteUserDTO
-from services.user import UserService
+from api.schemas.users import BulkCreateUsersIn, CreateUserIn, DeleteUserIn
+from core.conditional import (
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    set_validators,
+    wants_revalidation,
+)
+from core.responses import FastJSONResponse, bulk_response, success_response
+from dtos.users import CreateUserDTO, DeleteUserDTO, UserRecord
+from services.user import AsyncUserService, UserService
 
 
-def create_user_controller(request: Request, payload: CreateUserIn) -> dict:
+def _user_to_dict(user: UserRecord) -> dict:
+    return {
+        "id": user.id,
+        "email": user.email,
+        "name": user.name,
+        "age": user.age,
+        "updated_at": user.updated_at,
+        "version": user.version,
+    }
+
+
+def create_user_controller(request: Request, payload: CreateUserIn) -> FastJSONResponse:
     """
     Controller: translate HTTP payload into a service call.
     No try/except, no DB access besides receiving request-scoped session.
@@ -18,17 +36,24 @@ def create_user_controller(request: Request, payload: CreateUserIn) -> dict:
         CreateUserDTO(email=str(payload.email), name=payload.name, age=payload.age),
     )
 
-    return success(
-        {
-            "id": user.id,
-            "email": user.email,
-            "name": user.name,
-            "age": user.age,
-        }
+    return success_response(_user_to_dict(user))
+
+
+def create_users_controller(request: Request, payload: BulkCreateUsersIn) -> FastJSONResponse:
+    """
+    Controller: bulk create; one result per submitted user, in order.
+    """
+    db = request.state.db
+    service = UserService()
+    results = service.create_users(
+        db,
+        [CreateUserDTO(email=str(item.email), name=item.name, age=item.age) for item in payload.users],
     )
 
+    return bulk_response(results)
 
-def delete_user_controller(request: Request, id: int) -> dict:
+
+def delete_user_controller(request: Request, id: int) -> FastJSONResponse:
     """
     Controller: translate HTTP payload into a service call.
     No try/except, no DB access besides receiving request-scoped session.
@@ -37,22 +62,113 @@ def delete_user_controller(request: Request, id: int) -> dict:
     service = UserService()
     service.delete_user(db, id)
 
-    return success({"message": "User deleted successfully"})
+    # The user is gone from every read; the purge finishes in the background.
+    return success_response({"message": "User deletion scheduled", "id": id}, status_code=202)
 
 
-def get_user_by_id_controller(request: Request, id: int) -> dict:
+def get_user_deletion_controller(request: Request, id: int) -> FastJSONResponse:
+    """
+    Controller: progress of a user's background deletion.
+    """
+    db = request.state.db
+    service = UserService()
+    return success_response(service.get_user_deletion(db, id))
+
+
+def get_user_by_id_controller(request: Request, id: int) -> Response:
     """
     Controller: translate HTTP payload into a service call.
-    No try/except, no DB access besides receiving request-scoped session.
+    Conditional requests are answered 304 from a version-only query.
+    """
+    db = request.state.db
+    service = UserService()
+    min_version = None
+    if wants_revalidation(request):
+        version, updated_at = service.get_user_version(db, id)
+        etag = make_etag("user", id, version)
+        if is_not_modified(request, etag, updated_at):
+            return not_modified_response(etag, updated_at)
+        min_version = version
+    user = service.get_user_by_id(db, id, min_version)
+    return set_validators(
+        success_response(_user_to_dict(user)),
+        make_etag("user", user.id, user.version),
+        user.updated_at,
+    )
+
+
+def get_users_by_ids_controller(request: Request, ids: str) -> FastJSONResponse:
+    """
+    Controller: get several users by id (comma-separated) in one call.
     """
     db = request.state.db
     service = UserService()
-    user = service.get_user_by_id(db, id)
-    return success(
-        {
-            "id": user.id,
-            "email": user.email,
-            "name": user.name,
-            "age": user.age,
-        }
+    batch = service.get_users_by_ids(db, [int(id) for id in ids.split(",")])
+    return success_response({"users": batch.users, "missing": batch.missing})
+
+
+# --- Async controllers (DB_ASYNC) ------------------------------------------
+# Same HTTP contract as above; they await AsyncUserService on request.state.async_db.
+
+
+async def create_user_async_controller(request: Request, payload: CreateUserIn) -> FastJSONResponse:
+    db = request.state.async_db
+    service = AsyncUserService()
+    user = await service.create_user(
+        db,
+        CreateUserDTO(email=str(payload.email), name=payload.name, age=payload.age),
+    )
+
+    return success_response(_user_to_dict(user))
+
+
+async def create_users_async_controller(
+    request: Request, payload: BulkCreateUsersIn
+) -> FastJSONResponse:
+    db = request.state.async_db
+    service = AsyncUserService()
+    results = await service.create_users(
+        db,
+        [CreateUserDTO(email=str(item.email), name=item.name, age=item.age) for item in payload.users],
     )
+
+    return bulk_response(results)
+
+
+async def delete_user_async_controller(request: Request, id: int) -> FastJSONResponse:
+    db = request.state.async_db
+    service = AsyncUserService()
+    await service.delete_user(db, id)
+
+    return success_response({"message": "User deletion scheduled", "id": id}, status_code=202)
+
+
+async def get_user_deletion_async_controller(request: Request, id: int) -> FastJSONResponse:
+    db = request.state.async_db
+    service = AsyncUserService()
+    return success_response(await service.get_user_deletion(db, id))
+
+
+async def get_user_by_id_async_controller(request: Request, id: int) -> Response:
+    db = request.state.async_db
+    service = AsyncUserService()
+    min_version = None
+    if wants_revalidation(request):
+        version, updated_at = await service.get_user_version(db, id)
+        etag = make_etag("user", id, version)
+        if is_not_modified(request, etag, updated_at):
+            return not_modified_response(etag, updated_at)
+        min_version = version
+    user = await service.get_user_by_id(db, id, min_version)
+    return set_validators(
+        success_response(_user_to_dict(user)),
+        make_etag("user", user.id, user.version),
+        user.updated_at,
+    )
+
+
+async def get_users_by_ids_async_controller(request: Request, ids: str) -> FastJSONResponse:
+    db = request.state.async_db
+    service = AsyncUserService()
+    batch = await service.get_users_by_ids(db, [int(id) for id in ids.split(",")])
+    return success_response({"users": batch.users, "missing": batch.missing})
@@ -0,0 +1,19 @@
+from typing import Optional
+
+from fastapi import APIRouter, Request, Query, Response
+
+from api.controllers.comments import get_post_comments_controller
+from core.query_budget import query_budget
+
+router = APIRouter(prefix="/posts", tags=["comments"])
+
+
+@router.get("/{id}/comments")
+@query_budget(1)
+def get_post_comments(
+    request: Request,
+    id: int,
+    limit: int = Query(default=50, ge=1, le=100),
+    cursor: Optional[str] = Query(default=None),
+) -> Response:
+    return get_post_comments_controller(request, id, limit, cursor)
@@ -0,0 +1,36 @@
+from typing import Optional
+
+from fastapi import APIRouter, Request, Query, Response
+
+from api.controllers.feed import (
+    get_feed_controller,
+    follow_controller,
+    unfollow_controller,
+)
+from api.schemas.feed import FollowIn
+from core.query_budget import query_budget
+
+router = APIRouter(prefix="/feed", tags=["feed"])
+
+
+@router.get("/")
+@query_budget(1)
+def get_feed(
+    request: Request,
+    user_id: int = Query(gt=0),
+    limit: int = Query(default=50, ge=1, le=100),
+    cursor: Optional[str] = Query(default=None),
+) -> Response:
+    return get_feed_controller(request, user_id, limit, cursor)
+
+
+@router.post("/follow")
+@query_budget(3)
+def follow(request: Request, payload: FollowIn) -> Response:
+    return follow_controller(request, payload)
+
+
+@router.post("/unfollow")
+@query_budget(3)
+def unfollow(request: Request, payload: FollowIn) -> Response:
+    return unfollow_controller(request, payload)
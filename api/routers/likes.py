@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Request, Response
+
+from api.controllers.likes import like_post_controller, unlike_post_controller
+from api.schemas.likes import LikeIn
+from core.query_budget import query_budget
+
+router = APIRouter(prefix="/likes", tags=["likes"])
+
+
+@router.post("/create")
+@query_budget(1)
+def like_post(request: Request, payload: LikeIn) -> Response:
+    return like_post_controller(request, payload)
+
+
+@router.post("/delete")
+@query_budget(1)
+def unlike_post(request: Request, payload: LikeIn) -> Response:
+    return unlike_post_controller(request, payload)
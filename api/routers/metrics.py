@@ -0,0 +1,10 @@
+from fastapi import APIRouter, Request, Response
+
+from api.controllers.metrics import get_metrics_controller
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics(request: Request) -> Response:
+    return get_metrics_controller(request)
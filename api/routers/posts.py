@@ -1,47 +1,168 @@
-from fastapi import APIRouter, Request, Query
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Request, Query, Response
 
 from api.controllers.posts import (
     create_post_controller,
+    create_posts_controller,
     update_post_controller,
     delete_post_controller,
     get_post_by_id_controller,
+    get_posts_by_ids_controller,
     get_posts_by_author_controller,
     get_all_posts_controller,
+    export_posts_controller,
+    create_post_async_controller,
+    create_posts_async_controller,
+    update_post_async_controller,
+    delete_post_async_controller,
+    get_post_by_id_async_controller,
+    get_posts_by_ids_async_controller,
+    get_posts_by_author_async_controller,
+    get_all_posts_async_controller,
+    export_posts_async_controller,
 )
-from api.schemas.posts import CreatePostIn, UpdatePostIn, DeletePostIn
+from api.schemas.common import BATCH_IDS_PATTERN
+from api.schemas.posts import BulkCreatePostsIn, CreatePostIn, UpdatePostIn, DeletePostIn
+from core.query_budget import query_budget
 
 router = APIRouter(prefix="/posts", tags=["posts"])
 
+# Mounted instead of `router` when DB_ASYNC is enabled (see main.create_app).
+async_router = APIRouter(prefix="/posts", tags=["posts"])
+
 
 @router.post("/create")
-def create_post(request: Request, payload: CreatePostIn) -> dict:
+@query_budget(2)
+def create_post(request: Request, payload: CreatePostIn) -> Response:
     return create_post_controller(request, payload)
 
 
+@router.post("/bulk")
+@query_budget(3)
+def create_posts(request: Request, payload: BulkCreatePostsIn) -> Response:
+    return create_posts_controller(request, payload)
+
+
 @router.post("/update")
-def update_post(request: Request, payload: UpdatePostIn) -> dict:
+@query_budget(1)
+def update_post(request: Request, payload: UpdatePostIn) -> Response:
     return update_post_controller(request, payload)
 
 
 @router.post("/delete")
-def delete_post(request: Request, payload: DeletePostIn) -> dict:
+@query_budget(1)
+def delete_post(request: Request, payload: DeletePostIn) -> Response:
     return delete_post_controller(request, payload)
 
 
+# Declared before /{id}, which would otherwise capture "batch" / "export".
+@router.get("/export")
+def export_posts(
+    request: Request,
+    author_id: Optional[int] = Query(default=None, gt=0),
+    since: Optional[datetime] = Query(default=None),
+    until: Optional[datetime] = Query(default=None),
+) -> Response:
+    return export_posts_controller(request, author_id, since, until)
+
+
+@router.get("/batch")
+@query_budget(1)
+def get_posts_by_ids(request: Request, ids: str = Query(pattern=BATCH_IDS_PATTERN)) -> Response:
+    return get_posts_by_ids_controller(request, ids)
+
+
 @router.get("/{id}")
-def get_post_by_id(request: Request, id: int) -> dict:
+@query_budget(2)
+def get_post_by_id(request: Request, id: int) -> Response:
     return get_post_by_id_controller(request, id)
 
 
 @router.get("/author/{author_id}")
-def get_posts_by_author(request: Request, author_id: int) -> dict:
-    return get_posts_by_author_controller(request, author_id)
+@query_budget(1)
+def get_posts_by_author(
+    request: Request,
+    author_id: int,
+    limit: int = Query(default=50, ge=1, le=100),
+    cursor: Optional[str] = Query(default=None),
+) -> Response:
+    return get_posts_by_author_controller(request, author_id, limit, cursor)
 
 
 @router.get("/")
+@query_budget(1)
 def get_all_posts(
     request: Request,
     limit: int = Query(default=100, ge=1, le=500),
-    offset: int = Query(default=0, ge=0),
-) -> dict:
-    return get_all_posts_controller(request, limit, offset)
+    cursor: Optional[str] = Query(default=None),
+) -> Response:
+    return get_all_posts_controller(request, limit, cursor)
+
+
+@async_router.post("/create")
+@query_budget(2)
+async def create_post_async(request: Request, payload: CreatePostIn) -> Response:
+    return await create_post_async_controller(request, payload)
+
+
+@async_router.post("/bulk")
+@query_budget(3)
+async def create_posts_async(request: Request, payload: BulkCreatePostsIn) -> Response:
+    return await create_posts_async_controller(request, payload)
+
+
+@async_router.post("/update")
+@query_budget(1)
+async def update_post_async(request: Request, payload: UpdatePostIn) -> Response:
+    return await update_post_async_controller(request, payload)
+
+
+@async_router.post("/delete")
+@query_budget(1)
+async def delete_post_async(request: Request, payload: DeletePostIn) -> Response:
+    return await delete_post_async_controller(request, payload)
+
+
+@async_router.get("/export")
+async def export_posts_async(
+    request: Request,
+    author_id: Optional[int] = Query(default=None, gt=0),
+    since: Optional[datetime] = Query(default=None),
+    until: Optional[datetime] = Query(default=None),
+) -> Response:
+    return await export_posts_async_controller(request, author_id, since, until)
+
+
+@async_router.get("/batch")
+@query_budget(1)
+async def get_posts_by_ids_async(request: Request, ids: str = Query(pattern=BATCH_IDS_PATTERN)) -> Response:
+    return await get_posts_by_ids_async_controller(request, ids)
+
+
+@async_router.get("/{id}")
+@query_budget(2)
+async def get_post_by_id_async(request: Request, id: int) -> Response:
+    return await get_post_by_id_async_controller(request, id)
+
+
+@async_router.get("/author/{author_id}")
+@query_budget(1)
+async def get_posts_by_author_async(
+    request: Request,
+    author_id: int,
+    limit: int = Query(default=50, ge=1, le=100),
+    cursor: Optional[str] = Query(default=None),
+) -> Response:
+    return await get_posts_by_author_async_controller(request, author_id, limit, cursor)
+
+
+@async_router.get("/")
+@query_budget(1)
+async def get_all_posts_async(
+    request: Request,
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: Optional[str] = Query(default=None),
+) -> Response:
+    return await get_all_posts_async_controller(request, limit, cursor)
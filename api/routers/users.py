@@ -1,31 +1,110 @@
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Query, Request, Response
 
 from api.controllers.users import (
     create_user_controller,
+    create_users_controller,
     delete_user_controller,
     get_user_by_id_controller,
+    get_user_deletion_controller,
+    get_users_by_ids_controller,
+    create_user_async_controller,
+    create_users_async_controller,
+    delete_user_async_controller,
+    get_user_by_id_async_controller,
+    get_user_deletion_async_controller,
+    get_users_by_ids_async_controller,
 )
-from api.schemas.users import CreateUserIn
+from api.schemas.common import BATCH_IDS_PATTERN
+from api.schemas.users import BulkCreateUsersIn, CreateUserIn
+from core.query_budget import query_budget
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+# Mounted instead of `router` when DB_ASYNC is enabled (see main.create_app).
+async_router = APIRouter(prefix="/users", tags=["users"])
+
 
 @router.post("/create")
-def create_user(request: Request, payload: CreateUserIn) -> dict:
+@query_budget(1)
+def create_user(request: Request, payload: CreateUserIn) -> Response:
     return create_user_controller(request, payload)
 
 
+@router.post("/bulk")
+@query_budget(1)
+def create_users(request: Request, payload: BulkCreateUsersIn) -> Response:
+    return create_users_controller(request, payload)
+
+
 # Should i simply use id: int or DeleteUserIn?
 @router.post("/delete/{id}")
-def delete_user(request: Request, id: int) -> dict:
+@query_budget(1)
+def delete_user(request: Request, id: int) -> Response:
     return delete_user_controller(request, id)
 
 
 @router.get("/")
-def get_user(request: Request, id: int) -> dict:
+@query_budget(2)
+def get_user(request: Request, id: int) -> Response:
     return get_user_by_id_controller(request, id)
 
 
+# Declared before /{id}, which would otherwise capture "batch".
+@router.get("/batch")
+@query_budget(1)
+def get_users_by_ids(request: Request, ids: str = Query(pattern=BATCH_IDS_PATTERN)) -> Response:
+    return get_users_by_ids_controller(request, ids)
+
+
 @router.get("/{id}")
-def get_user_by_id(request: Request, id: int) -> dict:
+@query_budget(2)
+def get_user_by_id(request: Request, id: int) -> Response:
     return get_user_by_id_controller(request, id)
+
+
+@router.get("/{id}/deletion")
+@query_budget(1)
+def get_user_deletion(request: Request, id: int) -> Response:
+    return get_user_deletion_controller(request, id)
+
+
+@async_router.post("/create")
+@query_budget(1)
+async def create_user_async(request: Request, payload: CreateUserIn) -> Response:
+    return await create_user_async_controller(request, payload)
+
+
+@async_router.post("/bulk")
+@query_budget(1)
+async def create_users_async(request: Request, payload: BulkCreateUsersIn) -> Response:
+    return await create_users_async_controller(request, payload)
+
+
+@async_router.post("/delete/{id}")
+@query_budget(1)
+async def delete_user_async(request: Request, id: int) -> Response:
+    return await delete_user_async_controller(request, id)
+
+
+@async_router.get("/")
+@query_budget(2)
+async def get_user_async(request: Request, id: int) -> Response:
+    return await get_user_by_id_async_controller(request, id)
+
+
+@async_router.get("/batch")
+@query_budget(1)
+async def get_users_by_ids_async(request: Request, ids: str = Query(pattern=BATCH_IDS_PATTERN)) -> Response:
+    return await get_users_by_ids_async_controller(request, ids)
+
+
+@async_router.get("/{id}")
+@query_budget(2)
+async def get_user_by_id_async(request: Request, id: int) -> Response:
+    return await get_user_by_id_async_controller(request, id)
+
+
+@async_router.get("/{id}/deletion")
+@query_budget(1)
+async def get_user_deletion_async(request: Request, id: int) -> Response:
+    return await get_user_deletion_async_controller(request, id)
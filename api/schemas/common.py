@@ -0,0 +1,2 @@
+# Comma-separated ids, e.g. `?ids=3,17,42` (count is capped by BATCH_MAX_IDS).
+BATCH_IDS_PATTERN = r"^\d+(,\d+)*$"
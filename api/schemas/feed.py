@@ -0,0 +1,6 @@
+from pydantic import BaseModel, Field
+
+
+class FollowIn(BaseModel):
+    follower_id: int = Field(gt=0)
+    followee_id: int = Field(gt=0)
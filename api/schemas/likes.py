@@ -0,0 +1,6 @@
+from pydantic import BaseModel, Field
+
+
+class LikeIn(BaseModel):
+    user_id: int = Field(gt=0)
+    post_id: int = Field(gt=0)
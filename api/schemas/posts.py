@@ -1,8 +1,10 @@
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 from pydantic import BaseModel, Field
 
+from config.settings import settings
+
 
 class CreatePostIn(BaseModel):
     author_id: int = Field(gt=0)
@@ -10,6 +12,10 @@ class CreatePostIn(BaseModel):
     caption: Optional[str] = Field(default=None, max_length=255)
 
 
+class BulkCreatePostsIn(BaseModel):
+    posts: List[CreatePostIn] = Field(min_length=1, max_length=settings.BULK_MAX_ITEMS)
+
+
 class UpdatePostIn(BaseModel):
     id: int = Field(gt=0)
     content: Optional[str] = Field(default=None, min_length=1)
@@ -26,4 +32,8 @@ class PostOut(BaseModel):
     content: str
     caption: Optional[str] = None
     created_at: datetime
+    updated_at: datetime
     deleted_at: Optional[datetime] = None
+    like_count: int = 0
+    comment_count: int = 0
+    version: int = 1
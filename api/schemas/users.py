@@ -1,7 +1,10 @@
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
 
 from pydantic import BaseModel, EmailStr, Field
 
+from config.settings import settings
+
 
 class CreateUserIn(BaseModel):
     email: EmailStr
@@ -9,6 +12,10 @@ class CreateUserIn(BaseModel):
     age: Optional[int] = Field(default=None, ge=0)
 
 
+class BulkCreateUsersIn(BaseModel):
+    users: List[CreateUserIn] = Field(min_length=1, max_length=settings.BULK_MAX_ITEMS)
+
+
 class DeleteUserIn(BaseModel):
     id: int
 
@@ -18,4 +25,6 @@ class UserOut(BaseModel):
     email: EmailStr
     name: str
     age: Optional[int] = None
+    updated_at: datetime
+    version: int = 1
 
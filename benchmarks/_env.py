@@ -0,0 +1,19 @@
+"""
+Shared bootstrap for benchmark scripts.
+
+Settings() requires the POSTGRES_* / JWT_* variables; benchmarks that never
+open a connection only need placeholders so `config.settings` imports.
+"""
+import os
+
+_DEFAULTS = {
+    "POSTGRES_USER": "socialz_user",
+    "POSTGRES_PASSWORD": "admin",
+    "POSTGRES_DB": "socialz_dev",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "JWT_SECRET": "benchmark-secret",
+}
+
+for _key, _value in _DEFAULTS.items():
+    os.environ.setdefault(_key, _value)
@@ -0,0 +1,129 @@
+"""
+Response serialization cost of a 500-post GET /posts/ page.
+
+"before" is the previous path, spelled out: the controller builds dicts
+with created_at.isoformat() and the envelope goes through jsonable_encoder
+into a stdlib-json JSONResponse. It is built explicitly because newer
+FastAPI releases serialize a plain dict return differently, which would not
+measure what the change replaced. "after" is the current path:
+controllers return FastJSONResponse and orjson writes bytes directly.
+Posts are in-memory ORM instances so only serialization is measured.
+
+    python -m benchmarks.json_serialization --posts 500 --requests 2000
+"""
+import argparse
+import asyncio
+import json
+import time
+import timeit
+from datetime import datetime, timedelta, timezone
+
+import benchmarks._env  # noqa: F401
+
+import httpx
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+
+from api.controllers.posts import _post_to_dict
+from core.responses import FastJSONResponse, success, success_response
+from models.post import Post
+
+
+def _make_posts(n: int) -> list:
+    now = datetime.now(timezone.utc)
+    return [
+        Post(
+            id=i,
+            author_id=i % 97,
+            content="lorem ipsum dolor sit amet " * 8,
+            caption=f"caption {i}" if i % 3 else None,
+            created_at=now - timedelta(seconds=i),
+            like_count=i * 7,
+            comment_count=i % 11,
+        )
+        for i in range(n)
+    ]
+
+
+def _build_app(posts: list) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/before")
+    def before() -> Response:
+        envelope = success(
+            {
+                "posts": [
+                    {
+                        "id": post.id,
+                        "author_id": post.author_id,
+                        "content": post.content,
+                        "caption": post.caption,
+                        "created_at": post.created_at.isoformat(),
+                        "like_count": post.like_count,
+                        "comment_count": post.comment_count,
+                    }
+                    for post in posts
+                ]
+            },
+            meta={"limit": len(posts), "next_cursor": None},
+        )
+        return JSONResponse(jsonable_encoder(envelope))
+
+    @app.get("/after")
+    def after() -> Response:
+        return success_response(
+            {"posts": [_post_to_dict(post) for post in posts]},
+            meta={"limit": len(posts), "next_cursor": None},
+        )
+
+    return app
+
+
+async def _run(app: FastAPI, path: str, requests: int) -> tuple:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        body = (await client.get(path)).content
+        started = time.perf_counter()
+        for _ in range(requests):
+            await client.get(path)
+        elapsed = time.perf_counter() - started
+    return elapsed / requests * 1e3, len(body)
+
+
+def _encode_only(posts: list, repeat: int) -> tuple:
+    """
+    Envelope -> bytes only, without ASGI/HTTP overhead.
+    """
+    legacy = success({"posts": [{**_post_to_dict(p), "created_at": p.created_at.isoformat()} for p in posts]})
+    fast = success({"posts": [_post_to_dict(p) for p in posts]})
+    before = timeit.timeit(
+        lambda: json.dumps(jsonable_encoder(legacy), ensure_ascii=False).encode(), number=repeat
+    )
+    after = timeit.timeit(lambda: FastJSONResponse(fast).body, number=repeat)
+    return before / repeat * 1e3, after / repeat * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--posts", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    posts = _make_posts(args.posts)
+    app = _build_app(posts)
+    before_ms, before_bytes = asyncio.run(_run(app, "/before", args.requests))
+    after_ms, after_bytes = asyncio.run(_run(app, "/after", args.requests))
+
+    print(f"{args.posts} posts/page, {args.requests} requests")
+    print(f"before: {before_ms:.2f} ms/req ({1000 / before_ms:.0f} req/s), {before_bytes} bytes")
+    print(f"after:  {after_ms:.2f} ms/req ({1000 / after_ms:.0f} req/s), {after_bytes} bytes")
+    print(f"speedup: {before_ms / after_ms:.1f}x")
+
+    enc_before, enc_after = _encode_only(posts, args.requests)
+    print(f"encode only: jsonable_encoder+json {enc_before:.2f} ms, orjson {enc_after:.2f} ms "
+          f"({enc_before / enc_after:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Cost of JWT verification per request, with and without the verified-token cache.
+
+Measures TokenVerifier.verify directly (a client re-sending the same token,
+cycling over --tokens distinct tokens) and end to end through
+JwtAuthMiddleware on a route that never touches the database. HS256 uses
+JWT_SECRET; RS256 signs with a throwaway 2048-bit key.
+
+    python -m benchmarks.jwt_verification --iterations 20000
+"""
+import argparse
+import asyncio
+import time
+from typing import Dict, List, Tuple
+
+import benchmarks._env  # noqa: F401
+
+import httpx
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import FastAPI
+
+from config.settings import settings
+from middlewares.jwt_auth import JwtAuthMiddleware, TokenVerifier
+
+
+def _keys(algorithm: str) -> Tuple[object, str]:
+    """
+    (signing key, verification key) for `algorithm`.
+    """
+    if algorithm.startswith("HS"):
+        return settings.JWT_SECRET, settings.JWT_SECRET
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public = private.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return private, public.decode()
+
+
+def _tokens(signing_key: object, algorithm: str, count: int) -> List[str]:
+    exp = int(time.time()) + 3600
+    return [jwt.encode({"sub": str(id), "exp": exp}, signing_key, algorithm=algorithm) for id in range(1, count + 1)]
+
+
+def _verify_us(verifier: TokenVerifier, tokens: List[str], iterations: int) -> float:
+    for token in tokens:  # warm-up (fills the cache when enabled)
+        verifier.verify(token)
+    started = time.perf_counter()
+    for i in range(iterations):
+        verifier.verify(tokens[i % len(tokens)])
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+async def _request_us(verifier: TokenVerifier, tokens: List[str], iterations: int) -> float:
+    app = FastAPI()
+    app.add_middleware(JwtAuthMiddleware, verifier=verifier, public_paths=())
+
+    @app.get("/ping")
+    async def ping() -> dict:
+        return {"ok": True}
+
+    headers = [{"Authorization": f"Bearer {token}"} for token in tokens]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for h in headers:
+            assert (await client.get("/ping", headers=h)).status_code == 200
+        started = time.perf_counter()
+        for i in range(iterations):
+            await client.get("/ping", headers=headers[i % len(headers)])
+        elapsed = time.perf_counter() - started
+    return elapsed / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--tokens", type=int, default=100, help="distinct tokens cycled through")
+    parser.add_argument("--algorithms", nargs="+", default=["HS256", "RS256"])
+    args = parser.parse_args()
+
+    print(f"{'':<18}{'uncached (us)':>15}{'cached (us)':>13}{'speedup':>9}")
+    for algorithm in args.algorithms:
+        signing_key, verify_key = _keys(algorithm)
+        tokens = _tokens(signing_key, algorithm, args.tokens)
+        results: Dict[str, Tuple[float, float]] = {}
+        results["verify"] = tuple(
+            _verify_us(TokenVerifier(verify_key, algorithm, size), tokens, args.iterations)
+            for size in (0, args.tokens)
+        )
+        requests = max(1, args.iterations // 4)
+        results["request"] = tuple(
+            asyncio.run(_request_us(TokenVerifier(verify_key, algorithm, size), tokens, requests))
+            for size in (0, args.tokens)
+        )
+        for name, (uncached, cached) in results.items():
+            print(f"{algorithm + ' ' + name:<18}{uncached:>15.1f}{cached:>13.1f}{uncached / cached:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
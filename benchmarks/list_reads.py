@@ -0,0 +1,87 @@
+"""
+ORM vs Core record read path for list endpoints, against a seeded database.
+
+"orm" is PostRepository.get_all (full Post instances in the identity map,
+copied out with _post_to_dict); "records" is PostRepository.get_all_records
+(column select into slotted PostRecord, handed to orjson as is). Each page
+uses a fresh session, as a request would, and walks the keyset cursor so
+consecutive pages read different rows.
+
+    python -m benchmarks.list_reads --limit 500 --pages 200
+"""
+import argparse
+import time
+import tracemalloc
+from typing import Callable, List, Optional
+
+import benchmarks._env  # noqa: F401
+
+import orjson
+
+from api.controllers.posts import _post_to_dict
+from core.pagination import Keyset
+from db.session import SessionLocal
+from repositories.post import PostRepository
+
+repo = PostRepository()
+
+
+def _orm_page(limit: int, after: Optional[Keyset]) -> List:
+    with SessionLocal() as db:
+        posts = repo.get_all(db, limit, after)
+        orjson.dumps({"posts": [_post_to_dict(post) for post in posts]})
+        return posts
+
+
+def _records_page(limit: int, after: Optional[Keyset]) -> List:
+    with SessionLocal() as db:
+        posts = repo.get_all_records(db, limit, after)
+        orjson.dumps({"posts": posts})
+        return posts
+
+
+def _memory(fetch: Callable, limit: int) -> tuple:
+    """
+    Peak allocation while building one page, and what the page itself retains.
+    """
+    fetch(limit, None)  # warm statement cache and connection pool
+    tracemalloc.start()
+    page = fetch(limit, None)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del page
+    return peak, retained
+
+
+def _throughput(fetch: Callable, limit: int, pages: int) -> float:
+    after = None
+    started = time.perf_counter()
+    for _ in range(pages):
+        rows = fetch(limit, after)
+        after = (rows[-1].created_at, rows[-1].id) if len(rows) == limit else None
+    return pages / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{args.limit} posts/page, {args.pages} pages")
+    results = {}
+    for name, fetch in (("orm", _orm_page), ("records", _records_page)):
+        peak, retained = _memory(fetch, args.limit)
+        rate = _throughput(fetch, args.limit, args.pages)
+        results[name] = (peak, retained, rate)
+        print(
+            f"{name:8} peak {peak / 1024:8.0f} KiB  retained {retained / 1024:7.0f} KiB "
+            f"({retained / args.limit:.0f} B/row)  {rate:7.1f} pages/s"
+        )
+
+    orm, records = results["orm"], results["records"]
+    print(f"peak memory: {orm[0] / records[0]:.1f}x less, throughput: {records[2] / orm[2]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""
+End-to-end load benchmark against a seeded local Postgres.
+
+Drives the real application (main.create_app(), lifespan included) in-process
+through httpx's ASGI transport. Each scenario runs --requests requests with
+--concurrency workers and reports throughput, p50/p95/p99 latency and DB round
+trips per request (statements plus COMMIT/ROLLBACK, counted with engine
+events). Results can be saved as JSON and compared with an earlier run:
+
+    python -m benchmarks.load --concurrency 16 --requests 2000 --output before.json
+    python -m benchmarks.load --concurrency 16 --requests 2000 --compare before.json
+
+Ids are sampled from the database with a fixed --seed, so two runs against the
+same data send the same requests. CACHE_BACKEND / DB_ASYNC and the other
+settings come from the environment as usual and are recorded in the output.
+"""
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import benchmarks._env  # noqa: F401
+
+import httpx
+from sqlalchemy import event, text
+
+from config.settings import settings
+from db import session as db_session
+from main import create_app
+
+Request = Tuple[str, str, Optional[dict]]  # method, path, JSON body
+
+# Warm-up requests per scenario (pool, statement cache). They use their own
+# indices after the timed ones, so the timed run starts with nothing cached.
+WARMUP = 50
+
+
+@dataclass
+class Sample:
+    post_ids: List[int]
+    author_ids: List[int]
+    user_ids: List[int]
+    follower_ids: List[int]
+
+
+@dataclass
+class Scenario:
+    name: str
+    make: Callable[[int], Request]
+    write: bool = False
+
+
+@dataclass
+class RouteResult:
+    requests: int
+    errors: int
+    seconds: float
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    db_round_trips_per_request: float
+
+
+class RoundTripCounter:
+    """
+    Counts statements and transaction ends on every engine the app uses.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        engines = [db_session._engine]
+        if db_session._async_engine is not None:
+            engines.append(db_session._async_engine.sync_engine)
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", self._hit)
+            event.listen(engine, "commit", self._hit)
+            event.listen(engine, "rollback", self._hit)
+
+    def _hit(self, *_: object) -> None:
+        self.count += 1
+
+
+def _load_sample(size: int, seed: int) -> Sample:
+    rng = random.Random(seed)
+    with db_session.SessionLocal() as db:
+        max_post, max_user = db.execute(
+            text("SELECT (SELECT coalesce(max(id), 0) FROM posts), (SELECT coalesce(max(id), 0) FROM users)")
+        ).one()
+        if not max_post or not max_user:
+            sys.exit("Database has no posts/users; seed it first (python -m scripts.import_data).")
+        candidates = [rng.randint(1, max_post) for _ in range(size * 4)]
+        posts = db.execute(
+            text("SELECT id, author_id FROM posts WHERE id = ANY(:ids) AND deleted_at IS NULL ORDER BY id"),
+            {"ids": candidates},
+        ).all()
+        candidates = [rng.randint(1, max_user) for _ in range(size * 4)]
+        users = db.scalars(text("SELECT id FROM users WHERE id = ANY(:ids) ORDER BY id"), {"ids": candidates}).all()
+        followers = db.scalars(
+            text("SELECT DISTINCT follower_id FROM follows WHERE follower_id = ANY(:ids) ORDER BY 1"),
+            {"ids": list(users)},
+        ).all()
+    return Sample(
+        post_ids=[row.id for row in posts][:size],
+        author_ids=sorted({row.author_id for row in posts})[:size],
+        user_ids=list(users)[:size],
+        follower_ids=list(followers)[:size] or list(users)[:size],
+    )
+
+
+def _unliked(pairs: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    The pairs that are not likes yet, in order.
+    """
+    with db_session.SessionLocal() as db:
+        liked = set(db.execute(
+            text(
+                "SELECT l.user_id, l.post_id FROM likes l"
+                " JOIN unnest(CAST(:users AS bigint[]), CAST(:posts AS bigint[])) AS c(user_id, post_id)"
+                " USING (user_id, post_id)"
+            ),
+            {"users": [user_id for user_id, _ in pairs], "posts": [post_id for _, post_id in pairs]},
+        ).tuples())
+    return [pair for pair in pairs if pair not in liked]
+
+
+def _scenarios(sample: Sample, requests: int, seed: int) -> List[Scenario]:
+    rng = random.Random(seed)
+    total = requests + WARMUP
+
+    def pick(ids: List[int], count: int = total) -> List[int]:
+        return [rng.choice(ids) for _ in range(count)]
+
+    posts, authors, users, followers = (
+        pick(sample.post_ids), pick(sample.author_ids), pick(sample.user_ids), pick(sample.follower_ids)
+    )
+    post_batches = [",".join(map(str, rng.sample(sample.post_ids, min(20, len(sample.post_ids))))) for _ in range(total)]
+    user_batches = [",".join(map(str, rng.sample(sample.user_ids, min(20, len(sample.user_ids))))) for _ in range(total)]
+    # Pairs that are not liked yet, each used by one request, so the create
+    # run adds every like and the delete run removes exactly those again.
+    # A small sample may give fewer pairs than requests; they are then reused.
+    candidates = zip(pick(sample.user_ids, 2 * total), pick(sample.post_ids, 2 * total))
+    like_pairs = _unliked(list(dict.fromkeys(candidates)))[:total]
+
+    def like(i: int, path: str) -> Request:
+        user_id, post_id = like_pairs[i % len(like_pairs)]
+        return "POST", path, {"user_id": user_id, "post_id": post_id}
+
+    return [
+        Scenario("GET /posts/{id}", lambda i: ("GET", f"/posts/{posts[i]}", None)),
+        Scenario("GET /posts/batch", lambda i: ("GET", f"/posts/batch?ids={post_batches[i]}", None)),
+        Scenario("GET /posts/", lambda i: ("GET", "/posts/?limit=50", None)),
+        Scenario("GET /posts/author/{author_id}", lambda i: ("GET", f"/posts/author/{authors[i]}?limit=50", None)),
+        Scenario("GET /posts/{id}/comments", lambda i: ("GET", f"/posts/{posts[i]}/comments?limit=50", None)),
+        Scenario("GET /users/{id}", lambda i: ("GET", f"/users/{users[i]}", None)),
+        Scenario("GET /users/batch", lambda i: ("GET", f"/users/batch?ids={user_batches[i]}", None)),
+        Scenario("GET /feed/", lambda i: ("GET", f"/feed/?user_id={followers[i]}&limit=50", None)),
+        # Paired over the same new likes so the dataset is unchanged afterwards.
+        Scenario("POST /likes/create", lambda i: like(i, "/likes/create"), write=True),
+        Scenario("POST /likes/delete", lambda i: like(i, "/likes/delete"), write=True),
+    ]
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def _run_scenario(
+    client: httpx.AsyncClient, scenario: Scenario, requests: int, concurrency: int, counter: RoundTripCounter
+) -> RouteResult:
+    latencies: List[float] = []
+    errors = 0
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal next_index, errors
+        while next_index < requests:
+            index, next_index = next_index, next_index + 1
+            method, path, body = scenario.make(index)
+            started = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            latencies.append(time.perf_counter() - started)
+            errors += response.status_code >= 400
+
+    for index in range(requests, requests + WARMUP):
+        method, path, body = scenario.make(index)
+        await client.request(method, path, json=body)
+
+    trips_before = counter.count
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    seconds = time.perf_counter() - started
+    trips = counter.count - trips_before
+
+    latencies.sort()
+    return RouteResult(
+        requests=requests,
+        errors=errors,
+        seconds=round(seconds, 3),
+        rps=round(requests / seconds, 1),
+        p50_ms=round(_percentile(latencies, 0.50) * 1e3, 3),
+        p95_ms=round(_percentile(latencies, 0.95) * 1e3, 3),
+        p99_ms=round(_percentile(latencies, 0.99) * 1e3, 3),
+        db_round_trips_per_request=round(trips / requests, 2),
+    )
+
+
+async def _run(args: argparse.Namespace, scenarios: List[Scenario]) -> Dict[str, RouteResult]:
+    app = create_app()
+    counter = RoundTripCounter()
+    results: Dict[str, RouteResult] = {}
+    limits = httpx.Limits(max_connections=None)
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits) as client:
+            for scenario in scenarios:
+                result = await _run_scenario(client, scenario, args.requests, args.concurrency, counter)
+                results[scenario.name] = result
+                print(
+                    f"{scenario.name:<32}{result.rps:>9.0f}{result.p50_ms:>9.2f}{result.p95_ms:>9.2f}"
+                    f"{result.p99_ms:>9.2f}{result.db_round_trips_per_request:>8.2f}{result.errors:>7}",
+                    flush=True,
+                )
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _compare(results: Dict[str, RouteResult], baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nvs {baseline_path} ({baseline['meta'].get('commit')})")
+    print(f"{'route':<32}{'rps':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'trips':>10}")
+
+    def delta(new: float, old: float) -> str:
+        return f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+
+    for name, result in results.items():
+        old = baseline["routes"].get(name)
+        if old is None:
+            continue
+        print(
+            f"{name:<32}{delta(result.rps, old['rps']):>10}{delta(result.p50_ms, old['p50_ms']):>10}"
+            f"{delta(result.p95_ms, old['p95_ms']):>10}{delta(result.p99_ms, old['p99_ms']):>10}"
+            f"{result.db_round_trips_per_request - old['db_round_trips_per_request']:>+10.2f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1000, help="per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--routes", nargs="+", help="substring filter on scenario names")
+    parser.add_argument("--writes", action="store_true", help="include like create/delete scenarios")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--sample-size", type=int, default=1000, help="distinct ids sampled per kind")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--compare", help="baseline JSON from an earlier --output")
+    args = parser.parse_args()
+
+    sample = _load_sample(args.sample_size, args.seed)
+    scenarios = [
+        scenario
+        for scenario in _scenarios(sample, args.requests, args.seed)
+        if (args.writes or not scenario.write)
+        and (not args.routes or any(part in scenario.name for part in args.routes))
+    ]
+
+    print(f"{args.requests} requests/scenario, concurrency {args.concurrency}, "
+          f"DB_ASYNC={settings.DB_ASYNC}, CACHE_BACKEND={settings.CACHE_BACKEND}")
+    print(f"{'route':<32}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'trips':>8}{'errors':>7}")
+    results = asyncio.run(_run(args, scenarios))
+
+    if args.output:
+        payload = {
+            "meta": {
+                "commit": _git_commit(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+                "seed": args.seed,
+                "settings": {
+                    "DB_ASYNC": settings.DB_ASYNC,
+                    "CACHE_BACKEND": settings.CACHE_BACKEND,
+                    "LIKE_BUFFER_ENABLED": settings.LIKE_BUFFER_ENABLED,
+                    "FEED_FANOUT_THRESHOLD": settings.FEED_FANOUT_THRESHOLD,
+                },
+            },
+            "routes": {name: asdict(result) for name, result in results.items()},
+        }
+        with open(args.output, "w") as f:
+            json.dump(payload, f, indent=2)
+        print(f"\nSaved {args.output}")
+    if args.compare:
+        _compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Cost of metrics collection on the hot path.
+
+- one histogram observation (labelled child, already cached)
+- per request: a /ping route with and without MetricsMiddleware
+- per statement: `SELECT 1` on a plain engine and on one with the
+  instrumented pool and cursor events (needs the database)
+
+    python -m benchmarks.metrics_overhead --requests 20000 --statements 5000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List, Tuple
+
+import benchmarks._env  # noqa: F401
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+from config.settings import settings
+from core.metrics import Histogram
+from db.instrumentation import instrument_engine, instrumented_pool_class
+from middlewares.metrics import MetricsMiddleware
+
+
+def _observe(iterations: int) -> float:
+    child = Histogram("bench_seconds", "Benchmark.", ("route",)).labels("/ping")
+    started = time.perf_counter()
+    for _ in range(iterations):
+        child.observe(0.003)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def _build_app(instrumented: bool) -> FastAPI:
+    app = FastAPI()
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+
+    @app.get("/ping")
+    async def ping() -> dict:
+        return {"ok": True}
+
+    return app
+
+
+async def _requests(requests: int, rounds: int = 10) -> Tuple[float, float]:
+    """
+    Median us/request for (plain, instrumented), rounds alternating.
+    """
+    clients = [
+        httpx.AsyncClient(transport=httpx.ASGITransport(app=_build_app(instrumented)), base_url="http://bench")
+        for instrumented in (False, True)
+    ]
+    timings: List[List[float]] = [[], []]
+    for client in clients:
+        for _ in range(min(500, requests)):  # warm-up
+            await client.get("/ping")
+    per_round = requests // rounds or 1
+    for _ in range(rounds):
+        for client, samples in zip(clients, timings):
+            started = time.perf_counter()
+            for _ in range(per_round):
+                await client.get("/ping")
+            samples.append((time.perf_counter() - started) / per_round * 1e6)
+    for client in clients:
+        await client.aclose()
+    return statistics.median(timings[0]), statistics.median(timings[1])
+
+
+def _engine(instrumented: bool) -> Engine:
+    if not instrumented:
+        return create_engine(settings.DATABASE_URL)
+    engine = create_engine(settings.DATABASE_URL, poolclass=instrumented_pool_class(QueuePool, "bench"))
+    instrument_engine(engine, "bench")
+    return engine
+
+
+def _round(engine: Engine, statements: int) -> float:
+    """
+    One checkout + SELECT 1 + checkin per iteration, like a short request.
+    """
+    started = time.perf_counter()
+    for _ in range(statements):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    return (time.perf_counter() - started) / statements * 1e6
+
+
+def _statements(statements: int, rounds: int = 10) -> Tuple[float, float]:
+    """
+    Median us/statement for (plain, instrumented); rounds alternate between
+    the two engines so drift on a busy machine hits both alike.
+    """
+    engines = [_engine(False), _engine(True)]
+    timings: List[List[float]] = [[], []]
+    try:
+        for engine in engines:
+            _round(engine, min(500, statements))  # warm-up
+        for _ in range(rounds):
+            for engine, samples in zip(engines, timings):
+                samples.append(_round(engine, statements // rounds or 1))
+    finally:
+        for engine in engines:
+            engine.dispose()
+    return statistics.median(timings[0]), statistics.median(timings[1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--statements", type=int, default=10000, help="0 skips the database part")
+    args = parser.parse_args()
+
+    print(f"histogram observe: {_observe(200000):.2f} us")
+    print(f"{'case':<12}{'plain (us)':>14}{'metrics (us)':>14}{'delta':>10}")
+    before, after = asyncio.run(_requests(args.requests))
+    print(f"{'request':<12}{before:>14.1f}{after:>14.1f}{(after - before) / before:>10.1%}")
+    if args.statements:
+        before, after = _statements(args.statements)
+        print(f"{'statement':<12}{before:>14.1f}{after:>14.1f}{(after - before) / before:>10.1%}")
+
+
+if __name__ == "__main__":
+    main()
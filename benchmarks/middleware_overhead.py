@@ -0,0 +1,88 @@
+"""
+Per-request overhead of the session/auth middleware pair.
+
+Compares the previous BaseHTTPMiddleware implementation (eager Session per
+request) with the pure-ASGI, lazy-session middlewares in `middlewares/`,
+on a route that never touches the database and on a 404.
+
+    python -m benchmarks.middleware_overhead --requests 20000
+"""
+import argparse
+import asyncio
+import time
+from typing import Callable
+
+import benchmarks._env  # noqa: F401
+
+import httpx
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from db.session import get_session
+from middlewares.db_session import DbSessionMiddleware
+from middlewares.jwt_auth import JwtAuthMiddleware
+
+
+class LegacyDbSessionMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        db = get_session()
+        request.state.db = db
+        try:
+            return await call_next(request)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+class LegacyJwtAuthMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        request.state.user_id = None
+        return await call_next(request)
+
+
+def _build_app(legacy: bool) -> FastAPI:
+    app = FastAPI()
+    if legacy:
+        app.add_middleware(LegacyJwtAuthMiddleware)
+        app.add_middleware(LegacyDbSessionMiddleware)
+    else:
+        app.add_middleware(JwtAuthMiddleware)
+        app.add_middleware(DbSessionMiddleware)
+
+    @app.get("/ping")
+    async def ping() -> dict:
+        return {"ok": True}
+
+    return app
+
+
+async def _run(app: FastAPI, path: str, requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(min(500, requests)):  # warm-up
+            await client.get(path)
+        started = time.perf_counter()
+        for _ in range(requests):
+            await client.get(path)
+        elapsed = time.perf_counter() - started
+    return elapsed / requests * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=10000)
+    args = parser.parse_args()
+
+    print(f"{'path':<10}{'before (us/req)':>18}{'after (us/req)':>18}{'delta':>10}")
+    for path in ("/ping", "/missing"):
+        before = asyncio.run(_run(_build_app(legacy=True), path, args.requests))
+        after = asyncio.run(_run(_build_app(legacy=False), path, args.requests))
+        print(f"{path:<10}{before:>18.1f}{after:>18.1f}{(after - before) / before:>10.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Statements per write use case, checked against the expected counts.
+
+Each case runs one service call in a fresh session under
+core.query_budget.track_statements(), the tracker the cursor hook in
+db/instrumentation.py feeds for @query_budget, and the script exits 1 if
+any count or outcome ("ok" or the DomainError raised) differs from the
+expected one, so a write path that grows a read-before-write (or an extra
+round trip), or stops enforcing a rule, fails here instead of in
+production. Commits are not counted, as for the route budgets. Comments
+have no write use case yet; their page read, which also decides the 404,
+is checked instead.
+
+Writes go to the configured database: throwaway users and their posts,
+which are deleted (and queued for purge) by the cases or at the end. Likes are counted
+unbuffered whatever LIKE_BUFFER_ENABLED says in the environment.
+
+    python -m benchmarks.write_statements
+"""
+import os
+import sys
+import uuid
+from typing import Any, Callable, Dict, List, Tuple
+
+import benchmarks._env  # noqa: F401
+
+os.environ["LIKE_BUFFER_ENABLED"] = "false"
+
+from core.errors import DomainError
+from core.query_budget import track_statements
+from db.session import SessionLocal
+from dtos.feed import FollowDTO
+from dtos.likes import LikeDTO
+from dtos.posts import CreatePostDTO, DeletePostDTO, UpdatePostDTO
+from dtos.users import CreateUserDTO
+from services.comment import CommentService
+from services.feed import FeedService
+from services.like import LikeService
+from services.post import PostService
+from services.user import UserService
+
+# Larger than any id the sequences will hand out.
+MISSING_ID = 2**31 - 1
+
+# name, statements, outcome, call
+Case = Tuple[str, int, str, Callable[[Any, Dict[str, Any]], Any]]
+
+
+def _email() -> str:
+    return f"write-statements-{uuid.uuid4().hex[:12]}@example.com"
+
+
+def _cases() -> List[Case]:
+    users, posts, likes, feed = UserService(), PostService(), LikeService(), FeedService()
+    comments = CommentService()
+
+    def create_user(key: str) -> Callable:
+        def run(db, state):
+            state[f"{key}_email"] = email = _email()
+            state[key] = users.create_user(db, CreateUserDTO(email=email, name="bench")).id
+        return run
+
+    def create_post(db, state):
+        state["post"] = posts.create_post(db, CreatePostDTO(author_id=state["author"], content="hello")).id
+
+    def create_users(db, state):
+        results = users.create_users(db, [CreateUserDTO(email=_email(), name="bench") for _ in range(5)])
+        state["bulk"] = [result.data.id for result in results if result.error is None]
+
+    def create_posts(db, state):
+        items = [CreatePostDTO(author_id=state["author"], content=f"bulk {i}") for i in range(5)]
+        items.append(CreatePostDTO(author_id=MISSING_ID, content="no author"))
+        state["kept"] = posts.create_posts(db, items)[0].data.id
+
+    return [
+        ("user.create", 1, "ok", create_user("author")),
+        ("user.create (email taken)", 1, "ConflictError", lambda db, s: users.create_user(
+            db, CreateUserDTO(email=s["author_email"], name="bench"))),
+        ("user.create_many", 1, "ok", create_users),
+        ("user.create (fan)", 1, "ok", create_user("fan")),
+        ("post.create", 2, "ok", create_post),
+        ("post.create_many", 3, "ok", create_posts),
+        ("post.update", 1, "ok", lambda db, s: posts.update_post(db, UpdatePostDTO(id=s["post"], caption="edited"))),
+        ("post.update (missing)", 1, "NotFoundError", lambda db, s: posts.update_post(
+            db, UpdatePostDTO(id=MISSING_ID, caption="x"))),
+        ("like.add", 1, "ok", lambda db, s: likes.like(db, LikeDTO(user_id=s["fan"], post_id=s["post"]))),
+        ("like.add (already liked)", 1, "ok", lambda db, s: likes.like(
+            db, LikeDTO(user_id=s["fan"], post_id=s["post"]))),
+        ("like.add (missing post)", 1, "NotFoundError", lambda db, s: likes.like(
+            db, LikeDTO(user_id=s["fan"], post_id=MISSING_ID))),
+        ("like.remove", 1, "ok", lambda db, s: likes.unlike(db, LikeDTO(user_id=s["fan"], post_id=s["post"]))),
+        ("comment.page", 1, "ok", lambda db, s: comments.get_comments(db, s["post"])),
+        ("comment.page (missing post)", 1, "NotFoundError", lambda db, s: comments.get_comments(db, MISSING_ID)),
+        ("follow.create", 3, "ok", lambda db, s: feed.follow(
+            db, FollowDTO(follower_id=s["fan"], followee_id=s["author"]))),
+        ("follow.delete", 3, "ok", lambda db, s: feed.unfollow(
+            db, FollowDTO(follower_id=s["fan"], followee_id=s["author"]))),
+        ("post.delete", 1, "ok", lambda db, s: posts.delete_post(db, DeletePostDTO(id=s["post"]))),
+        ("post.delete (missing)", 1, "NotFoundError", lambda db, s: posts.delete_post(
+            db, DeletePostDTO(id=MISSING_ID))),
+        ("user.delete", 1, "ok", lambda db, s: users.delete_user(db, s["fan"])),
+        ("user.delete (already deleted)", 1, "NotFoundError", lambda db, s: users.delete_user(db, s["fan"])),
+        ("like.add (deleted user)", 1, "NotFoundError", lambda db, s: likes.like(
+            db, LikeDTO(user_id=s["fan"], post_id=s["kept"]))),
+        ("follow.create (deleted user)", 1, "NotFoundError", lambda db, s: feed.follow(
+            db, FollowDTO(follower_id=s["fan"], followee_id=s["author"]))),
+        ("user.delete (author)", 1, "ok", lambda db, s: users.delete_user(db, s["author"])),
+        ("post.create (deleted author)", 1, "NotFoundError", lambda db, s: posts.create_post(
+            db, CreatePostDTO(author_id=s["author"], content="too late"))),
+    ]
+
+
+def _delete_bulk_users(state: Dict[str, Any]) -> None:
+    """
+    Delete the users created by user.create_many (not counted).
+    """
+    users = UserService()
+    with SessionLocal() as db:
+        for user_id in state.get("bulk", []):
+            users.delete_user(db, user_id)
+
+
+def main() -> None:
+    state: Dict[str, Any] = {}
+    failures = 0
+    try:
+        for name, expected, expected_outcome, run in _cases():
+            with SessionLocal() as db, track_statements() as tracker:
+                try:
+                    run(db, state)
+                    outcome = "ok"
+                except DomainError as exc:
+                    outcome = type(exc).__name__
+            problems = []
+            if tracker.count != expected:
+                problems.append(f"expected {expected} statements")
+            if outcome != expected_outcome:
+                problems.append(f"expected {expected_outcome}")
+            flag = f"  <-- {', '.join(problems)}" if problems else ""
+            failures += bool(problems)
+            print(f"{name:32} {tracker.count:>3}  {outcome}{flag}")
+    finally:
+        _delete_bulk_users(state)
+
+    if failures:
+        print(f"{failures} use case(s) off their expected statement count or outcome")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
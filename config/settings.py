@@ -1,5 +1,8 @@
+from typing import List, Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import computed_field
+from sqlalchemy.engine import make_url
 
 class Settings(BaseSettings):
     POSTGRES_USER: str
@@ -11,10 +14,110 @@ class Settings(BaseSettings):
     JWT_SECRET: str
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION: int = 3600
+    # Verified tokens remembered (by hash, until their exp) to skip re-verifying.
+    JWT_CACHE_SIZE: int = 10_000
+    # Path prefixes served without looking at the Authorization header.
+    JWT_PUBLIC_PATHS: List[str] = ["/docs", "/redoc", "/openapi.json", "/metrics"]
     
     DEBUG: bool = False
     TESTING: bool = False
 
+    # When enabled, the posts/users routes run as native coroutines on an
+    # AsyncEngine instead of being dispatched to the threadpool.
+    DB_ASYNC: bool = False
+
+    # Connection pool per engine. DB_POOL_TIMEOUT is how long a checkout may
+    # wait for a free connection before failing with a 503.
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 5.0
+
+    # Streaming replicas (SQLAlchemy URLs, postgresql+psycopg2://...) serving
+    # the read-only service calls. After a write the client is kept on the
+    # primary for REPLICA_STICKY_SECONDS via the REPLICA_STICKY_COOKIE cookie.
+    DB_REPLICA_URLS: List[str] = []
+    REPLICA_STICKY_SECONDS: float = 5.0
+    REPLICA_STICKY_COOKIE: str = "db_primary_until"
+
+    # Admission control in front of the DB layer (middlewares/admission.py).
+    # Reads (GET/HEAD), writes and streamed responses (ADMISSION_STREAM_PATHS,
+    # which hold their connection until the body is sent) get separate
+    # in-flight limits and queues; keep their sum within DB_POOL_SIZE +
+    # DB_MAX_OVERFLOW. A request whose estimated queue wait exceeds
+    # ADMISSION_WAIT_BUDGET_MS is answered 503 straight away instead of
+    # waiting for the pool.
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_READ_LIMIT: int = 20
+    ADMISSION_WRITE_LIMIT: int = 10
+    ADMISSION_STREAM_LIMIT: int = 2
+    ADMISSION_STREAM_PATHS: List[str] = ["/posts/export"]
+    ADMISSION_WAIT_BUDGET_MS: int = 500
+    ADMISSION_EXEMPT_PATHS: List[str] = ["/docs", "/redoc", "/openapi.json", "/metrics"]
+
+    # Request/repository/statement latency and pool metrics, served on
+    # /metrics in the Prometheus text format.
+    METRICS_ENABLED: bool = True
+
+    # Server-Timing header splitting each request into queue / pool wait /
+    # SQL / JSON encoding / the rest. Off by default: it exposes internals.
+    SERVER_TIMING_ENABLED: bool = False
+    # Stack-sampling profiler: profile this fraction of requests, and/or any
+    # request slower than PROFILE_SLOW_MS (0 = off), as folded stacks in
+    # PROFILE_DIR. Stacks are sampled every PROFILE_INTERVAL_MS; at most
+    # PROFILE_MAX_PER_MINUTE profiles are written (0 = no cap).
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_SLOW_MS: int = 0
+    PROFILE_MAX_PER_MINUTE: int = 30
+    PROFILE_INTERVAL_MS: float = 5.0
+    PROFILE_DIR: str = "profiles"
+
+    # Count SQL statements per request (DbSessionMiddleware). Routes declare
+    # a @query_budget; exceeding it fails the request under TESTING and is
+    # logged otherwise. The same statement text run with this many
+    # different parameter sets in one request is logged as a likely N+1.
+    QUERY_TRACKING_ENABLED: bool = True
+    QUERY_REPEAT_THRESHOLD: int = 3
+
+    # Authors with at least this many followers are not fanned out on write;
+    # their posts are merged into followers' feeds at read time instead.
+    FEED_FANOUT_THRESHOLD: int = 10_000
+    # Recent posts copied into a timeline when a user follows someone.
+    FEED_BACKFILL_LIMIT: int = 50
+
+    # Seconds between write-behind flushes of like/comment counter deltas.
+    COUNTER_FLUSH_INTERVAL: float = 1.0
+
+    # Coalesce like/unlike toggles per (user, post) for this many milliseconds
+    # and write them as one multi-row statement per window.
+    LIKE_BUFFER_ENABLED: bool = False
+    LIKE_BUFFER_WINDOW_MS: int = 50
+
+    # Background purge of deleted users (services/user_deletion.py): rows go
+    # USER_DELETION_BATCH_SIZE at a time, one short transaction per batch,
+    # with a USER_DELETION_BATCH_PAUSE_MS pause in between. Jobs are leased
+    # for USER_DELETION_LEASE_SECONDS (renewed per batch) and polled for every
+    # USER_DELETION_POLL_INTERVAL seconds. Disable to run the purge elsewhere
+    # (scripts/purge_deleted_users.py).
+    USER_DELETION_ENABLED: bool = True
+    USER_DELETION_BATCH_SIZE: int = 1000
+    USER_DELETION_BATCH_PAUSE_MS: int = 50
+    USER_DELETION_LEASE_SECONDS: float = 60.0
+    USER_DELETION_POLL_INTERVAL: float = 30.0
+
+    # Upper bound on ids accepted by the /users/batch and /posts/batch endpoints.
+    BATCH_MAX_IDS: int = 100
+    # Upper bound on items accepted by POST /posts/bulk and /users/bulk.
+    BULK_MAX_ITEMS: int = 1000
+    # Rows fetched per server-side cursor round trip by GET /posts/export.
+    EXPORT_CHUNK_SIZE: int = 1000
+
+    # Read-through cache for post/user lookups by id ("redis" needs the
+    # optional redis package). Entries live at most CACHE_TTL seconds.
+    CACHE_BACKEND: Literal["memory", "redis", "none"] = "memory"
+    CACHE_TTL: float = 30.0
+    CACHE_MAX_ENTRIES: int = 10_000
+    REDIS_URL: str = "redis://localhost:6379/0"
+
     @computed_field
     @property
     def DATABASE_URL(self) -> str:
@@ -25,6 +128,24 @@ class Settings(BaseSettings):
             f"{self.POSTGRES_DB}"
         )
 
+    @computed_field
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return (
+            f"postgresql+psycopg://{self.POSTGRES_USER}:"
+            f"{self.POSTGRES_PASSWORD}@"
+            f"{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/"
+            f"{self.POSTGRES_DB}"
+        )
+
+    @computed_field
+    @property
+    def ASYNC_DB_REPLICA_URLS(self) -> List[str]:
+        return [
+            make_url(url).set(drivername="postgresql+psycopg").render_as_string(hide_password=False)
+            for url in self.DB_REPLICA_URLS
+        ]
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -0,0 +1,279 @@
+"""
+Read-through cache for hot single-row reads (post and user lookups by id).
+
+Backends, selected by CACHE_BACKEND:
+- "memory": per-process LRU with a TTL and a hard entry cap.
+- "redis":  shared Redis-compatible server; needs the optional `redis` package.
+- "none":   no caching (every get is a miss).
+
+Values must be picklable for the redis backend; services cache the slotted
+record DTOs, never session-bound ORM instances.
+"""
+import logging
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from config.settings import settings
+from core.metrics import registry
+
+try:
+    import redis
+except ImportError:  # optional dependency: `pip install socialz[redis]`
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Returned by get() on a miss, so a cached None is not confused with absence.
+MISSING = object()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+
+
+class Cache:
+    """
+    Interface shared by all backends. The base class is the "none" backend.
+    """
+
+    def __init__(self) -> None:
+        self._stats = CacheStats()
+
+    def get(self, key: str) -> Any:
+        self._stats.misses += 1
+        return MISSING
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Hits only; keys that are absent or expired are left out.
+        """
+        self._stats.misses += len(keys)
+        return {}
+
+    def set_many(self, items: Mapping[str, Any]) -> None:
+        pass
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        pass
+
+    def delete(self, key: str) -> None:
+        self.delete_many((key,))
+
+    def clear(self) -> None:
+        pass
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self._stats.hits, self._stats.misses, self._stats.evictions)
+
+
+class MemoryCache(Cache):
+    """
+    LRU + TTL in a single OrderedDict (oldest first). Expired entries are
+    dropped when read; the entry cap bounds memory regardless of TTL.
+    The lock makes it safe for the threadpool that runs sync routes.
+    """
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        super().__init__()
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._stats.hits += 1
+                    return entry[1]
+                del self._entries[key]
+            self._stats.misses += 1
+            return MISSING
+
+    def set(self, key: str, value: Any) -> None:
+        self.set_many({key: value})
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not MISSING:
+                found[key] = value
+        return found
+
+    def set_many(self, items: Mapping[str, Any]) -> None:
+        expires_at = time.monotonic() + self._ttl
+        with self._lock:
+            for key, value in items.items():
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            stats = super().stats()
+            stats.size = len(self._entries)
+            return stats
+
+
+class RedisCache(Cache):
+    """
+    Shared cache on a Redis-compatible server. Entries expire server-side;
+    evictions are the server's `evicted_keys` counter. Connection errors are
+    logged and treated as misses so an unavailable cache never fails a read.
+
+    Deletes run after the write has committed, so they never raise either:
+    keys whose delete failed are remembered, read as misses by this process
+    and deleted again with the next invalidation (or overwritten by the next
+    successful set). Other processes can serve such an entry until it is
+    retried or its TTL runs out.
+    """
+
+    _DELETE_CHUNK = 1000
+
+    def __init__(self, url: str, ttl: float, prefix: str = "socialz:") -> None:
+        if redis is None:
+            raise RuntimeError("CACHE_BACKEND=redis requires the `redis` package.")
+        super().__init__()
+        self._client = redis.Redis.from_url(url, socket_timeout=0.1, socket_connect_timeout=0.1)
+        self._ttl_ms = int(ttl * 1000)
+        self._prefix = prefix
+        # Prefixed keys whose invalidation has not reached the server yet.
+        self._undeleted: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        raw = None
+        if self._prefix + key not in self._undeleted:
+            try:
+                raw = self._client.get(self._prefix + key)
+            except redis.RedisError:
+                logger.warning("Cache get failed for %s.", key, exc_info=True)
+        if raw is None:
+            self._stats.misses += 1
+            return MISSING
+        self._stats.hits += 1
+        return pickle.loads(raw)
+
+    def set(self, key: str, value: Any) -> None:
+        try:
+            self._client.set(self._prefix + key, pickle.dumps(value), px=self._ttl_ms)
+        except redis.RedisError:
+            logger.warning("Cache set failed for %s.", key, exc_info=True)
+            return
+        self._forget_undeleted((self._prefix + key,))
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        try:
+            raws = self._client.mget([self._prefix + key for key in keys]) if keys else []
+        except redis.RedisError:
+            logger.warning("Cache mget failed for %d keys.", len(keys), exc_info=True)
+            raws = [None] * len(keys)
+        found = {
+            key: pickle.loads(raw) for key, raw in zip(keys, raws)
+            if raw is not None and self._prefix + key not in self._undeleted
+        }
+        self._stats.hits += len(found)
+        self._stats.misses += len(keys) - len(found)
+        return found
+
+    def set_many(self, items: Mapping[str, Any]) -> None:
+        pipe = self._client.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.set(self._prefix + key, pickle.dumps(value), px=self._ttl_ms)
+        try:
+            pipe.execute()
+        except redis.RedisError:
+            logger.warning("Cache set failed for %d keys.", len(items), exc_info=True)
+            return
+        self._forget_undeleted([self._prefix + key for key in items])
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            pending = self._undeleted.union(self._prefix + key for key in keys)
+            self._undeleted = pending
+        keys = list(pending)
+        try:
+            for start in range(0, len(keys), self._DELETE_CHUNK):
+                self._client.delete(*keys[start:start + self._DELETE_CHUNK])
+        except redis.RedisError:
+            logger.warning("Cache delete failed for %d keys; retried on the next invalidation.",
+                           len(keys), exc_info=True)
+            return
+        self._forget_undeleted(keys)
+
+    def _forget_undeleted(self, keys: Iterable[str]) -> None:
+        if self._undeleted:
+            with self._lock:
+                self._undeleted.difference_update(keys)
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter(match=self._prefix + "*", count=1000):
+            self._client.delete(key)
+
+    def stats(self) -> CacheStats:
+        stats = super().stats()
+        try:
+            info: Dict[str, Any] = self._client.info("stats")
+            stats.evictions = int(info.get("evicted_keys", 0))
+            stats.size = int(self._client.dbsize())
+        except redis.RedisError:
+            logger.warning("Cache stats unavailable.", exc_info=True)
+        return stats
+
+
+def create_cache(backend: Optional[str] = None) -> Cache:
+    backend = backend or settings.CACHE_BACKEND
+    if backend == "memory":
+        return MemoryCache(settings.CACHE_MAX_ENTRIES, settings.CACHE_TTL)
+    if backend == "redis":
+        return RedisCache(settings.REDIS_URL, settings.CACHE_TTL)
+    if backend == "none":
+        return Cache()
+    raise RuntimeError(f"Unknown CACHE_BACKEND: {backend!r}")
+
+
+# Process-wide instance used by the services.
+cache = create_cache()
+
+
+def _cache_stat(field: str):
+    return lambda: [((), getattr(cache.stats(), field))]
+
+
+registry.sampled("cache_hits_total", "Cache lookups that hit.", _cache_stat("hits"), type="counter")
+registry.sampled("cache_misses_total", "Cache lookups that missed.", _cache_stat("misses"), type="counter")
+registry.sampled("cache_evictions_total", "Entries evicted to respect the size cap.", _cache_stat("evictions"), type="counter")
+registry.sampled("cache_entries", "Entries currently cached.", _cache_stat("size"))
+
+
+def post_key(post_id: int) -> str:
+    return f"post:{post_id}"
+
+
+def user_key(user_id: int) -> str:
+    return f"user:{user_id}"
@@ -0,0 +1,59 @@
+"""
+HTTP validators (ETag / Last-Modified) and conditional GET handling for
+single-resource reads. ETags are derived from the row version, which every
+UPDATE bumps, so they can be checked without loading the row.
+"""
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+
+def make_etag(kind: str, id: int, version: int) -> str:
+    return f'"{kind}-{id}-{version}"'
+
+
+def wants_revalidation(request: Request) -> bool:
+    """
+    True when the client sent a validator worth a version-only lookup.
+    """
+    headers = request.headers
+    return "if-none-match" in headers or "if-modified-since" in headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    """
+    RFC 9110 13.1: If-None-Match (weak comparison) takes precedence; only
+    without it is If-Modified-Since evaluated, at one-second resolution.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        tags = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+        return etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    return last_modified.replace(microsecond=0) <= since
+
+
+def set_validators(response: Response, etag: str, last_modified: datetime) -> Response:
+    response.headers["etag"] = etag
+    response.headers["last-modified"] = format_datetime(
+        last_modified.astimezone(timezone.utc), usegmt=True
+    )
+    # Cacheable, but clients must revalidate before reuse.
+    response.headers["cache-control"] = "no-cache"
+    return response
+
+
+def not_modified_response(etag: str, last_modified: datetime) -> Response:
+    return set_validators(Response(status_code=304), etag, last_modified)
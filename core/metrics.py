@@ -0,0 +1,298 @@
+"""
+In-process metrics registry rendered in the Prometheus text format (0.0.4).
+
+Three kinds of metric:
+- Counter / Histogram: updated on the hot path. Children are cached per
+  label-value tuple, so an update is one dict lookup plus a locked add.
+- Sampled: a callback read only when /metrics is scraped (pool gauges,
+  cache and admission stats), so it costs nothing per request.
+
+Label values must come from bounded sets (route templates, method names),
+never from raw paths or ids.
+"""
+import bisect
+import functools
+import inspect
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Sequence, Tuple
+
+from config.settings import settings
+
+LabelValues = Tuple[str, ...]
+
+# Seconds; request and repository latencies.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Seconds; single statements and pool checkouts are usually well under 1 ms.
+FAST_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0, 5.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        """
+        (name suffix, rendered labels, value) triples.
+        """
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class _CounterChild:
+    __slots__ = ("_lock", "value")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._children: Dict[LabelValues, _CounterChild] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> _CounterChild:
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, _CounterChild())
+        return child
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        for values, child in list(self._children.items()):
+            yield "", _format_labels(self.labelnames, values), child.value
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "_lock", "counts", "sum")
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self._bounds = bounds
+        self._lock = threading.Lock()
+        self.counts = [0] * (len(bounds) + 1)  # per bucket, last is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self._bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._children: Dict[LabelValues, _HistogramChild] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> _HistogramChild:
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, _HistogramChild(self.buckets))
+        return child
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        bounds = [*map(_format_value, self.buckets), "+Inf"]
+        for values, child in list(self._children.items()):
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                yield "_bucket", _format_labels(self.labelnames, values, f'le="{bound}"'), cumulative
+            yield "_sum", _format_labels(self.labelnames, values), total
+            yield "_count", _format_labels(self.labelnames, values), cumulative
+
+
+class Sampled(Metric):
+    """
+    Gauge or counter whose values are read from `collect` at scrape time;
+    `collect` returns (label values, value) pairs.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        collect: Callable[[], Iterable[Tuple[LabelValues, float]]],
+        labelnames: Sequence[str] = (),
+        type: str = "gauge",
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.type = type
+        self._collect = collect
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        for values, value in self._collect():
+            yield "", _format_labels(self.labelnames, values), value
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered.")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._metrics.pop(name, None)
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def histogram(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def sampled(
+        self,
+        name: str,
+        help: str,
+        collect: Callable[[], Iterable[Tuple[LabelValues, float]]],
+        labelnames: Sequence[str] = (),
+        type: str = "gauge",
+    ) -> Sampled:
+        return self.register(Sampled(name, help, collect, labelnames, type))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+# Process-wide registry served on /metrics.
+registry = Registry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template, method and status.",
+    ("route", "method", "status"),
+)
+repository_call_duration = registry.histogram(
+    "repository_call_duration_seconds",
+    "Repository method latency (including waits for a pool connection).",
+    ("method",),
+)
+db_statement_duration = registry.histogram(
+    "db_statement_duration_seconds",
+    "Cursor execute latency by engine and statement verb.",
+    ("engine", "verb"),
+    FAST_BUCKETS,
+)
+db_pool_checkout_wait = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pool connection.",
+    ("engine",),
+    FAST_BUCKETS,
+)
+db_statements_per_request = registry.histogram(
+    "db_statements_per_request",
+    "SQL statements executed per request, by route template.",
+    ("route",),
+    (0, 1, 2, 3, 5, 8, 13, 21, 50, 100),
+)
+db_session_rollbacks = registry.counter(
+    "db_session_rollbacks_total",
+    "Request sessions rolled back by DbSessionMiddleware after an error.",
+    ("session",),
+)
+
+
+def instrument_methods(cls: type) -> type:
+    """
+    Class decorator: time every public method of a repository into
+    repository_call_duration{method="Class.method"}. Generator methods
+    (streams) are left alone; their cost is spread over the consumer.
+    A no-op unless METRICS_ENABLED.
+    """
+    if not settings.METRICS_ENABLED:
+        return cls
+    for name, func in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.isfunction(func):
+            continue
+        if inspect.isgeneratorfunction(func) or inspect.isasyncgenfunction(func):
+            continue
+        setattr(cls, name, _timed(func, repository_call_duration.labels(f"{cls.__name__}.{name}")))
+    return cls
+
+
+def _timed(func: Callable[..., Any], child: Any) -> Callable[..., Any]:
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                child.observe(time.perf_counter() - started)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            child.observe(time.perf_counter() - started)
+
+    return wrapper
@@ -0,0 +1,59 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+from core.errors import ValidationError
+
+# Keyset position of a row in (created_at DESC, id DESC) order.
+Keyset = Tuple[datetime, int]
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """
+    Encode a keyset position as an opaque, URL-safe cursor.
+    """
+    raw = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Keyset]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+    Raises ValidationError for anything that isn't one.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(id)
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+        raise ValidationError("Invalid pagination cursor.", details={"cursor": cursor})
+
+
+def split_page(rows: Sequence[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """
+    Repositories are asked for limit + 1 rows; the extra row only tells us
+    whether another page exists. Rows need `created_at` and `id`.
+    """
+    if len(rows) <= limit:
+        return list(rows), None
+    rows = list(rows[:limit])
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
+
+
+def batch_ids(ids: Iterable[int], max_ids: int) -> List[int]:
+    """
+    De-duplicated ids for a batch lookup, in request order. Batches are
+    bounded like pages: more than `max_ids` distinct ids is a ValidationError.
+    """
+    unique = list(dict.fromkeys(ids))
+    if len(unique) > max_ids:
+        raise ValidationError(
+            f"At most {max_ids} ids per request.",
+            details={"count": len(unique), "max": max_ids},
+        )
+    return unique
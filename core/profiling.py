@@ -0,0 +1,171 @@
+"""
+Sampling profiler for slow or randomly chosen requests.
+
+A daemon thread snapshots the Python stack of every other thread each
+PROFILE_INTERVAL_MS (`sys._current_frames`) into a bounded, timestamped
+buffer. When a request is picked (PROFILE_SAMPLE_RATE) or turns out slow
+(PROFILE_SLOW_MS), ServerTimingMiddleware writes the samples taken during
+its lifetime to PROFILE_DIR in the folded-stack format read by
+flamegraph.pl and speedscope.
+
+Samples are per thread, not per request: concurrent requests on the event
+loop or in the threadpool show up in each other's windows, which is also
+what slowed them down. Threads parked in an idle wait are skipped.
+
+The sampler runs only while there is something to profile: always when a
+slow threshold is set, otherwise only while a picked request is in flight.
+"""
+import itertools
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Deque, Dict, Optional, Tuple
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# (code, line) pairs, outermost first.
+Stack = Tuple[Tuple[object, int], ...]
+
+MAX_DEPTH = 128
+
+# Leaf frames of a thread with nothing to do.
+_IDLE_LEAVES = frozenset({("threading.py", "wait"), ("selectors.py", "select"), ("queue.py", "get")})
+
+
+class StackSampler:
+    def __init__(
+        self,
+        interval: Optional[float] = None,
+        always: Optional[bool] = None,
+        max_samples: int = 100_000,
+    ) -> None:
+        self._interval = interval if interval is not None else settings.PROFILE_INTERVAL_MS / 1000
+        self._always = always if always is not None else settings.PROFILE_SLOW_MS > 0
+        self._samples: Deque[Tuple[float, int, Stack]] = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        self._samples.clear()
+
+    def activate(self) -> None:
+        """
+        A picked request started; sample until the matching deactivate().
+        """
+        with self._lock:
+            self._active += 1
+        self._wake.set()
+
+    def deactivate(self) -> None:
+        with self._lock:
+            self._active -= 1
+            if self._active == 0 and not self._always:
+                self._wake.clear()
+
+    def window(self, started: float, finished: float) -> "Counter[Tuple[int, Stack]]":
+        """
+        (thread id, stack) -> sample count for samples taken in [started, finished]
+        (time.perf_counter() values).
+        """
+        counts: "Counter[Tuple[int, Stack]]" = Counter()
+        for taken, thread_id, stack in list(self._samples):
+            if started <= taken <= finished:
+                counts[(thread_id, stack)] += 1
+        return counts
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        if self._always:
+            self._wake.set()
+        while not self._stop.is_set():
+            self._wake.wait()
+            if self._stop.wait(self._interval):
+                return
+            taken = time.perf_counter()
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = _stack(frame)
+                if stack:
+                    self._samples.append((taken, thread_id, stack))
+
+
+def _stack(frame) -> Stack:
+    code = frame.f_code
+    if (os.path.basename(code.co_filename), code.co_name) in _IDLE_LEAVES:
+        return ()
+    frames = []
+    while frame is not None and len(frames) < MAX_DEPTH:
+        frames.append((frame.f_code, frame.f_lineno))
+        frame = frame.f_back
+    frames.reverse()
+    return tuple(frames)
+
+
+def _frame_label(code, line: int) -> str:
+    parts = code.co_filename.replace("\\", "/").split("/")
+    return f"{code.co_name} ({'/'.join(parts[-2:])}:{line})"
+
+
+def folded(counts: "Counter[Tuple[int, Stack]]") -> str:
+    """
+    One `thread;outer;...;leaf count` line per distinct stack.
+    """
+    names: Dict[int, str] = {thread.ident: thread.name for thread in threading.enumerate()}
+    lines = []
+    for (thread_id, stack), count in counts.most_common():
+        frames = [names.get(thread_id, f"thread-{thread_id}")]
+        frames.extend(_frame_label(code, line).replace(";", ",") for code, line in stack)
+        lines.append(f"{';'.join(frames)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+_sequence = itertools.count()
+
+
+def write_profile(
+    counts: "Counter[Tuple[int, Stack]]", method: str, route: str, elapsed: float, directory: Optional[str] = None
+) -> Optional[str]:
+    """
+    Write `counts` as <time>-<ms>ms-<METHOD>-<route>-<n>.folded; returns the
+    path, or None when no samples were taken. Blocking: call off the loop.
+    """
+    if not counts:
+        return None
+    directory = directory or settings.PROFILE_DIR
+    os.makedirs(directory, exist_ok=True)
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+    name = f"{time.strftime('%Y%m%dT%H%M%S')}-{elapsed * 1000:.0f}ms-{method}-{slug}-{next(_sequence)}.folded"
+    path = os.path.join(directory, name)
+    try:
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(folded(counts))
+    except OSError:
+        logger.exception("Could not write profile %s.", path)
+        return None
+    return path
+
+
+# Process-wide sampler, started/stopped by the app lifespan when profiling is configured.
+stack_sampler = StackSampler()
@@ -0,0 +1,155 @@
+"""
+Per-request SQL statement counting, query budgets and N+1 detection.
+
+DbSessionMiddleware opens a StatementTracker for every request (context
+variable, shared by reference with threadpool workers and async-engine
+greenlets); the cursor hook in db/instrumentation.py counts each executed
+statement into it. At the end of the request the middleware flags any
+statement text run QUERY_REPEAT_THRESHOLD or more times with different
+parameters, the usual shape of a lazy-loaded relationship in a loop.
+
+Routes declare an upper bound with @query_budget(n). Over budget, the
+request fails with QueryBudgetExceeded when TESTING is set (so the suite
+catches the regression) and is logged otherwise.
+"""
+import functools
+import inspect
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Distinct parameter sets remembered per statement; enough to flag a repeat.
+_MAX_VARIANTS = 64
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    A route ran more statements than its @query_budget (TESTING only).
+    """
+
+
+class StatementTracker:
+    __slots__ = ("count", "_statements", "reported")
+
+    def __init__(self) -> None:
+        self.count = 0
+        # statement text -> [executions, distinct parameter reprs]
+        self._statements: Dict[str, List[Any]] = {}
+        self.reported = False
+
+    def add(self, statement: str, parameters: Any) -> None:
+        self.count += 1
+        entry = self._statements.get(statement)
+        if entry is None:
+            self._statements[statement] = [1, {repr(parameters)}]
+            return
+        entry[0] += 1
+        if len(entry[1]) < _MAX_VARIANTS:
+            entry[1].add(repr(parameters))
+
+    def repeats(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        (statement, executions) for statements run with at least
+        `threshold` different parameter sets, most frequent first.
+        """
+        threshold = threshold or settings.QUERY_REPEAT_THRESHOLD
+        found = [
+            (statement, executions)
+            for statement, (executions, variants) in self._statements.items()
+            if len(variants) >= threshold
+        ]
+        return sorted(found, key=lambda item: item[1], reverse=True)
+
+    def describe(self) -> str:
+        parts = [f"{self.count} statements"]
+        for statement, executions in self.repeats():
+            parts.append(f"repeated x{executions}: {_shorten(statement)}")
+        return "; ".join(parts)
+
+
+def _shorten(statement: str, limit: int = 200) -> str:
+    text = " ".join(statement.split())
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+_current: ContextVar[Optional[StatementTracker]] = ContextVar("statement_tracker", default=None)
+
+
+def current_tracker() -> Optional[StatementTracker]:
+    return _current.get()
+
+
+@contextmanager
+def track_statements() -> Iterator[StatementTracker]:
+    tracker = StatementTracker()
+    token = _current.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _current.reset(token)
+
+
+def record_statement(statement: str, parameters: Any) -> None:
+    tracker = _current.get()
+    if tracker is not None:
+        tracker.add(statement, parameters)
+
+
+def report_repeats(tracker: StatementTracker, route: str) -> None:
+    """
+    Log a suspected N+1 once per request.
+    """
+    if tracker.reported or not tracker.repeats():
+        return
+    tracker.reported = True
+    logger.warning("Possible N+1 in %s: %s", route, tracker.describe())
+
+
+def check_budget(limit: int, route: str) -> None:
+    tracker = _current.get()
+    if tracker is None or tracker.count <= limit:
+        return
+    message = f"{route} ran {tracker.describe()} (budget {limit})."
+    if settings.TESTING:
+        raise QueryBudgetExceeded(message)
+    tracker.reported = True
+    logger.warning("Query budget exceeded: %s", message)
+
+
+def query_budget(limit: int) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Route decorator (below @router.<method>): the most statements one call
+    of the endpoint may run, counted until it returns (a streamed body is
+    not included). Cache hits only lower the count, so budget the miss path.
+    """
+
+    def decorate(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+        if not settings.QUERY_TRACKING_ENABLED:
+            return endpoint
+        route = f"{endpoint.__module__}.{endpoint.__name__}"
+
+        if inspect.iscoroutinefunction(endpoint):
+            @functools.wraps(endpoint)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                response = await endpoint(*args, **kwargs)
+                check_budget(limit, route)
+                return response
+
+            async_wrapper.query_budget = limit
+            return async_wrapper
+
+        @functools.wraps(endpoint)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            response = endpoint(*args, **kwargs)
+            check_budget(limit, route)
+            return response
+
+        wrapper.query_budget = limit
+        return wrapper
+
+    return decorate
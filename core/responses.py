@@ -1,4 +1,42 @@
-from typing import Any, Optional
+from typing import Any, Iterable, Optional, Sequence
+
+import time
+
+import orjson
+from starlette.responses import Response
+
+from core.timing import RENDER, current_timings
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response rendered by orjson straight to bytes.
+
+    Controllers return this instead of a dict so FastAPI skips
+    jsonable_encoder and the stdlib encoder entirely. orjson handles
+    datetimes (RFC 3339, same as isoformat()), dataclasses and UUIDs natively.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        timings = current_timings()
+        if timings is None:
+            return orjson.dumps(content)
+        started = time.perf_counter()
+        body = orjson.dumps(content)
+        timings.add(RENDER, time.perf_counter() - started)
+        return body
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def ndjson_lines(items: Iterable[Any]) -> bytes:
+    """
+    One orjson-encoded line per item, for streamed exports.
+    """
+    return b"".join(orjson.dumps(item) + b"\n" for item in items)
 
 
 def success(data: Any, *, meta: Optional[dict] = None) -> dict:
@@ -9,6 +47,12 @@ def success(data: Any, *, meta: Optional[dict] = None) -> dict:
     }
 
 
+def success_response(
+    data: Any, *, meta: Optional[dict] = None, status_code: int = 200
+) -> FastJSONResponse:
+    return FastJSONResponse(success(data, meta=meta), status_code=status_code)
+
+
 def error(code: str, message: str, *, details: Optional[dict] = None) -> dict:
     payload: dict = {
         "success": False,
@@ -21,3 +65,21 @@ def error(code: str, message: str, *, details: Optional[dict] = None) -> dict:
         payload["error"]["details"] = details
     return payload
 
+
+def bulk_response(results: Sequence[Any]) -> FastJSONResponse:
+    """
+    Per-item envelope for bulk writes: each entry of `results` (a
+    dtos.bulk.BulkItemResult) becomes {"index", "success", "data" | "error"}.
+    """
+    items = []
+    for result in results:
+        if result.error is None:
+            items.append({"index": result.index, "success": True, "data": result.data})
+        else:
+            err = result.error
+            items.append({"index": result.index, **error(err.code, err.message, details=err.details)})
+    failed = sum(1 for result in results if result.error is not None)
+    return success_response(
+        {"results": items},
+        meta={"created": len(results) - failed, "failed": failed},
+    )
@@ -0,0 +1,87 @@
+"""
+Per-request time attribution for the Server-Timing header.
+
+ServerTimingMiddleware puts a RequestTimings in a context variable for the
+duration of a request; the hooks that already sit on the hot path (pool
+checkout, cursor execute, response rendering, admission queue) add their
+elapsed time to it with `record`. Outside a timed request `record` is a
+single ContextVar lookup.
+
+The object is shared by reference, so time spent in threadpool workers
+(sync routes) and in the async engine's greenlets lands on the same request.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+# Phases in header order; "app" (the remainder) and "total" are appended.
+DB_WAIT = "db-wait"
+SQL = "sql"
+RENDER = "render"
+QUEUE = "queue"
+
+DESCRIPTIONS = {
+    QUEUE: "admission queue",
+    DB_WAIT: "pool checkout",
+    SQL: "statements",
+    RENDER: "json encoding",
+    "app": "handlers and serialization",
+    "total": "until response start",
+}
+
+
+class RequestTimings:
+    __slots__ = ("phases", "counts")
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+        self.counts[phase] = self.counts.get(phase, 0) + 1
+
+    def header(self, total: float) -> str:
+        """
+        Server-Timing value; durations in milliseconds. "app" is whatever
+        the named phases do not account for.
+        """
+        parts = []
+        accounted = 0.0
+        for phase in (QUEUE, DB_WAIT, SQL, RENDER):
+            seconds = self.phases.get(phase)
+            if seconds is None:
+                continue
+            accounted += seconds
+            parts.append(_metric(phase, seconds, self.counts[phase]))
+        parts.append(_metric("app", max(total - accounted, 0.0)))
+        parts.append(_metric("total", total))
+        return ", ".join(parts)
+
+
+def _metric(name: str, seconds: float, count: int = 0) -> str:
+    desc = DESCRIPTIONS[name] + (f" x{count}" if count > 1 else "")
+    return f'{name};dur={seconds * 1000:.2f};desc="{desc}"'
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+@contextmanager
+def timed_request() -> Iterator[RequestTimings]:
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+def record(phase: str, seconds: float) -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.add(phase, seconds)
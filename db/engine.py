@@ -1,19 +1,57 @@
+from typing import Optional
+
 from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from config.settings import settings
+from db.instrumentation import instrument_engine, instrumented_pool_class
+
+# Pool and cursor hooks feed /metrics, the Server-Timing breakdown and the
+# per-request statement tracker.
+INSTRUMENTED = settings.METRICS_ENABLED or settings.SERVER_TIMING_ENABLED or settings.QUERY_TRACKING_ENABLED
 
-def create_db_engine() -> Engine:
+def create_db_engine(url: Optional[str] = None, name: str = "sync") -> Engine:
     """
-    Create and return a SQLAlchemy Engine for PostgreSQL.
+    Create and return a SQLAlchemy Engine for PostgreSQL (the primary
+    unless `url` points at a replica).
+    When INSTRUMENTED its pool and statements are instrumented (engine=`name`).
     """
     engine = create_engine(
-        settings.DATABASE_URL,
+        url or settings.DATABASE_URL,
         echo=False,            # set True temporarily to see SQL
-        pool_size=10,
-        max_overflow=20,
+        poolclass=instrumented_pool_class(QueuePool, name) if INSTRUMENTED else QueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
         pool_pre_ping=True,    # avoids stale connections
         future=True,           # SQLAlchemy 2.0 behavior
     )
+    if INSTRUMENTED:
+        instrument_engine(engine, name)
+
+    return engine
+
+
+def create_async_db_engine(url: Optional[str] = None, name: str = "async") -> AsyncEngine:
+    """
+    Create and return an AsyncEngine for PostgreSQL (psycopg 3 async driver).
+    Instrumented like the sync engine, as engine=`name`.
+    """
+    engine = create_async_engine(
+        url or settings.ASYNC_DATABASE_URL,
+        echo=False,
+        poolclass=(
+            instrumented_pool_class(AsyncAdaptedQueuePool, name)
+            if INSTRUMENTED else AsyncAdaptedQueuePool
+        ),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=True,
+    )
+    if INSTRUMENTED:
+        instrument_engine(engine.sync_engine, name)
 
     return engine
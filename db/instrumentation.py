@@ -0,0 +1,101 @@
+"""
+Pool and statement metrics for the engines built in db/engine.py.
+
+- Checkout wait: the pool class is subclassed per engine so `_do_get`
+  (where QueuePool blocks for a free connection) is timed.
+- Statement latency: before/after_cursor_execute events, labelled by verb.
+- Pool gauges (checked out, overflow, idle, size): read at scrape time.
+
+Checkout and statement times also go to the current request's
+Server-Timing breakdown (core/timing.py) when one is being collected, and
+statements to its StatementTracker (core/query_budget.py).
+"""
+import time
+from typing import Any, Dict, Iterable, Tuple, Type
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+from core.metrics import LabelValues, db_pool_checkout_wait, db_statement_duration, registry
+from core.query_budget import record_statement
+from core.timing import DB_WAIT, SQL, record
+
+_VERBS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"})
+
+# name -> engine, for the scrape-time pool gauges.
+_engines: Dict[str, Engine] = {}
+
+
+def instrumented_pool_class(base: Type[Pool], name: str) -> Type[Pool]:
+    """
+    `base` with checkout waits recorded under engine=`name`. A subclass
+    (rather than an attribute on the instance) so it survives pool.recreate().
+    """
+    wait = db_pool_checkout_wait.labels(name)
+
+    def _do_get(self: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return base._do_get(self)
+        finally:
+            elapsed = time.perf_counter() - started
+            wait.observe(elapsed)
+            record(DB_WAIT, elapsed)
+
+    return type(f"Instrumented{base.__name__}", (base,), {"_do_get": _do_get})
+
+
+def _verb(statement: str) -> str:
+    verb = statement.lstrip()[:6].upper()
+    return verb if verb in _VERBS else ("WITH" if verb.startswith("WITH") else "OTHER")
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """
+    Time every cursor execute on `engine` (a sync Engine; pass
+    AsyncEngine.sync_engine) and expose its pool in the gauges.
+    """
+    children = {verb: db_statement_duration.labels(name, verb) for verb in (*_VERBS, "OTHER")}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        elapsed = time.perf_counter() - context._metrics_started
+        children[_verb(statement)].observe(elapsed)
+        record(SQL, elapsed)
+        record_statement(statement, parameters)
+
+    _engines[name] = engine
+
+
+def _pool_stats() -> Iterable[Tuple[str, Pool]]:
+    return [(name, engine.pool) for name, engine in _engines.items()]
+
+
+def _collect(read: Any) -> Any:
+    def collect() -> Iterable[Tuple[LabelValues, float]]:
+        return [((name,), read(pool)) for name, pool in _pool_stats() if hasattr(pool, "checkedout")]
+
+    return collect
+
+
+registry.sampled(
+    "db_pool_checked_out", "Connections currently checked out.",
+    _collect(lambda pool: pool.checkedout()), ("engine",),
+)
+registry.sampled(
+    "db_pool_overflow", "Connections open beyond pool_size.",
+    _collect(lambda pool: max(pool.overflow(), 0)), ("engine",),
+)
+registry.sampled(
+    "db_pool_idle", "Connections idle in the pool.",
+    _collect(lambda pool: pool.checkedin()), ("engine",),
+)
+registry.sampled(
+    "db_pool_size", "Configured pool_size.",
+    _collect(lambda pool: pool.size()), ("engine",),
+)
@@ -0,0 +1,169 @@
+"""
+Read-replica routing.
+
+RoutingSession picks an engine per statement in `get_bind`:
+
+- a replica, round robin, for statements run inside a @replica_read
+  service call, while a `replica_stream` iterator is advanced, or by a
+  session created with `read_only=True`
+- the primary for everything else, and always for INSERT/UPDATE/DELETE,
+  flushes and SELECT ... FOR UPDATE
+
+Read-your-writes: DbSessionMiddleware opens a RoutingState per request.
+The first write pins the rest of the request to the primary and makes the
+middleware set the REPLICA_STICKY_COOKIE, which keeps the client on the
+primary for REPLICA_STICKY_SECONDS (longer than the expected replica lag).
+The shared cache is only filled from the primary (`reads_from_replica`),
+so a lagging replica cannot put a row older than the last write back in it.
+
+Without DB_REPLICA_URLS there are no replicas and every statement goes to
+the primary, as before.
+"""
+import functools
+import inspect
+import itertools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Iterator, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+T = TypeVar("T")
+
+class RoutingState:
+    """
+    Per-request routing flags: `pinned` sends every statement to the
+    primary; `wrote` records that the request changed data.
+    """
+
+    __slots__ = ("pinned", "wrote")
+
+    def __init__(self, pinned: bool = False) -> None:
+        self.pinned = pinned
+        self.wrote = False
+
+
+_state: ContextVar[Optional[RoutingState]] = ContextVar("routing_state", default=None)
+_replica_call: ContextVar[bool] = ContextVar("replica_call", default=False)
+
+
+@contextmanager
+def routing_scope(pinned: bool = False) -> Iterator[RoutingState]:
+    state = RoutingState(pinned)
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+def replica_read(method: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Service method decorator: the statements it runs may be served by a
+    replica. Only for methods that never write and can tolerate replica
+    lag for other clients' writes.
+    """
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            token = _replica_call.set(True)
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                _replica_call.reset(token)
+
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        token = _replica_call.set(True)
+        try:
+            return method(*args, **kwargs)
+        finally:
+            _replica_call.reset(token)
+
+    return wrapper
+
+
+def replica_stream(items: Iterator[T]) -> Iterator[T]:
+    """
+    @replica_read for a lazily consumed iterator (a streamed export): each
+    step runs as a replica read, wherever the consumer advances it.
+    """
+    while True:
+        token = _replica_call.set(True)
+        try:
+            item = next(items)
+        except StopIteration:
+            return
+        finally:
+            _replica_call.reset(token)
+        yield item
+
+
+async def replica_stream_async(items: AsyncIterator[T]) -> AsyncIterator[T]:
+    while True:
+        token = _replica_call.set(True)
+        try:
+            item = await items.__anext__()
+        except StopAsyncIteration:
+            return
+        finally:
+            _replica_call.reset(token)
+        yield item
+
+
+def _is_write(clause: Any) -> bool:
+    if clause is None:
+        return False
+    return bool(getattr(clause, "is_dml", False) or getattr(clause, "_for_update_arg", None) is not None)
+
+
+class RoutingSession(Session):
+    """
+    Session bound to the primary that sends eligible reads to `replicas`
+    (set on a subclass by `routing_session_class`).
+    """
+
+    replicas: Tuple[Engine, ...] = ()
+    _next_replica: Callable[[], Engine]
+
+    def __init__(self, *args: Any, read_only: bool = False, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.read_only = read_only
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kwargs: Any) -> Any:
+        primary = super().get_bind(mapper, clause=clause, **kwargs)
+        if not self.replicas:
+            return primary
+        state = _state.get()
+        if self._flushing or _is_write(clause):
+            if state is not None:
+                state.pinned = state.wrote = True
+            return primary
+        return self._next_replica() if self.reads_from_replica() else primary
+
+    def reads_from_replica(self) -> bool:
+        """
+        True if a plain read run now would go to a replica. Such rows may
+        lag the primary, so services don't put them in the shared cache.
+        """
+        if not self.replicas:
+            return False
+        state = _state.get()
+        if state is not None and state.pinned:
+            return False
+        return self.read_only or _replica_call.get()
+
+
+def routing_session_class(replicas: Sequence[Engine], name: str = "RoutingSession") -> type:
+    """
+    RoutingSession subclass for one set of replica engines (sync Engines;
+    pass AsyncEngine.sync_engine for the async side).
+    """
+    cycle = itertools.cycle(replicas) if replicas else None
+    attrs = {"replicas": tuple(replicas)}
+    if cycle is not None:
+        attrs["_next_replica"] = lambda self: next(cycle)
+    return type(name, (RoutingSession,), attrs)
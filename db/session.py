@@ -1,19 +1,115 @@
-from db.engine import create_db_engine
+from typing import Any, Callable, Optional
 
+from db.engine import create_async_db_engine, create_db_engine
+from db.routing import routing_session_class
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, Session
 
+from config.settings import settings
+
 _engine = create_db_engine()
+_replica_engines = [
+    create_db_engine(url, f"replica-{index}") for index, url in enumerate(settings.DB_REPLICA_URLS)
+]
 
 SessionLocal = sessionmaker(
     bind=_engine,
+    class_=routing_session_class(_replica_engines),
     autoflush=False,
     autocommit=False,
     expire_on_commit=False,
 )
 
-def get_session() -> Session:
+# Only built in async mode so the sync deployment does not open a second pool.
+_async_engine: Optional[AsyncEngine] = (
+    create_async_db_engine() if settings.DB_ASYNC else None
+)
+_async_replica_engines = [
+    create_async_db_engine(url, f"async-replica-{index}")
+    for index, url in enumerate(settings.ASYNC_DB_REPLICA_URLS if settings.DB_ASYNC else [])
+]
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=_async_engine,
+    sync_session_class=routing_session_class(
+        [engine.sync_engine for engine in _async_replica_engines], "AsyncRoutingSession"
+    ),
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+def get_session(read_only: bool = False) -> Session:
     """
     Creates a new database session.
     Caller is responsible for commit/rollback/close.
+    `read_only` sessions read from a replica when there is one.
+    """
+    return SessionLocal(read_only=read_only)
+
+
+def get_async_session(read_only: bool = False) -> AsyncSession:
+    """
+    Creates a new async database session (requires DB_ASYNC).
+    Caller is responsible for commit/rollback/close.
+    """
+    if _async_engine is None:
+        raise RuntimeError("Async database access requires DB_ASYNC=true.")
+    return AsyncSessionLocal(read_only=read_only)
+
+
+class LazySession:
     """
-    return SessionLocal()
+    Request-scoped stand-in for a Session.
+
+    The real Session is only created on first attribute access, so requests
+    that never touch the database (404s, validation errors, health checks)
+    never build one. `release()` closes it, which hands the connection back
+    to the pool; a later access transparently starts a fresh transaction.
+    """
+
+    __slots__ = ("_factory", "_session")
+
+    def __init__(self, factory: Callable[[], Session] = SessionLocal) -> None:
+        self._factory = factory
+        self._session: Optional[Session] = None
+
+    @property
+    def acquired(self) -> bool:
+        return self._session is not None
+
+    def __getattr__(self, name: str) -> Any:
+        session = self._session
+        if session is None:
+            session = self._session = self._factory()
+        return getattr(session, name)
+
+    def release(self) -> None:
+        if self._session is not None:
+            self._session.close()
+
+
+class LazyAsyncSession:
+    """
+    AsyncSession counterpart of LazySession.
+    """
+
+    __slots__ = ("_factory", "_session")
+
+    def __init__(self, factory: Callable[[], AsyncSession] = get_async_session) -> None:
+        self._factory = factory
+        self._session: Optional[AsyncSession] = None
+
+    @property
+    def acquired(self) -> bool:
+        return self._session is not None
+
+    def __getattr__(self, name: str) -> Any:
+        session = self._session
+        if session is None:
+            session = self._session = self._factory()
+        return getattr(session, name)
+
+    async def release(self) -> None:
+        if self._session is not None:
+            await self._session.close()
@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from core.errors import DomainError
+
+@dataclass(slots=True)
+class BulkItemResult:
+    """
+    Outcome of one item of a bulk write, by its position in the request:
+    the created record, or the domain error that rejected the item.
+    """
+    index: int
+    data: Optional[Any] = None
+    error: Optional[DomainError] = None
@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from models.comment import Comment
+
+@dataclass
+class CommentPage:
+    comments: List[Comment]
+    next_cursor: Optional[str] = None
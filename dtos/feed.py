@@ -0,0 +1,6 @@
+from dataclasses import dataclass
+
+@dataclass
+class FollowDTO:
+    follower_id: int
+    followee_id: int
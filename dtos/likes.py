@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass
+class LikeDTO:
+    user_id: int
+    post_id: int
+
+@dataclass
+class LikeResultDTO:
+    user_id: int
+    post_id: int
+    liked: bool
+    # None when the write was buffered and its outcome isn't known yet.
+    changed: Optional[bool]
@@ -1,5 +1,8 @@
 from dataclasses import dataclass
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional, Union
+
+from models.post import Post
 
 @dataclass
 class CreatePostDTO:
@@ -16,3 +19,35 @@ class UpdatePostDTO:
 @dataclass
 class DeletePostDTO:
     id: int
+
+@dataclass(slots=True)
+class PostRecord:
+    """
+    Read-only projection of a post for list endpoints. Field order matches
+    repositories.post.POST_RECORD_COLUMNS; orjson serializes it natively.
+    """
+    id: int
+    author_id: int
+    content: str
+    caption: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+    like_count: int
+    comment_count: int
+    version: int
+
+@dataclass
+class PostPage:
+    posts: List[Union[Post, PostRecord]]
+    next_cursor: Optional[str] = None
+
+@dataclass
+class PostBatch:
+    posts: List[PostRecord]
+    missing: List[int]
+
+@dataclass
+class PostExportFilter:
+    author_id: Optional[int] = None
+    since: Optional[datetime] = None  # inclusive
+    until: Optional[datetime] = None  # exclusive
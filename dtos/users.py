@@ -1,5 +1,6 @@
 from dataclasses import dataclass
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
 
 @dataclass
 class CreateUserDTO:
@@ -9,4 +10,35 @@ class CreateUserDTO:
 
 @dataclass
 class DeleteUserDTO:
-    id: int
\ No newline at end of file
+    id: int
+
+@dataclass(slots=True)
+class UserRecord:
+    """
+    Read-only projection of a user, safe to cache across sessions. Field
+    order matches repositories.user.USER_RECORD_COLUMNS.
+    """
+    id: int
+    email: str
+    name: str
+    age: Optional[int]
+    updated_at: datetime
+    version: int
+
+@dataclass
+class UserBatch:
+    users: List[UserRecord]
+    missing: List[int]
+
+@dataclass(slots=True)
+class UserDeletionRecord:
+    """
+    Progress of a user's background deletion. Field order matches
+    repositories.user_deletion.DELETION_RECORD_COLUMNS.
+    """
+    user_id: int
+    step: str
+    rows_deleted: int
+    requested_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime]
@@ -1,28 +1,90 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 
-from api.routers.users import router as users_router
-from api.routers.posts import router as posts_router
+from api.routers.comments import router as comments_router
+from api.routers.feed import router as feed_router
+from api.routers.likes import router as likes_router
+from api.routers.metrics import router as metrics_router
+from api.routers.users import async_router as async_users_router, router as users_router
+from api.routers.posts import async_router as async_posts_router, router as posts_router
+from config.settings import settings
 from core.errors import ConflictError, DomainError, NotFoundError, ValidationError
-from core.responses import error
+from core.profiling import stack_sampler
+from core.responses import FastJSONResponse, error
+from middlewares.admission import AdmissionControlMiddleware, overloaded_response
 from middlewares.db_session import DbSessionMiddleware
 from middlewares.jwt_auth import JwtAuthMiddleware
+from middlewares.metrics import MetricsMiddleware
+from middlewares.server_timing import ServerTimingMiddleware
+from services.counters import counter_aggregator
+from services.like import like_buffer
+from services.user_deletion import user_deletion_worker
+
+PROFILING = settings.PROFILE_SAMPLE_RATE > 0 or settings.PROFILE_SLOW_MS > 0
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    counter_aggregator.start()
+    if settings.LIKE_BUFFER_ENABLED:
+        like_buffer.start()
+    if settings.USER_DELETION_ENABLED:
+        user_deletion_worker.start()
+    if PROFILING:
+        stack_sampler.start()
+    try:
+        yield
+    finally:
+        if PROFILING:
+            stack_sampler.stop()
+        # Like flushes and the user purge feed the counter aggregator, so
+        # stop them first.
+        if settings.USER_DELETION_ENABLED:
+            user_deletion_worker.stop()
+        if settings.LIKE_BUFFER_ENABLED:
+            like_buffer.stop()
+        counter_aggregator.stop()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="Socialz")
+    app = FastAPI(
+        title="Socialz",
+        lifespan=lifespan,
+        default_response_class=FastJSONResponse,
+    )
 
-    # Middlewares (order matters: auth → db session)
+    # Middlewares (order matters: auth → db session; admission control is
+    # added after them so it runs first and sheds load before anything
+    # else; Server-Timing/profiling see the admission queue; metrics wrap
+    # everything, shed requests included)
     app.add_middleware(JwtAuthMiddleware)
     app.add_middleware(DbSessionMiddleware)
+    if settings.ADMISSION_ENABLED:
+        app.add_middleware(AdmissionControlMiddleware)
+    if settings.SERVER_TIMING_ENABLED or PROFILING:
+        app.add_middleware(ServerTimingMiddleware)
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
 
-    # Routers
-    app.include_router(users_router)
-    app.include_router(posts_router)
+    # Routers (DB_ASYNC swaps in coroutine routes backed by the AsyncEngine)
+    if settings.DB_ASYNC:
+        app.include_router(async_users_router)
+        app.include_router(async_posts_router)
+    else:
+        app.include_router(users_router)
+        app.include_router(posts_router)
+    app.include_router(comments_router)
+    app.include_router(feed_router)
+    app.include_router(likes_router)
+    if settings.METRICS_ENABLED:
+        app.include_router(metrics_router)
 
     # Global error handler mapping DomainError → consistent HTTP response
     @app.exception_handler(DomainError)
-    async def domain_error_handler(_: Request, exc: DomainError) -> JSONResponse:
+    async def domain_error_handler(_: Request, exc: DomainError) -> FastJSONResponse:
         status = 400
         if isinstance(exc, ValidationError):
             status = 422
@@ -31,11 +93,16 @@ def create_app() -> FastAPI:
         elif isinstance(exc, ConflictError):
             status = 409
 
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=status,
             content=error(exc.code, exc.message, details=exc.details),
         )
 
+    # Backstop for admission control: no pool connection within DB_POOL_TIMEOUT.
+    @app.exception_handler(PoolTimeoutError)
+    async def pool_timeout_handler(_: Request, exc: PoolTimeoutError) -> FastJSONResponse:
+        return overloaded_response(settings.DB_POOL_TIMEOUT)
+
     return app
 
 
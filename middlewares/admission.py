@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Iterable, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config.settings import settings
+from core.metrics import registry
+from core.responses import FastJSONResponse, error
+from core.timing import QUEUE, record
+
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+# Weight of the newest sample in the service-time moving average.
+EWMA_ALPHA = 0.1
+
+
+@dataclass
+class LaneStats:
+    limit: int
+    in_flight: int
+    queued: int
+    service_time: float
+    admitted: int
+    shed: int
+
+
+class AdmissionLane:
+    """
+    One class of traffic (reads or writes): at most `limit` requests in
+    flight, the rest wait in FIFO order.
+
+    The expected wait of a newcomer is its queue position times the EWMA
+    service time, divided by `limit` (slots free up at limit / service_time
+    per second). Requests whose estimate exceeds the budget are rejected
+    before queueing; those admitted to the queue still give up once the
+    budget is spent, so no request waits longer than the budget.
+
+    Event-loop only, so there is no lock.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.in_flight = 0
+        self.service_time = 0.0  # seconds, EWMA; 0 until the first sample
+        self.admitted = 0
+        self.shed = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    def estimated_wait(self) -> float:
+        if self.in_flight < self.limit:
+            return 0.0
+        return (len(self._waiters) + 1) * self.service_time / self.limit
+
+    async def acquire(self, budget: float) -> bool:
+        """
+        True once a slot is held; False if the request should be shed.
+        """
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+        if self.estimated_wait() > budget:
+            self.shed += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), budget)
+        except asyncio.TimeoutError:
+            if waiter.done():  # granted just as the budget ran out
+                self.admitted += 1
+                return True
+            waiter.cancel()
+            self.shed += 1
+            return False
+        except asyncio.CancelledError:
+            # Client went away; a slot granted meanwhile must not leak.
+            if waiter.done() and not waiter.cancelled():
+                self._hand_off()
+            waiter.cancel()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        self.admitted += 1
+        return True
+
+    def release(self, elapsed: float) -> None:
+        """
+        Record the slot holder's service time and pass the slot on.
+        """
+        if self.service_time:
+            self.service_time += EWMA_ALPHA * (elapsed - self.service_time)
+        else:
+            self.service_time = elapsed
+        self._hand_off()
+
+    def _hand_off(self) -> None:
+        """
+        Give the slot to the next live waiter (in_flight unchanged) or free it.
+        """
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> LaneStats:
+        return LaneStats(
+            self.limit, self.in_flight, len(self._waiters), self.service_time, self.admitted, self.shed
+        )
+
+
+def _matches(path: str, prefixes: Tuple[str, ...]) -> bool:
+    return any(path == prefix or path.startswith(prefix + "/") for prefix in prefixes)
+
+
+class AdmissionController:
+    """
+    Separate read and write lanes, so a burst of one cannot starve the other
+    of pool connections, plus a small lane for streamed responses: they keep
+    their connection for as long as the client takes to read the body, so a
+    few slow exports must not use up the read slots or skew their service
+    time.
+    """
+
+    def __init__(
+        self,
+        read_limit: Optional[int] = None,
+        write_limit: Optional[int] = None,
+        budget_ms: Optional[int] = None,
+        stream_limit: Optional[int] = None,
+        stream_paths: Optional[Iterable[str]] = None,
+    ) -> None:
+        self.reads = AdmissionLane(read_limit or settings.ADMISSION_READ_LIMIT)
+        self.writes = AdmissionLane(write_limit or settings.ADMISSION_WRITE_LIMIT)
+        self.streams = AdmissionLane(stream_limit or settings.ADMISSION_STREAM_LIMIT)
+        budget_ms = budget_ms if budget_ms is not None else settings.ADMISSION_WAIT_BUDGET_MS
+        self.budget = budget_ms / 1000
+        paths = settings.ADMISSION_STREAM_PATHS if stream_paths is None else stream_paths
+        self._stream_paths = tuple(path.rstrip("/") for path in paths)
+
+    def lane(self, method: str, path: str) -> AdmissionLane:
+        if _matches(path, self._stream_paths):
+            return self.streams
+        return self.reads if method in READ_METHODS else self.writes
+
+
+# Process-wide instance (shared by the middleware and anything reporting on it).
+admission_controller = AdmissionController()
+
+
+def _lane_stat(field: str):
+    def collect():
+        controller = admission_controller
+        return [
+            (("read",), getattr(controller.reads.stats(), field)),
+            (("write",), getattr(controller.writes.stats(), field)),
+            (("stream",), getattr(controller.streams.stats(), field)),
+        ]
+
+    return collect
+
+
+registry.sampled("admission_in_flight", "Requests holding an admission slot.", _lane_stat("in_flight"), ("lane",))
+registry.sampled("admission_queued", "Requests waiting for an admission slot.", _lane_stat("queued"), ("lane",))
+registry.sampled(
+    "admission_shed_total", "Requests answered 503 by admission control.", _lane_stat("shed"), ("lane",), "counter"
+)
+
+
+def overloaded_response(retry_after: float) -> FastJSONResponse:
+    seconds = max(1, math.ceil(retry_after))
+    return FastJSONResponse(
+        error("overloaded", "Server is busy, retry later.", details={"retry_after": seconds}),
+        status_code=503,
+        headers={"Retry-After": str(seconds)},
+    )
+
+
+class AdmissionControlMiddleware:
+    """
+    Load shedding in front of the DB layer (pure ASGI, outermost).
+
+    Each request holds a slot in its lane until its last body message is
+    sent, the point where DbSessionMiddleware hands its connections back
+    too. For a streamed body (the NDJSON export) that is after the final
+    chunk, so such paths have their own lane and every connection they hold
+    is counted. When the lane is full and the estimated wait exceeds the
+    budget, the request is answered 503 with Retry-After immediately
+    instead of piling up on the connection pool, which keeps tail latency
+    bounded under overload. Exempt paths bypass it.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        controller: Optional[AdmissionController] = None,
+        exempt_paths: Optional[Iterable[str]] = None,
+    ) -> None:
+        self.app = app
+        self.controller = controller or admission_controller
+        paths = settings.ADMISSION_EXEMPT_PATHS if exempt_paths is None else exempt_paths
+        self._exempt = tuple(path.rstrip("/") for path in paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or _matches(scope["path"], self._exempt):
+            await self.app(scope, receive, send)
+            return
+
+        lane = self.controller.lane(scope["method"], scope["path"])
+        queued = time.perf_counter()
+        if not await lane.acquire(self.controller.budget):
+            retry_after = max(lane.estimated_wait(), self.controller.budget)
+            await overloaded_response(retry_after)(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        record(QUEUE, started - queued)
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                lane.release(time.perf_counter() - started)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                release()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            release()
@@ -1,32 +1,120 @@
 from __future__ import annotations
 
-from typing import Callable
+import time
+from contextlib import ExitStack
+from typing import Optional
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from db.session import get_session
+from config.settings import settings
+from core.metrics import db_session_rollbacks, db_statements_per_request
+from core.query_budget import report_repeats, track_statements
+from db.routing import RoutingState, routing_scope
+from db.session import LazyAsyncSession, LazySession
 
 
-class DbSessionMiddleware(BaseHTTPMiddleware):
+def _primary_pinned(scope: Scope) -> bool:
     """
-    Creates exactly one DB session per request and attaches it as:
-      request.state.db
+    True while the client's sticky cookie (set after its last write) is valid.
+    """
+    for name, value in scope["headers"]:
+        if name == b"cookie":
+            until = cookie_parser(value.decode("latin-1")).get(settings.REPLICA_STICKY_COOKIE)
+            try:
+                return until is not None and float(until) > time.time()
+            except ValueError:
+                return False
+    return False
+
+
+def _sticky_cookie() -> str:
+    window = settings.REPLICA_STICKY_SECONDS
+    return (
+        f"{settings.REPLICA_STICKY_COOKIE}={time.time() + window:.3f}; "
+        f"Max-Age={max(1, round(window))}; Path=/; HttpOnly; SameSite=Lax"
+    )
+
+
+class DbSessionMiddleware:
+    """
+    Attaches one lazily-created DB session per request as:
+      request.state.db        (sync Session)
+      request.state.async_db  (AsyncSession, DB_ASYNC mode only)
 
     Transaction boundaries live in services (commit) and this middleware
     provides rollback-on-error + reliable close.
+
+    Pure ASGI on purpose: no BaseHTTPMiddleware task/stream wrapping. No
+    Session exists until a repository touches it, a commit already hands
+    the connection back to the pool, and the session is released once the
+    last body message is handed to the server: straight after the start
+    for ordinary responses, after the final chunk for a streamed one (the
+    NDJSON export reads its rows from this session while the body is sent,
+    so it stays owned, rolled back and closed here like any other).
+
+    With QUERY_TRACKING_ENABLED it also counts the request's statements
+    (db_statements_per_request) and logs suspected N+1 patterns; see
+    core/query_budget.py.
+
+    With DB_REPLICA_URLS it opens the request's replica routing scope
+    (db/routing.py): a valid REPLICA_STICKY_COOKIE pins the request to the
+    primary, and a request that writes gets the cookie (re)set.
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        db = get_session()
-        request.state.db = db
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with ExitStack() as stack:
+            tracker = stack.enter_context(track_statements()) if settings.QUERY_TRACKING_ENABLED else None
+            routing = (
+                stack.enter_context(routing_scope(_primary_pinned(scope)))
+                if settings.DB_REPLICA_URLS else None
+            )
+            try:
+                await self._handle(scope, receive, send, routing)
+            finally:
+                if tracker is not None:
+                    route = getattr(scope.get("route"), "path", None) or "<unmatched>"
+                    db_statements_per_request.labels(route).observe(tracker.count)
+                    report_repeats(tracker, f"{scope['method']} {route}")
+
+    async def _handle(
+        self, scope: Scope, receive: Receive, send: Send, routing: Optional[RoutingState]
+    ) -> None:
+        db = LazySession()
+        async_db = LazyAsyncSession() if settings.DB_ASYNC else None
+        state = scope.setdefault("state", {})
+        state["db"] = db
+        if async_db is not None:
+            state["async_db"] = async_db
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                if routing is not None and routing.wrote:
+                    MutableHeaders(scope=message).append("set-cookie", _sticky_cookie())
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                db.release()
+                if async_db is not None:
+                    await async_db.release()
+            await send(message)
+
         try:
-            response = await call_next(request)
-            return response
+            await self.app(scope, receive, send_wrapper)
         except Exception:
-            db.rollback()
+            if db.acquired:
+                db.rollback()
+                db_session_rollbacks.labels("sync").inc()
+            if async_db is not None and async_db.acquired:
+                await async_db.rollback()
+                db_session_rollbacks.labels("async").inc()
             raise
         finally:
-            db.close()
-
+            db.release()
+            if async_db is not None:
+                await async_db.release()
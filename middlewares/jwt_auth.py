@@ -1,27 +1,127 @@
 from __future__ import annotations
 
-from typing import Callable, Optional
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+import jwt
+from starlette.types import ASGIApp, Receive, Scope, Send
 
+from config.settings import settings
+from core.responses import FastJSONResponse, error
 
-class JwtAuthMiddleware(BaseHTTPMiddleware):
+
+class TokenVerifier:
     """
-    Minimal JWT middleware stub.
+    Verifies JWTs (signature, `exp`, integer `sub`) and remembers the
+    outcome of successful verifications.
+
+    The cache is an LRU of at most `cache_size` entries keyed by the token's
+    SHA-256 (raw tokens are never kept), holding (user_id, exp). A hit is only
+    honoured while exp is in the future; after that the token goes through
+    full verification again, which rejects it as expired. Failed
+    verifications are not cached. `cache_size=0` disables the cache.
 
-    README says: extract JWT, validate, attach request.user_id.
-    You can extend this later; for now it sets `request.state.user_id = None`
-    unless a real auth implementation is added.
+    Only used from the event loop, so there is no lock.
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # TODO: parse Authorization header and validate JWT
-        request.state.user_id = _extract_user_id_placeholder(request)
-        return await call_next(request)
+    def __init__(self, key: str, algorithm: str, cache_size: int) -> None:
+        self._key = key  # shared secret (HS*) or PEM public key (RS*/ES*)
+        self._algorithms = [algorithm]
+        self._cache_size = cache_size
+        self._cache: "OrderedDict[bytes, Tuple[int, float]]" = OrderedDict()
+
+    def decode(self, token: str) -> Tuple[int, float]:
+        """
+        Full verification, no cache. Raises jwt.InvalidTokenError.
+        """
+        claims = jwt.decode(
+            token, self._key, algorithms=self._algorithms, options={"require": ["exp", "sub"]}
+        )
+        try:
+            return int(claims["sub"]), float(claims["exp"])
+        except (TypeError, ValueError):
+            raise jwt.InvalidTokenError("Subject must be a user id.")
+
+    def verify(self, token: str) -> int:
+        """
+        User id of a valid token. Raises jwt.InvalidTokenError.
+        """
+        digest = hashlib.sha256(token.encode()).digest()
+        entry = self._cache.get(digest)
+        if entry is not None:
+            if entry[1] > time.time():
+                self._cache.move_to_end(digest)
+                return entry[0]
+            del self._cache[digest]
 
+        user_id, exp = self.decode(token)
+        if self._cache_size > 0:
+            self._cache[digest] = (user_id, exp)
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return user_id
 
-def _extract_user_id_placeholder(_: Request) -> Optional[int]:
+
+def _bearer_token(scope: Scope) -> Optional[str]:
+    """
+    Token from `Authorization: Bearer <token>`; "" for any other scheme,
+    None when there is no Authorization header.
+    """
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            return token.strip() if scheme.lower() == "bearer" else ""
     return None
 
+
+class JwtAuthMiddleware:
+    """
+    Authentication (pure ASGI): verifies the bearer token and attaches
+    `request.state.user_id`.
+
+    - no Authorization header: anonymous request, user_id = None
+    - invalid, badly signed or expired token: 401, the app is never called
+    - paths under JWT_PUBLIC_PATHS: not inspected at all, user_id = None
+
+    Authorization (what the user may do) stays in the services.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        verifier: Optional[TokenVerifier] = None,
+        public_paths: Optional[Iterable[str]] = None,
+    ) -> None:
+        self.app = app
+        self.verifier = verifier or TokenVerifier(
+            settings.JWT_SECRET, settings.JWT_ALGORITHM, settings.JWT_CACHE_SIZE
+        )
+        paths = settings.JWT_PUBLIC_PATHS if public_paths is None else public_paths
+        self._public = tuple(path.rstrip("/") for path in paths)
+
+    def _is_public(self, path: str) -> bool:
+        return any(path == prefix or path.startswith(prefix + "/") for prefix in self._public)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+        state["user_id"] = None
+        if not self._is_public(scope["path"]):
+            token = _bearer_token(scope)
+            if token is not None:
+                try:
+                    state["user_id"] = self.verifier.verify(token)
+                except jwt.InvalidTokenError:
+                    response = FastJSONResponse(
+                        error("unauthorized", "Invalid or expired token."),
+                        status_code=401,
+                        headers={"WWW-Authenticate": "Bearer"},
+                    )
+                    await response(scope, receive, send)
+                    return
+        await self.app(scope, receive, send)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.metrics import http_request_duration
+
+
+class MetricsMiddleware:
+    """
+    Records http_request_duration_seconds per route (pure ASGI, outermost,
+    so shed and rejected requests are counted too).
+
+    The route label is the matched route's path template, which the router
+    leaves in scope["route"]; unmatched requests share "<unmatched>" so raw
+    paths never become label values. Duration runs until the last body
+    chunk is sent, which includes streamed responses.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "<unmatched>"
+            http_request_duration.labels(path, scope["method"], str(status)).observe(
+                time.perf_counter() - started
+            )
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import random
+import time
+from collections import deque
+from typing import Deque, Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config.settings import settings
+from core.profiling import StackSampler, stack_sampler, write_profile
+from core.timing import timed_request
+
+
+class ServerTimingMiddleware:
+    """
+    Opt-in request instrumentation (pure ASGI, outside admission control).
+
+    - Server-Timing: the time until the response starts, split into
+      admission queue, pool checkout, SQL, JSON encoding and the rest
+      ("app": handlers, row hydration, dict building); see core/timing.py.
+    - Profiling: requests picked at PROFILE_SAMPLE_RATE, and any request
+      slower than PROFILE_SLOW_MS, get the stack samples taken during their
+      lifetime written to PROFILE_DIR (core/profiling.py), at most
+      PROFILE_MAX_PER_MINUTE of them. Collecting the window and writing
+      the file both run in the threadpool, off the event loop.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sampler: Optional[StackSampler] = None,
+        header: Optional[bool] = None,
+        sample_rate: Optional[float] = None,
+        slow_ms: Optional[int] = None,
+        max_per_minute: Optional[int] = None,
+    ) -> None:
+        self.app = app
+        self.sampler = sampler or stack_sampler
+        self.header = settings.SERVER_TIMING_ENABLED if header is None else header
+        self.sample_rate = settings.PROFILE_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.slow = (settings.PROFILE_SLOW_MS if slow_ms is None else slow_ms) / 1000
+        self.max_per_minute = settings.PROFILE_MAX_PER_MINUTE if max_per_minute is None else max_per_minute
+        # perf_counter() of the profiles written in the last minute (event loop only).
+        self._written: Deque[float] = deque()
+
+    def _may_write(self, now: float) -> bool:
+        if self.max_per_minute <= 0:
+            return True
+        while self._written and self._written[0] <= now - 60:
+            self._written.popleft()
+        if len(self._written) >= self.max_per_minute:
+            return False
+        self._written.append(now)
+        return True
+
+    def _write_profile(self, started: float, finished: float, method: str, route: str) -> None:
+        counts = self.sampler.window(started, finished)
+        write_profile(counts, method, route, finished - started)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        picked = self.sample_rate > 0 and random.random() < self.sample_rate
+        if picked:
+            self.sampler.activate()
+
+        started = time.perf_counter()
+        with timed_request() as timings:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start" and self.header:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", timings.header(time.perf_counter() - started))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                finished = time.perf_counter()
+                if picked:
+                    self.sampler.deactivate()
+
+        elapsed = finished - started
+        if (picked or (self.slow > 0 and elapsed >= self.slow)) and self._may_write(finished):
+            route = getattr(scope.get("route"), "path", None) or "<unmatched>"
+            await run_in_threadpool(self._write_profile, started, finished, scope["method"], route)
@@ -3,4 +3,6 @@ from .user import User
 from .post import Post
 from .comment import Comment
 from .follow import Follow
-from .like import Like
\ No newline at end of file
+from .like import Like
+from .timeline import TimelineEntry
+from .user_deletion import UserDeletion
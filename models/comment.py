@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Text, DateTime, ForeignKey, func
+from sqlalchemy import Text, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from models.base import Base
@@ -30,3 +30,8 @@ class Comment(Base):
     post = relationship("Post", back_populates="comments")
     
     author = relationship("User")
+
+    __table_args__ = (
+        Index("ix_comments_post_id_created_at_id", "post_id", "created_at", "id"),
+        Index("ix_comments_author_id", "author_id"),
+    )
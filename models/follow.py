@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, DateTime, func, UniqueConstraint
+from sqlalchemy import ForeignKey, DateTime, Index, func, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from models.base import Base
@@ -37,4 +37,5 @@ class Follow(Base):
 
     __table_args__ = (
         UniqueConstraint("follower_id", "followee_id"),
+        Index("ix_follows_followee_id_follower_id", "followee_id", "follower_id"),
     )
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, DateTime, func, UniqueConstraint
+from sqlalchemy import ForeignKey, DateTime, Index, func, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from models.base import Base
@@ -29,4 +29,5 @@ class Like(Base):
 
     __table_args__ = (
         UniqueConstraint("user_id", "post_id"),
+        Index("ix_likes_post_id", "post_id"),
     )
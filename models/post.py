@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import String, Text, DateTime, ForeignKey, func
+from sqlalchemy import String, Text, DateTime, ForeignKey, Index, Integer, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from models.base import Base
@@ -25,8 +25,36 @@ class Post(Base):
 
     deleted_at: Mapped[datetime | None]
 
+    # Denormalized; maintained by services.counters.CounterAggregator and,
+    # for purged users' likes/comments, by services.user_deletion.
+    like_count: Mapped[int] = mapped_column(Integer, server_default="0", nullable=False)
+    comment_count: Mapped[int] = mapped_column(Integer, server_default="0", nullable=False)
+
+    # Bumped by every UPDATE of the row, ORM flush or Core update() (counter
+    # flushes included), so it changes whenever the served payload can.
+    # Drives ETag / Last-Modified on GET /posts/{id}.
+    version: Mapped[int] = mapped_column(
+        Integer, server_default="1", onupdate=text("version + 1"), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
+
     author = relationship("User", back_populates="posts")
 
     likes = relationship("Like", back_populates="post")
     
     comments = relationship("Comment", back_populates="post")
+
+    __table_args__ = (
+        Index("ix_posts_author_id_created_at_id", "author_id", "created_at", "id"),
+        Index(
+            "ix_posts_live_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
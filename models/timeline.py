@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, DateTime, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models.base import Base
+
+class TimelineEntry(Base):
+    """
+    Materialized home timeline row: `post_id` was fanned out to `user_id`.
+
+    `author_id` and `created_at` are copied from the post so a feed page is a
+    single range scan on the primary key and unfollow can drop an author's
+    rows without touching `posts`.
+    """
+    __tablename__ = "timeline_entries"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        primary_key=True,
+    )
+    post_id: Mapped[int] = mapped_column(
+        ForeignKey("posts.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    author_id: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ix_timeline_entries_post_id", "post_id"),
+    )
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import String, Integer, DateTime, func
+from sqlalchemy import String, Integer, DateTime, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from models.base import Base
@@ -13,12 +13,35 @@ class User(Base):
     name: Mapped[str] = mapped_column(String(80), nullable=False)
     age: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
+    # Maintained by FeedService.follow/unfollow; decides fan-out strategy.
+    follower_count: Mapped[int] = mapped_column(
+        Integer, server_default="0", nullable=False
+    )
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), 
         server_default=func.now(), 
         nullable=False
     )
 
+    # Tombstone set by UserService.delete_user: the user is hidden at once and
+    # the row, with everything referencing it, is purged in batches by
+    # services.user_deletion.UserDeletionWorker.
+    deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+    # Bumped by every UPDATE of the row except follower_count-only ones (which
+    # write version/updated_at back unchanged, as the count isn't served);
+    # drives ETag / Last-Modified on GET /users/{id}.
+    version: Mapped[int] = mapped_column(
+        Integer, server_default="1", onupdate=text("version + 1"), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
+
     posts = relationship("Post", back_populates="author")
     
     followers = relationship(
@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models.base import Base
+
+class UserDeletion(Base):
+    """
+    Progress of the background purge of one tombstoned user
+    (services.user_deletion). No foreign key: the row outlives the user so
+    the outcome stays queryable.
+    """
+    __tablename__ = "user_deletions"
+
+    user_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+
+    # Purge step to run next (repositories.user_deletion.PURGE_STEPS), "done" at the end.
+    step: Mapped[str] = mapped_column(String(32), nullable=False)
+    rows_deleted: Mapped[int] = mapped_column(BigInteger, server_default="0", nullable=False)
+
+    requested_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+    # Claim held by one worker; a job whose lease ran out is picked up again.
+    lease_owner: Mapped[str | None] = mapped_column(String(32))
+    leased_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+    __table_args__ = (
+        Index(
+            "ix_user_deletions_pending_requested_at",
+            "requested_at",
+            postgresql_where=text("finished_at IS NULL"),
+        ),
+    )
@@ -0,0 +1,49 @@
+from typing import List, Optional
+
+from sqlalchemy import and_, select, tuple_
+from sqlalchemy.orm import Session, joinedload
+
+from core.metrics import instrument_methods
+from core.pagination import Keyset
+from models.comment import Comment
+from models.post import Post
+from models.user import User
+from repositories.post import LIVE_POST
+
+
+@instrument_methods
+class CommentRepository:
+    """
+    Repository responsible for persistence-related operations
+    for Comments.
+    """
+
+    def get_by_post_id(
+        self, db: Session, post_id: int, limit: int = 50, after: Optional[Keyset] = None
+    ) -> Optional[List[Comment]]:
+        """
+        One oldest-first page of a post's comments, keyset-paginated on
+        (post_id, created_at, id) (ix_comments_post_id_created_at_id).
+        Authors come back in the same query via a join, limited to the
+        columns of an author summary, so rendering never lazy-loads per row.
+
+        The page is LEFT JOINed onto the live post (see LIVE_POST), so the same statement
+        tells an empty page (one row, no comment) from a missing or deleted
+        post (no rows, returned as None).
+        """
+        on = [Comment.post_id == Post.id]
+        if after is not None:
+            on.append(tuple_(Comment.created_at, Comment.id) > tuple_(*after))
+        stmt = (
+            select(Post.id, Comment)
+            .select_from(Post)
+            .outerjoin(Comment, and_(*on))
+            .options(joinedload(Comment.author).load_only(User.id, User.name))
+            .where(Post.id == post_id, LIVE_POST)
+            .order_by(Comment.created_at, Comment.id)
+            .limit(limit)
+        )
+        rows = db.execute(stmt).all()
+        if not rows:
+            return None
+        return [comment for _, comment in rows if comment is not None]
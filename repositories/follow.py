@@ -0,0 +1,76 @@
+from typing import List, Optional
+
+from sqlalchemy import Integer, delete, exists, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from core.metrics import instrument_methods
+from models.follow import Follow
+from models.user import User
+
+
+@instrument_methods
+class FollowRepository:
+    """
+    Repository responsible for persistence-related operations
+    for the Follow graph.
+    """
+
+    def create(self, db: Session, follower_id: int, followee_id: int) -> Optional[bool]:
+        """
+        Insert the edge if it doesn't exist yet and both users are live, in
+        one statement (the INSERT runs as a CTE next to the user check).
+        Returns True when a row was inserted, False when the edge already
+        existed, None when either user is missing or deleted.
+        """
+        live_users = (
+            select(func.count())
+            .where(User.id.in_((follower_id, followee_id)), User.deleted_at.is_(None))
+            .scalar_subquery()
+        )
+        edge = select(
+            literal(follower_id, Integer).label("follower_id"),
+            literal(followee_id, Integer).label("followee_id"),
+        ).where(live_users == 2).cte("edge")
+        created = (
+            insert(Follow)
+            .from_select(["follower_id", "followee_id"], select(edge.c.follower_id, edge.c.followee_id))
+            .on_conflict_do_nothing()
+            .returning(Follow.follower_id)
+            .cte("created")
+        )
+        users_live, inserted = db.execute(select(exists(edge.select()), exists(created.select()))).one()
+        return inserted if users_live else None
+
+    def delete(self, db: Session, follower_id: int, followee_id: int) -> bool:
+        """
+        Remove the edge. Returns True when a row was actually deleted.
+        """
+        stmt = (
+            delete(Follow)
+            .where(Follow.follower_id == follower_id, Follow.followee_id == followee_id)
+            .returning(Follow.follower_id)
+        )
+        return db.scalar(stmt) is not None
+
+    def adjust_follower_count(self, db: Session, user_id: int, delta: int) -> int:
+        """
+        Atomically add `delta` to users.follower_count and return the new value.
+        version/updated_at are written back unchanged: the count isn't part of
+        the served user, so it mustn't invalidate its ETag.
+        """
+        stmt = (
+            update(User)
+            .where(User.id == user_id)
+            .values(
+                follower_count=User.follower_count + delta,
+                version=User.version,
+                updated_at=User.updated_at,
+            )
+            .returning(User.follower_count)
+        )
+        return db.scalar(stmt)
+
+    def get_followee_ids(self, db: Session, follower_id: int) -> List[int]:
+        stmt = select(Follow.followee_id).where(Follow.follower_id == follower_id)
+        return list(db.scalars(stmt).all())
@@ -0,0 +1,91 @@
+from typing import Iterable, List, Tuple
+
+from sqlalchemy import Integer, column, delete, exists, select, tuple_, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from core.metrics import instrument_methods
+from models.like import Like
+from models.post import Post
+from models.user import User
+from repositories.post import LIVE_POST
+
+
+@instrument_methods
+class LikeRepository:
+    """
+    Repository responsible for persistence-related operations
+    for Likes. Every write is a single idempotent statement; nothing
+    reads a row first to decide what to write.
+    """
+
+    def add(self, db: Session, user_id: int, post_id: int) -> Tuple[bool, bool, bool]:
+        """
+        INSERT ... SELECT ... ON CONFLICT DO NOTHING RETURNING, run as a CTE
+        so the same statement also reports what it found. Only live users
+        can like, and only live posts can be liked.
+        Returns (user is live, post is live, like was created).
+        """
+        user = select(User.id).where(User.id == user_id, User.deleted_at.is_(None)).cte("liker")
+        post = select(Post.id).where(Post.id == post_id, LIVE_POST).cte("post")
+        created = (
+            insert(Like)
+            .from_select(["user_id", "post_id"], select(user.c.id, post.c.id))
+            .on_conflict_do_nothing()
+            .returning(Like.post_id)
+            .cte("created")
+        )
+        stmt = select(exists(user.select()), exists(post.select()), exists(created.select()))
+        return tuple(db.execute(stmt).one())
+
+    def remove(self, db: Session, user_id: int, post_id: int) -> bool:
+        """
+        DELETE ... RETURNING. Returns True when a like was removed.
+        """
+        stmt = (
+            delete(Like)
+            .where(Like.user_id == user_id, Like.post_id == post_id)
+            .returning(Like.post_id)
+        )
+        return db.scalar(stmt) is not None
+
+    def add_many(self, db: Session, pairs: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """
+        Multi-row add in one statement. Pairs pointing at missing/deleted
+        users or posts are skipped rather than failing the batch.
+        Returns the (user_id, post_id) pairs actually inserted.
+        """
+        pairs = list(pairs)
+        if not pairs:
+            return []
+        incoming = values(
+            column("user_id", Integer), column("post_id", Integer), name="incoming"
+        ).data(pairs)
+        rows = (
+            select(incoming.c.user_id, incoming.c.post_id)
+            .join(User, User.id == incoming.c.user_id)
+            .join(Post, Post.id == incoming.c.post_id)
+            .where(User.deleted_at.is_(None), LIVE_POST)
+        )
+        stmt = (
+            insert(Like)
+            .from_select(["user_id", "post_id"], rows)
+            .on_conflict_do_nothing()
+            .returning(Like.user_id, Like.post_id)
+        )
+        return [tuple(row) for row in db.execute(stmt)]
+
+    def remove_many(self, db: Session, pairs: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """
+        Multi-row remove in one statement.
+        Returns the (user_id, post_id) pairs actually deleted.
+        """
+        pairs = list(pairs)
+        if not pairs:
+            return []
+        stmt = (
+            delete(Like)
+            .where(tuple_(Like.user_id, Like.post_id).in_(pairs))
+            .returning(Like.user_id, Like.post_id)
+        )
+        return [tuple(row) for row in db.execute(stmt)]
@@ -0,0 +1,124 @@
+"""
+Request-scoped batch loaders (DataLoader pattern) for records by id.
+
+Loaders live in the session's `info` dict, and the session is per request
+(DbSessionMiddleware), so memoized rows never outlive the request.
+
+- RecordLoader (sync): load_many() fetches every id it hasn't seen in one
+  query; load() is load_many() of a single id. Nothing is deferred: a
+  synchronous caller needs the row back before it can ask for the next.
+- AsyncRecordLoader: load() calls issued in the same event-loop tick (e.g.
+  under asyncio.gather) are merged into one query.
+
+Both take prime() with records the request already has (a page it just
+read, the RETURNING row of a write), so loading them again costs nothing,
+and clear() to forget an id after a write that changed or removed it.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+FetchMany = Callable[[Session, List[int]], List[Any]]
+AsyncFetchMany = Callable[[AsyncSession, List[int]], Awaitable[List[Any]]]
+
+
+class RecordLoader:
+    def __init__(self, db: Session, fetch_many: FetchMany) -> None:
+        self._db = db
+        self._fetch_many = fetch_many
+        self._memo: Dict[int, Optional[Any]] = {}
+
+    def prime(self, records: Iterable[Any]) -> None:
+        """
+        Memoize records the request already read.
+        """
+        self._memo.update((record.id, record) for record in records)
+
+    def clear(self, id: int) -> None:
+        """
+        Forget `id` (it was just written); the next load reads it again.
+        """
+        self._memo.pop(id, None)
+
+    def load(self, id: int) -> Optional[Any]:
+        return self.load_many([id]).get(id)
+
+    def load_many(self, ids: Iterable[int]) -> Dict[int, Any]:
+        """
+        Found records by id (missing ids are absent), in one query at most.
+        """
+        ids = list(ids)
+        unknown = sorted({id for id in ids if id not in self._memo})
+        if unknown:
+            records = self._fetch_many(self._db, unknown)
+            self._memo.update(dict.fromkeys(unknown))
+            self._memo.update((record.id, record) for record in records)
+        return {id: self._memo[id] for id in ids if self._memo[id] is not None}
+
+
+class AsyncRecordLoader:
+    def __init__(self, db: AsyncSession, fetch_many: AsyncFetchMany) -> None:
+        self._db = db
+        self._fetch_many = fetch_many
+        self._memo: Dict[int, "asyncio.Future[Optional[Any]]"] = {}
+        self._pending: List[int] = []
+
+    def load(self, id: int) -> "asyncio.Future[Optional[Any]]":
+        future = self._memo.get(id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._memo[id] = loop.create_future()
+            if not self._pending:
+                # Runs after every coroutine already scheduled in this tick
+                # has had the chance to add its id.
+                loop.call_soon(lambda: loop.create_task(self._dispatch()))
+            self._pending.append(id)
+        return future
+
+    def prime(self, records: Iterable[Any]) -> None:
+        """
+        Memoize records the request already read (ids with a query in
+        flight keep waiting for it).
+        """
+        loop = asyncio.get_running_loop()
+        for record in records:
+            future = self._memo.get(record.id)
+            if future is None or future.done():
+                future = self._memo[record.id] = loop.create_future()
+                future.set_result(record)
+
+    def clear(self, id: int) -> None:
+        """
+        Forget `id` (it was just written); the next load reads it again.
+        """
+        future = self._memo.get(id)
+        if future is not None and future.done():
+            del self._memo[id]
+
+    async def load_many(self, ids: Iterable[int]) -> Dict[int, Any]:
+        ids = list(ids)
+        records = await asyncio.gather(*(self.load(id) for id in ids))
+        return {id: record for id, record in zip(ids, records) if record is not None}
+
+    async def _dispatch(self) -> None:
+        ids, self._pending = sorted(set(self._pending)), []
+        try:
+            records = {record.id: record for record in await self._fetch_many(self._db, ids)}
+        except Exception as exc:
+            for id in ids:
+                self._memo.pop(id).set_exception(exc)
+            return
+        for id in ids:
+            self._memo[id].set_result(records.get(id))
+
+
+def get_loader(db: Any, name: str, factory: Callable[[], Any]) -> Any:
+    """
+    The loader registered under `name` for this session, created on first use.
+    """
+    loader = db.info.get(("loader", name))
+    if loader is None:
+        loader = db.info[("loader", name)] = factory()
+    return loader
@@ -1,50 +1,381 @@
-from typing import Optional, List
+from datetime import datetime
+from itertools import starmap
+from typing import Any, AsyncIterator, Iterator, Mapping, Optional, List, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import Select, and_, bindparam, exists, func, insert, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from core.metrics import instrument_methods
+from core.pagination import Keyset
+from dtos.posts import PostExportFilter, PostRecord
+from repositories.loader import AsyncRecordLoader, RecordLoader, get_loader
+from models.comment import Comment
+from models.like import Like
 from models.post import Post
+from models.user import User
 
 
+posts_table = Post.__table__
+users_table = User.__table__
+
+# Plain table columns (not ORM attributes), so record queries compile and
+# fetch as Core statements: no identity map, no instance state. Order
+# matches PostRecord's fields.
+POST_RECORD_COLUMNS = (
+    posts_table.c.id,
+    posts_table.c.author_id,
+    posts_table.c.content,
+    posts_table.c.caption,
+    posts_table.c.created_at,
+    posts_table.c.updated_at,
+    posts_table.c.like_count,
+    posts_table.c.comment_count,
+    posts_table.c.version,
+)
+
+
+# A post is visible while neither it nor its author is deleted: the posts of
+# a tombstoned user (UserService.delete_user) disappear with the user,
+# before the purge's hide_posts step gets to them. The author check is one
+# users primary-key probe per post. The alias keeps the EXISTS correlated to
+# posts only, also in statements that join users themselves.
+_author = users_table.alias("live_author")
+LIVE_POST = and_(
+    posts_table.c.deleted_at.is_(None),
+    exists().where(_author.c.id == posts_table.c.author_id, _author.c.deleted_at.is_(None)),
+)
+
+
+def _keyset_page(
+    stmt: Select, limit: int, after: Optional[Keyset], columns: Any = Post
+) -> Select:
+    """
+    Newest-first page of `stmt` starting strictly after the `after` position.
+    (created_at, id) gives a stable total order even for equal timestamps.
+    `columns` is the Post entity or, for Core record queries, posts_table.c.
+    """
+    if after is not None:
+        stmt = stmt.where(tuple_(columns.created_at, columns.id) < tuple_(*after))
+    return stmt.order_by(columns.created_at.desc(), columns.id.desc()).limit(limit)
+
+
+def _records_by_author_stmt(author_id: int, limit: int, after: Optional[Keyset]) -> Select:
+    stmt = select(*POST_RECORD_COLUMNS).where(
+        posts_table.c.author_id == author_id, LIVE_POST
+    )
+    return _keyset_page(stmt, limit, after, posts_table.c)
+
+
+def _record_by_id_stmt(post_id: int) -> Select:
+    return select(*POST_RECORD_COLUMNS).where(
+        posts_table.c.id == post_id, LIVE_POST
+    )
+
+
+def _records_by_ids_stmt(post_ids: List[int]) -> Select:
+    return select(*POST_RECORD_COLUMNS).where(
+        posts_table.c.id.in_(post_ids), LIVE_POST
+    )
+
+
+# INSERT ... SELECT from the author's row, executed with an (author_id,
+# content, caption) dict: no row is inserted or returned unless the author
+# exists and isn't deleted.
+_create_stmt = (
+    insert(posts_table)
+    .from_select(
+        ["author_id", "content", "caption"],
+        select(
+            users_table.c.id,
+            bindparam("content", type_=posts_table.c.content.type),
+            bindparam("caption", type_=posts_table.c.caption.type),
+        ).where(users_table.c.id == bindparam("author_id"), users_table.c.deleted_at.is_(None)),
+    )
+    .returning(*POST_RECORD_COLUMNS)
+)
+
+# One multi-row INSERT ... RETURNING per batch (insertmanyvalues); rows come
+# back in parameter order so results line up with the input.
+_create_many_stmt = insert(posts_table).returning(
+    *POST_RECORD_COLUMNS, sort_by_parameter_order=True
+)
+
+
+def _update_stmt(post_id: int, values: Mapping[str, Any]):
+    """
+    UPDATE of a live post returning its new state; version and updated_at
+    are bumped by the columns' onupdate.
+    """
+    return (
+        update(posts_table)
+        .where(posts_table.c.id == post_id, LIVE_POST)
+        .values(**values)
+        .returning(*POST_RECORD_COLUMNS)
+    )
+
+
+def _delete_stmt(post_id: int):
+    return (
+        update(posts_table)
+        .where(posts_table.c.id == post_id, LIVE_POST)
+        .values(deleted_at=func.now())
+        .returning(posts_table.c.id)
+    )
+
+
+def _version_stmt(post_id: int) -> Select:
+    return select(posts_table.c.version, posts_table.c.updated_at).where(
+        posts_table.c.id == post_id, LIVE_POST
+    )
+
+
+def _all_records_stmt(limit: int, after: Optional[Keyset]) -> Select:
+    stmt = select(*POST_RECORD_COLUMNS).where(LIVE_POST)
+    return _keyset_page(stmt, limit, after, posts_table.c)
+
+
+def _export_stmt(filters: PostExportFilter) -> Select:
+    """
+    Live posts matching `filters`, oldest first. (created_at, id) order is
+    served by ix_posts_live_created_at_id, or by the author index when
+    author_id is set, so the cursor starts returning rows without a sort.
+    """
+    stmt = select(*POST_RECORD_COLUMNS).where(LIVE_POST)
+    if filters.author_id is not None:
+        stmt = stmt.where(posts_table.c.author_id == filters.author_id)
+    if filters.since is not None:
+        stmt = stmt.where(posts_table.c.created_at >= filters.since)
+    if filters.until is not None:
+        stmt = stmt.where(posts_table.c.created_at < filters.until)
+    return stmt.order_by(posts_table.c.created_at, posts_table.c.id)
+
+
+@instrument_methods
 class PostRepository:
     """
     Repository responsible for persistence-related operations
     for the Post aggregate.
     """
 
-    def create(self, db: Session, post: Post) -> Post:
+    def create(self, db: Session, row: Mapping[str, Any]) -> Optional[PostRecord]:
+        """
+        Insert one post (author_id, content, caption) with INSERT ... RETURNING.
+        None if the author doesn't exist or is deleted.
+        Caller is responsible for handling transaction boundaries.
+        """
+        row = db.execute(_create_stmt, row).first()
+        return PostRecord(*row) if row is not None else None
+
+    def create_many(self, db: Session, rows: List[dict]) -> List[PostRecord]:
         """
-        Persist a new Post instance.
+        Insert posts given as column dicts (author_id, content, caption).
         Caller is responsible for handling transaction boundaries.
         """
-        db.add(post)
-        db.flush()  # Assigns primary key without committing
-        return post
+        return list(starmap(PostRecord, db.execute(_create_many_stmt, rows)))
 
     def get_by_id(self, db: Session, post_id: int) -> Optional[Post]:
-        stmt = select(Post).where(Post.id == post_id, Post.deleted_at.is_(None))
+        stmt = select(Post).where(Post.id == post_id, LIVE_POST)
         return db.scalar(stmt)
 
-    def get_by_author_id(self, db: Session, author_id: int) -> List[Post]:
-        stmt = select(Post).where(Post.author_id == author_id, Post.deleted_at.is_(None))
+    def get_record_by_id(self, db: Session, post_id: int) -> Optional[PostRecord]:
+        row = db.execute(_record_by_id_stmt(post_id)).first()
+        return PostRecord(*row) if row is not None else None
+
+    def get_records_by_ids(self, db: Session, post_ids: List[int]) -> List[PostRecord]:
+        """
+        Live posts among `post_ids` in one `id IN (...)` query, in no particular order.
+        """
+        return list(starmap(PostRecord, db.execute(_records_by_ids_stmt(post_ids))))
+
+    def loader(self, db: Session) -> RecordLoader:
+        """
+        Request-scoped batcher over get_records_by_ids (see repositories.loader).
+        """
+        return get_loader(db, "posts", lambda: RecordLoader(db, self.get_records_by_ids))
+
+    def get_version(self, db: Session, post_id: int) -> Optional[Tuple[int, datetime]]:
+        """
+        (version, updated_at) of a live post, for conditional GETs.
+        """
+        row = db.execute(_version_stmt(post_id)).first()
+        return tuple(row) if row is not None else None
+
+    def get_by_author_id(
+        self, db: Session, author_id: int, limit: int = 50, after: Optional[Keyset] = None
+    ) -> List[Post]:
+        stmt = select(Post).where(Post.author_id == author_id, LIVE_POST)
+        stmt = _keyset_page(stmt, limit, after)
         return list(db.scalars(stmt).all())
 
-    def get_all(self, db: Session, limit: int = 100, offset: int = 0) -> List[Post]:
-        stmt = select(Post).where(Post.deleted_at.is_(None)).limit(limit).offset(offset)
+    def get_all(
+        self, db: Session, limit: int = 100, after: Optional[Keyset] = None
+    ) -> List[Post]:
+        stmt = _keyset_page(select(Post).where(LIVE_POST), limit, after)
         return list(db.scalars(stmt).all())
 
-    def update(self, db: Session, post: Post) -> Post:
+    def get_records_by_author_id(
+        self, db: Session, author_id: int, limit: int = 50, after: Optional[Keyset] = None
+    ) -> List[PostRecord]:
         """
-        Update a Post instance.
-        Caller is responsible for handling transaction boundaries.
+        Read-only variant of get_by_author_id for list endpoints: selects
+        only the PostRecord columns and never touches the identity map.
+        """
+        stmt = _records_by_author_stmt(author_id, limit, after)
+        return list(starmap(PostRecord, db.execute(stmt)))
+
+    def get_all_records(
+        self, db: Session, limit: int = 100, after: Optional[Keyset] = None
+    ) -> List[PostRecord]:
+        """
+        Read-only variant of get_all for list endpoints.
+        """
+        return list(starmap(PostRecord, db.execute(_all_records_stmt(limit, after))))
+
+    def stream_records(
+        self, db: Session, filters: PostExportFilter, chunk_size: int = 1000
+    ) -> Iterator[List[PostRecord]]:
+        """
+        Every matching post in chunks of at most `chunk_size`, read through a
+        server-side cursor (yield_per implies stream_results): memory is
+        bounded by one chunk whatever the result size. One statement, so the
+        whole export sees a single snapshot.
+        """
+        result = db.execute(_export_stmt(filters).execution_options(yield_per=chunk_size))
+        for rows in result.partitions():
+            yield list(starmap(PostRecord, rows))
+
+    def update(self, db: Session, post_id: int, values: Mapping[str, Any]) -> Optional[PostRecord]:
+        """
+        Set `values` on a live post in one UPDATE ... RETURNING.
+        None if there is no such post. Caller handles transaction boundaries.
+        """
+        row = db.execute(_update_stmt(post_id, values)).first()
+        return PostRecord(*row) if row is not None else None
+
+    def delete(self, db: Session, post_id: int) -> bool:
+        """
+        Soft delete a live post by setting deleted_at; False if there was none.
+        """
+        return db.execute(_delete_stmt(post_id)).first() is not None
+
+    def apply_counter_deltas(self, db: Session, deltas: Mapping[int, Tuple[int, int]]) -> None:
         """
-        db.flush()
-        return post
+        Add (likes, comments) deltas to each post's counters: one UPDATE per
+        post, sent as a single executemany. Ordered by id so concurrent
+        flushers lock rows in the same order.
+        """
+        if not deltas:
+            return
+        posts = Post.__table__
+        stmt = (
+            update(posts)
+            .where(posts.c.id == bindparam("post_id"))
+            .values(
+                like_count=posts.c.like_count + bindparam("likes"),
+                comment_count=posts.c.comment_count + bindparam("comments"),
+            )
+        )
+        db.execute(
+            stmt,
+            [
+                {"post_id": post_id, "likes": likes, "comments": comments}
+                for post_id, (likes, comments) in sorted(deltas.items())
+            ],
+        )
+
+    def get_max_id(self, db: Session) -> int:
+        return db.scalar(select(func.coalesce(func.max(Post.id), 0)))
 
-    def delete(self, db: Session, post: Post) -> None:
+    def reconcile_counters(self, db: Session, start_id: int, end_id: int) -> int:
         """
-        Soft delete a Post by setting deleted_at.
+        Recompute like/comment counters from the source tables for posts with
+        start_id <= id < end_id. Only rows that drifted are written.
+        Returns the number of posts corrected.
         """
-        from datetime import datetime
-        post.deleted_at = datetime.now()
-        db.flush()
+        likes = select(func.count()).where(Like.post_id == Post.id).scalar_subquery()
+        comments = select(func.count()).where(Comment.post_id == Post.id).scalar_subquery()
+        stmt = (
+            update(Post)
+            .where(
+                Post.id >= start_id,
+                Post.id < end_id,
+                or_(Post.like_count != likes, Post.comment_count != comments),
+            )
+            .values(like_count=likes, comment_count=comments)
+            .execution_options(synchronize_session=False)
+        )
+        return db.execute(stmt).rowcount
+
+
+@instrument_methods
+class AsyncPostRepository:
+    """
+    AsyncSession counterpart of PostRepository.
+    Same queries, awaited on the async engine.
+    """
+
+    async def create(self, db: AsyncSession, row: Mapping[str, Any]) -> Optional[PostRecord]:
+        row = (await db.execute(_create_stmt, row)).first()
+        return PostRecord(*row) if row is not None else None
+
+    async def create_many(self, db: AsyncSession, rows: List[dict]) -> List[PostRecord]:
+        return list(starmap(PostRecord, await db.execute(_create_many_stmt, rows)))
+
+    async def get_by_id(self, db: AsyncSession, post_id: int) -> Optional[Post]:
+        stmt = select(Post).where(Post.id == post_id, LIVE_POST)
+        return await db.scalar(stmt)
+
+    async def get_record_by_id(self, db: AsyncSession, post_id: int) -> Optional[PostRecord]:
+        row = (await db.execute(_record_by_id_stmt(post_id))).first()
+        return PostRecord(*row) if row is not None else None
+
+    async def get_records_by_ids(self, db: AsyncSession, post_ids: List[int]) -> List[PostRecord]:
+        return list(starmap(PostRecord, await db.execute(_records_by_ids_stmt(post_ids))))
+
+    def loader(self, db: AsyncSession) -> AsyncRecordLoader:
+        return get_loader(db, "posts", lambda: AsyncRecordLoader(db, self.get_records_by_ids))
+
+    async def get_version(self, db: AsyncSession, post_id: int) -> Optional[Tuple[int, datetime]]:
+        row = (await db.execute(_version_stmt(post_id))).first()
+        return tuple(row) if row is not None else None
+
+    async def get_by_author_id(
+        self, db: AsyncSession, author_id: int, limit: int = 50, after: Optional[Keyset] = None
+    ) -> List[Post]:
+        stmt = select(Post).where(Post.author_id == author_id, LIVE_POST)
+        stmt = _keyset_page(stmt, limit, after)
+        return list((await db.scalars(stmt)).all())
+
+    async def get_all(
+        self, db: AsyncSession, limit: int = 100, after: Optional[Keyset] = None
+    ) -> List[Post]:
+        stmt = _keyset_page(select(Post).where(LIVE_POST), limit, after)
+        return list((await db.scalars(stmt)).all())
+
+    async def get_records_by_author_id(
+        self, db: AsyncSession, author_id: int, limit: int = 50, after: Optional[Keyset] = None
+    ) -> List[PostRecord]:
+        stmt = _records_by_author_stmt(author_id, limit, after)
+        return list(starmap(PostRecord, await db.execute(stmt)))
+
+    async def get_all_records(
+        self, db: AsyncSession, limit: int = 100, after: Optional[Keyset] = None
+    ) -> List[PostRecord]:
+        return list(starmap(PostRecord, await db.execute(_all_records_stmt(limit, after))))
+
+    async def stream_records(
+        self, db: AsyncSession, filters: PostExportFilter, chunk_size: int = 1000
+    ) -> AsyncIterator[List[PostRecord]]:
+        result = await db.stream(_export_stmt(filters).execution_options(yield_per=chunk_size))
+        async for rows in result.partitions():
+            yield list(starmap(PostRecord, rows))
+
+    async def update(
+        self, db: AsyncSession, post_id: int, values: Mapping[str, Any]
+    ) -> Optional[PostRecord]:
+        row = (await db.execute(_update_stmt(post_id, values))).first()
+        return PostRecord(*row) if row is not None else None
+
+    async def delete(self, db: AsyncSession, post_id: int) -> bool:
+        return (await db.execute(_delete_stmt(post_id))).first() is not None
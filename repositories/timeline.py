@@ -0,0 +1,139 @@
+from itertools import starmap
+from typing import List, Optional
+
+from sqlalchemy import delete, literal, select, true, tuple_, union
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from core.metrics import instrument_methods
+from core.pagination import Keyset
+from dtos.posts import PostRecord
+from models.follow import Follow
+from models.post import Post
+from models.timeline import TimelineEntry
+from models.user import User
+from repositories.post import LIVE_POST, POST_RECORD_COLUMNS, posts_table
+
+
+@instrument_methods
+class TimelineRepository:
+    """
+    Repository for the materialized home timeline (fan-out-on-write) and the
+    hybrid feed read that merges in high-follower authors (fan-out-on-read).
+    """
+
+    def fan_out(self, db: Session, post_id: int, threshold: int) -> int:
+        """
+        Copy a post into every follower's timeline in one INSERT ... SELECT,
+        unless its author has `threshold` or more followers.
+        Returns the number of timeline rows written.
+        """
+        return self.fan_out_many(db, [post_id], threshold)
+
+    def fan_out_many(self, db: Session, post_ids: List[int], threshold: int) -> int:
+        """
+        fan_out for several posts in the same single INSERT ... SELECT.
+        """
+        rows = (
+            select(Follow.follower_id, Post.id, Post.author_id, Post.created_at)
+            .join(Post, Post.author_id == Follow.followee_id)
+            .join(User, User.id == Post.author_id)
+            .where(Post.id.in_(post_ids), User.follower_count < threshold)
+        )
+        stmt = insert(TimelineEntry).from_select(
+            ["user_id", "post_id", "author_id", "created_at"], rows
+        ).on_conflict_do_nothing()
+        return db.execute(stmt).rowcount
+
+    def backfill(self, db: Session, user_id: int, author_id: int, limit: int, threshold: int) -> None:
+        """
+        Copy an author's most recent posts into `user_id`'s timeline (after a
+        follow), unless the author is served by fan-out-on-read.
+        """
+        recent = (
+            select(literal(user_id), Post.id, Post.author_id, Post.created_at)
+            .join(User, User.id == Post.author_id)
+            .where(
+                Post.author_id == author_id,
+                Post.deleted_at.is_(None),
+                User.follower_count < threshold,
+            )
+            .order_by(Post.created_at.desc(), Post.id.desc())
+            .limit(limit)
+        )
+        stmt = insert(TimelineEntry).from_select(
+            ["user_id", "post_id", "author_id", "created_at"], recent
+        ).on_conflict_do_nothing()
+        db.execute(stmt)
+
+    def remove_author(self, db: Session, user_id: int, author_id: int) -> None:
+        """
+        Drop an author's posts from `user_id`'s timeline (after an unfollow).
+        """
+        db.execute(
+            delete(TimelineEntry).where(
+                TimelineEntry.user_id == user_id, TimelineEntry.author_id == author_id
+            )
+        )
+
+    def get_page(
+        self,
+        db: Session,
+        user_id: int,
+        threshold: int,
+        limit: int,
+        after: Optional[Keyset] = None,
+    ) -> List[PostRecord]:
+        """
+        One newest-first feed page in a single statement:
+        - a primary-key range scan of the user's materialized timeline, plus
+        - the latest `limit` posts of each followed author at/over `threshold`
+          (LATERAL, served by ix_posts_author_id_created_at_id).
+        UNION de-duplicates posts that exist on both sides (e.g. an author who
+        crossed the threshold after the post was fanned out).
+        """
+        fanned = (
+            select(TimelineEntry.post_id.label("id"), TimelineEntry.created_at)
+            .join(Post, Post.id == TimelineEntry.post_id)
+            .where(TimelineEntry.user_id == user_id, LIVE_POST)
+        )
+        if after is not None:
+            fanned = fanned.where(
+                tuple_(TimelineEntry.created_at, TimelineEntry.post_id) < tuple_(*after)
+            )
+        fanned = fanned.order_by(
+            TimelineEntry.created_at.desc(), TimelineEntry.post_id.desc()
+        ).limit(limit)
+
+        celebrities = (
+            select(Follow.followee_id)
+            .join(User, User.id == Follow.followee_id)
+            .where(
+                Follow.follower_id == user_id,
+                User.follower_count >= threshold,
+                User.deleted_at.is_(None),
+            )
+            .subquery("celebrities")
+        )
+        recent = select(Post.id, Post.created_at).where(
+            Post.author_id == celebrities.c.followee_id, Post.deleted_at.is_(None)
+        )
+        if after is not None:
+            recent = recent.where(tuple_(Post.created_at, Post.id) < tuple_(*after))
+        recent = (
+            recent.order_by(Post.created_at.desc(), Post.id.desc())
+            .limit(limit)
+            .lateral("recent")
+        )
+        pulled = select(recent.c.id, recent.c.created_at).select_from(
+            celebrities.join(recent, true())
+        )
+
+        page = union(fanned, pulled).subquery("page")
+        stmt = (
+            select(*POST_RECORD_COLUMNS)
+            .select_from(posts_table.join(page, page.c.id == posts_table.c.id))
+            .order_by(posts_table.c.created_at.desc(), posts_table.c.id.desc())
+            .limit(limit)
+        )
+        return list(starmap(PostRecord, db.execute(stmt)))
@@ -1,31 +1,137 @@
-from typing import Optional
+from datetime import datetime
+from itertools import starmap
+from typing import Any, List, Mapping, Optional, Set, Tuple
 
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from core.metrics import instrument_methods
+from dtos.users import UserRecord
+from repositories.loader import AsyncRecordLoader, RecordLoader, get_loader
 from models.user import User
 
+users_table = User.__table__
 
+# Tombstoned users (deletion in progress) are invisible to every read.
+_live = users_table.c.deleted_at.is_(None)
+
+# Columns served by the user read endpoints; order matches UserRecord's fields.
+USER_RECORD_COLUMNS = (
+    users_table.c.id,
+    users_table.c.email,
+    users_table.c.name,
+    users_table.c.age,
+    users_table.c.updated_at,
+    users_table.c.version,
+)
+
+# Insert that skips emails already taken; only inserted rows are returned.
+# Used for single rows and as a multi-row insert (insertmanyvalues).
+_create_stmt = (
+    insert(users_table)
+    .on_conflict_do_nothing(index_elements=[users_table.c.email])
+    .returning(*USER_RECORD_COLUMNS)
+)
+
+
+@instrument_methods
 class UserRepository:
     """
     Repository responsible for persistence-related operations
     for the User aggregate.
     """
 
-    def create(self, db: Session, user: User) -> User:
+    def create(self, db: Session, row: Mapping[str, Any]) -> Optional[UserRecord]:
         """
-        Persist a new User instance.
+        Insert one user (email, name, age) with INSERT ... ON CONFLICT DO
+        NOTHING RETURNING; None if the email is already taken.
         Caller is responsible for handling transaction boundaries.
         """
-        db.add(user)
-        db.flush()  # Assigns primary key without committing
-        return user
+        result = db.execute(_create_stmt, row).first()
+        return UserRecord(*result) if result is not None else None
+
+    def create_many(self, db: Session, rows: List[dict]) -> List[UserRecord]:
+        """
+        Insert users given as column dicts (email, name, age), skipping
+        emails that already exist. Caller handles transaction boundaries.
+        """
+        return list(starmap(UserRecord, db.execute(_create_stmt, rows)))
 
     def get_by_id(self, db: Session, user_id: int) -> Optional[User]:
-        stmt = select(User).where(User.id == user_id)
+        stmt = select(User).where(User.id == user_id, _live)
         return db.scalar(stmt)
 
-    def get_by_email(self, db: Session, email: str) -> Optional[User]:
-        stmt = select(User).where(User.email == email)
-        return db.scalar(stmt)
+    def get_record_by_id(self, db: Session, user_id: int) -> Optional[UserRecord]:
+        stmt = select(*USER_RECORD_COLUMNS).where(users_table.c.id == user_id, _live)
+        row = db.execute(stmt).first()
+        return UserRecord(*row) if row is not None else None
+
+    def get_existing_ids(self, db: Session, user_ids: List[int]) -> Set[int]:
+        stmt = select(users_table.c.id).where(users_table.c.id.in_(user_ids), _live)
+        return set(db.scalars(stmt))
+
+    def get_records_by_ids(self, db: Session, user_ids: List[int]) -> List[UserRecord]:
+        """
+        Users among `user_ids` in one `id IN (...)` query, in no particular order.
+        """
+        stmt = select(*USER_RECORD_COLUMNS).where(users_table.c.id.in_(user_ids), _live)
+        return list(starmap(UserRecord, db.execute(stmt)))
+
+    def loader(self, db: Session) -> RecordLoader:
+        """
+        Request-scoped batcher over get_records_by_ids (see repositories.loader).
+        """
+        return get_loader(db, "users", lambda: RecordLoader(db, self.get_records_by_ids))
+
+    def get_version(self, db: Session, user_id: int) -> Optional[Tuple[int, datetime]]:
+        """
+        (version, updated_at) of a user, for conditional GETs.
+        """
+        stmt = select(users_table.c.version, users_table.c.updated_at).where(
+            users_table.c.id == user_id, _live
+        )
+        row = db.execute(stmt).first()
+        return tuple(row) if row is not None else None
+
+
+@instrument_methods
+class AsyncUserRepository:
+    """
+    AsyncSession counterpart of UserRepository.
+    """
+
+    async def create(self, db: AsyncSession, row: Mapping[str, Any]) -> Optional[UserRecord]:
+        result = (await db.execute(_create_stmt, row)).first()
+        return UserRecord(*result) if result is not None else None
+
+    async def create_many(self, db: AsyncSession, rows: List[dict]) -> List[UserRecord]:
+        return list(starmap(UserRecord, await db.execute(_create_stmt, rows)))
+
+    async def get_by_id(self, db: AsyncSession, user_id: int) -> Optional[User]:
+        stmt = select(User).where(User.id == user_id, _live)
+        return await db.scalar(stmt)
+
+    async def get_record_by_id(self, db: AsyncSession, user_id: int) -> Optional[UserRecord]:
+        stmt = select(*USER_RECORD_COLUMNS).where(users_table.c.id == user_id, _live)
+        row = (await db.execute(stmt)).first()
+        return UserRecord(*row) if row is not None else None
+
+    async def get_existing_ids(self, db: AsyncSession, user_ids: List[int]) -> Set[int]:
+        stmt = select(users_table.c.id).where(users_table.c.id.in_(user_ids), _live)
+        return set(await db.scalars(stmt))
+
+    async def get_records_by_ids(self, db: AsyncSession, user_ids: List[int]) -> List[UserRecord]:
+        stmt = select(*USER_RECORD_COLUMNS).where(users_table.c.id.in_(user_ids), _live)
+        return list(starmap(UserRecord, await db.execute(stmt)))
+
+    def loader(self, db: AsyncSession) -> AsyncRecordLoader:
+        return get_loader(db, "users", lambda: AsyncRecordLoader(db, self.get_records_by_ids))
 
+    async def get_version(self, db: AsyncSession, user_id: int) -> Optional[Tuple[int, datetime]]:
+        stmt = select(users_table.c.version, users_table.c.updated_at).where(
+            users_table.c.id == user_id, _live
+        )
+        row = (await db.execute(stmt)).first()
+        return tuple(row) if row is not None else None
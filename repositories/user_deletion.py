@@ -0,0 +1,315 @@
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import Select, func, literal, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from core.metrics import instrument_methods
+from dtos.users import UserDeletionRecord
+from models.comment import Comment
+from models.follow import Follow
+from models.like import Like
+from models.post import Post
+from models.timeline import TimelineEntry
+from models.user import User
+from models.user_deletion import UserDeletion
+
+deletions_table = UserDeletion.__table__
+users_table = User.__table__
+posts_table = Post.__table__
+likes_table = Like.__table__
+comments_table = Comment.__table__
+follows_table = Follow.__table__
+timeline_table = TimelineEntry.__table__
+
+# Order matches UserDeletionRecord's fields.
+DELETION_RECORD_COLUMNS = (
+    deletions_table.c.user_id,
+    deletions_table.c.step,
+    deletions_table.c.rows_deleted,
+    deletions_table.c.requested_at,
+    deletions_table.c.updated_at,
+    deletions_table.c.finished_at,
+)
+
+# Purge order. The user's posts are hidden first; then the rows the user
+# created elsewhere go; then the posts are emptied of likes, comments and
+# timeline copies before they are deleted, so the final DELETE of the user
+# row cascades through (almost) nothing.
+PURGE_STEPS = (
+    "hide_posts",
+    "likes",
+    "comments",
+    "following",
+    "followers",
+    "timeline",
+    "post_likes",
+    "post_comments",
+    "post_timeline",
+    "posts",
+    "user",
+)
+DONE = "done"
+
+
+def _own_posts(user_id: int):
+    return posts_table.c.author_id == user_id
+
+
+def _hide_posts(user_id: int, limit: int):
+    batch = select(posts_table.c.id).where(_own_posts(user_id), posts_table.c.deleted_at.is_(None)).limit(limit)
+    return (
+        update(posts_table)
+        .where(posts_table.c.id.in_(batch))
+        .values(deleted_at=func.now())
+        .returning(posts_table.c.id)
+    )
+
+
+def _delete_likes(batch: Select):
+    key = tuple_(likes_table.c.user_id, likes_table.c.post_id)
+    return likes_table.delete().where(key.in_(batch)).returning(likes_table.c.post_id)
+
+
+def _delete_comments(batch: Select):
+    return comments_table.delete().where(comments_table.c.id.in_(batch)).returning(comments_table.c.post_id)
+
+
+def _delete_follows(batch: Select, returned):
+    key = tuple_(follows_table.c.follower_id, follows_table.c.followee_id)
+    return follows_table.delete().where(key.in_(batch)).returning(returned)
+
+
+def _delete_timeline(batch: Select):
+    key = tuple_(timeline_table.c.user_id, timeline_table.c.created_at, timeline_table.c.post_id)
+    return timeline_table.delete().where(key.in_(batch)).returning(timeline_table.c.post_id)
+
+
+_like_keys = select(likes_table.c.user_id, likes_table.c.post_id)
+_follow_keys = select(follows_table.c.follower_id, follows_table.c.followee_id)
+_timeline_keys = select(timeline_table.c.user_id, timeline_table.c.created_at, timeline_table.c.post_id)
+
+
+def _likes(user_id: int, limit: int):
+    return _delete_likes(_like_keys.where(likes_table.c.user_id == user_id).limit(limit))
+
+
+def _comments(user_id: int, limit: int):
+    return _delete_comments(select(comments_table.c.id).where(comments_table.c.author_id == user_id).limit(limit))
+
+
+def _following(user_id: int, limit: int):
+    batch = _follow_keys.where(follows_table.c.follower_id == user_id).limit(limit)
+    return _delete_follows(batch, follows_table.c.followee_id)
+
+
+def _followers(user_id: int, limit: int):
+    batch = _follow_keys.where(follows_table.c.followee_id == user_id).limit(limit)
+    return _delete_follows(batch, follows_table.c.follower_id)
+
+
+def _timeline(user_id: int, limit: int):
+    return _delete_timeline(_timeline_keys.where(timeline_table.c.user_id == user_id).limit(limit))
+
+
+def _post_likes(user_id: int, limit: int):
+    return _delete_likes(
+        _like_keys.join(posts_table, posts_table.c.id == likes_table.c.post_id).where(_own_posts(user_id)).limit(limit)
+    )
+
+
+def _post_comments(user_id: int, limit: int):
+    return _delete_comments(
+        select(comments_table.c.id)
+        .join(posts_table, posts_table.c.id == comments_table.c.post_id)
+        .where(_own_posts(user_id))
+        .limit(limit)
+    )
+
+
+def _post_timeline(user_id: int, limit: int):
+    return _delete_timeline(
+        _timeline_keys.join(posts_table, posts_table.c.id == timeline_table.c.post_id)
+        .where(_own_posts(user_id))
+        .limit(limit)
+    )
+
+
+def _posts(user_id: int, limit: int):
+    batch = select(posts_table.c.id).where(_own_posts(user_id)).limit(limit)
+    return posts_table.delete().where(posts_table.c.id.in_(batch)).returning(posts_table.c.id)
+
+
+def _user(user_id: int, limit: int):
+    # Anything written for the user after its step ran goes with the cascade.
+    return users_table.delete().where(users_table.c.id == user_id).returning(users_table.c.id)
+
+
+# step -> (user_id, limit) -> DML removing at most `limit` rows, RETURNING one
+# id per row: the liked/commented post for likes/comments (counter deltas,
+# applied in the batch's transaction),
+# the followee for following (follower counts). Every batch starts from an
+# index on the user or post id (see scripts/check_query_plans.py).
+_PURGE_STMTS: Dict[str, Callable[[int, int], Any]] = {
+    "hide_posts": _hide_posts,
+    "likes": _likes,
+    "comments": _comments,
+    "following": _following,
+    "followers": _followers,
+    "timeline": _timeline,
+    "post_likes": _post_likes,
+    "post_comments": _post_comments,
+    "post_timeline": _post_timeline,
+    "posts": _posts,
+    "user": _user,
+}
+
+
+def _schedule_stmt(user_id: int):
+    """
+    Tombstone a live user and queue its purge in one statement, returning
+    the ids of the user's live posts (NULL if there are none); no row back
+    means there was no such (live) user.
+    """
+    tombstoned = (
+        update(users_table)
+        .where(users_table.c.id == user_id, users_table.c.deleted_at.is_(None))
+        .values(deleted_at=func.now())
+        .returning(users_table.c.id)
+        .cte("tombstoned")
+    )
+    return (
+        insert(deletions_table)
+        .from_select(["user_id", "step"], select(tombstoned.c.id, literal(PURGE_STEPS[0])))
+        .on_conflict_do_nothing()
+        .returning(
+            deletions_table.c.user_id,
+            select(func.array_agg(posts_table.c.id))
+            .where(_own_posts(user_id), posts_table.c.deleted_at.is_(None))
+            .scalar_subquery(),
+        )
+    )
+
+
+def _get_stmt(user_id: int) -> Select:
+    return select(*DELETION_RECORD_COLUMNS).where(deletions_table.c.user_id == user_id)
+
+
+@instrument_methods
+class UserDeletionRepository:
+    """
+    Repository for tombstoned users and their batched purge
+    (services.user_deletion).
+    """
+
+    def schedule(self, db: Session, user_id: int) -> Optional[List[int]]:
+        """
+        Tombstone the user and queue the purge. Returns the ids of the
+        user's live posts (for cache eviction), or None if there is no live
+        user with that id. Caller handles transaction boundaries.
+        """
+        row = db.execute(_schedule_stmt(user_id)).first()
+        return list(row[1] or ()) if row is not None else None
+
+    def get(self, db: Session, user_id: int) -> Optional[UserDeletionRecord]:
+        row = db.execute(_get_stmt(user_id)).first()
+        return UserDeletionRecord(*row) if row is not None else None
+
+    def claim(self, db: Session, owner: str, lease_seconds: float) -> Optional[Tuple[int, str]]:
+        """
+        Lease the oldest unfinished job nobody holds (or whose lease ran out)
+        to `owner`. Returns (user_id, step to resume at), or None.
+        """
+        candidate = (
+            select(deletions_table.c.user_id)
+            .where(
+                deletions_table.c.finished_at.is_(None),
+                or_(deletions_table.c.leased_until.is_(None), deletions_table.c.leased_until < func.now()),
+            )
+            .order_by(deletions_table.c.requested_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(deletions_table)
+            .where(deletions_table.c.user_id == candidate)
+            .values(lease_owner=owner, leased_until=func.now() + timedelta(seconds=lease_seconds))
+            .returning(deletions_table.c.user_id, deletions_table.c.step)
+        )
+        row = db.execute(stmt).first()
+        return tuple(row) if row is not None else None
+
+    def purge_batch(self, db: Session, step: str, user_id: int, limit: int) -> List[int]:
+        """
+        Run one batch of `step` (at most `limit` rows); returns the ids the
+        statement returns, one per row. Fewer than `limit` means the step is done.
+        """
+        return list(db.scalars(_PURGE_STMTS[step](user_id, limit)))
+
+    def decrement_follower_counts(self, db: Session, user_ids: List[int]) -> None:
+        """
+        users.follower_count - 1 for each id (one unfollowed edge each),
+        leaving version/updated_at alone like FollowRepository.adjust_follower_count.
+        """
+        if user_ids:
+            db.execute(
+                update(users_table)
+                .where(users_table.c.id.in_(user_ids))
+                .values(
+                    follower_count=users_table.c.follower_count - 1,
+                    version=users_table.c.version,
+                    updated_at=users_table.c.updated_at,
+                )
+            )
+
+    def advance(
+        self, db: Session, user_id: int, owner: str, step: str, rows: int, lease_seconds: float
+    ) -> bool:
+        """
+        Record a batch: the step to run next, `rows` more deleted, lease
+        renewed (released when `step` is DONE). False if `owner` no longer
+        holds the job; the caller must then roll back.
+        """
+        values = {
+            "step": step,
+            "rows_deleted": deletions_table.c.rows_deleted + rows,
+            "leased_until": func.now() + timedelta(seconds=lease_seconds),
+        }
+        if step == DONE:
+            values.update(finished_at=func.now(), lease_owner=None, leased_until=None)
+        stmt = (
+            update(deletions_table)
+            .where(deletions_table.c.user_id == user_id, deletions_table.c.lease_owner == owner)
+            .values(**values)
+            .returning(deletions_table.c.user_id)
+        )
+        return db.scalar(stmt) is not None
+
+    def release(self, db: Session, user_id: int, owner: str) -> None:
+        """
+        Give the job back so another worker can resume it straight away.
+        """
+        db.execute(
+            update(deletions_table)
+            .where(deletions_table.c.user_id == user_id, deletions_table.c.lease_owner == owner)
+            .values(lease_owner=None, leased_until=None)
+        )
+
+
+@instrument_methods
+class AsyncUserDeletionRepository:
+    """
+    AsyncSession counterpart of the request-side half of UserDeletionRepository
+    (the purge itself always runs on the sync worker).
+    """
+
+    async def schedule(self, db: AsyncSession, user_id: int) -> Optional[List[int]]:
+        row = (await db.execute(_schedule_stmt(user_id))).first()
+        return list(row[1] or ()) if row is not None else None
+
+    async def get(self, db: AsyncSession, user_id: int) -> Optional[UserDeletionRecord]:
+        row = (await db.execute(_get_stmt(user_id))).first()
+        return UserDeletionRecord(*row) if row is not None else None
@@ -0,0 +1,256 @@
+"""
+Query-plan regression check.
+
+Runs every repository query, writes included (plus the user purge batches
+and the lookups Postgres performs for ON DELETE CASCADE), against a seeded
+database in a transaction that is rolled back, EXPLAINs the exact SQL and parameters
+that were sent, and fails if any plan sequentially scans a table with at
+least --min-rows rows.
+
+    python -m scripts.check_query_plans --min-rows 10000
+
+Exit status is 1 when a violation is found, so this can gate CI.
+"""
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from db.session import SessionLocal, _engine
+from dtos.posts import PostExportFilter
+from repositories.comment import CommentRepository
+from repositories.follow import FollowRepository
+from repositories.like import LikeRepository
+from repositories.post import PostRepository
+from repositories.timeline import TimelineRepository
+from repositories.user import UserRepository
+from repositories.user_deletion import PURGE_STEPS, UserDeletionRepository
+
+
+@dataclass
+class Sample:
+    post_id: int
+    author_id: int
+    post_created_at: Any
+    user_id: int  # a live user other than the author
+
+
+# name -> callable(db, sample). Every repository query method should be listed.
+REPOSITORY_QUERIES: Dict[str, Callable[[Session, Sample], Any]] = {
+    "PostRepository.get_by_id": lambda db, s: PostRepository().get_by_id(db, s.post_id),
+    "PostRepository.get_by_author_id": lambda db, s: PostRepository().get_by_author_id(db, s.author_id),
+    "PostRepository.get_by_author_id(after)": lambda db, s: PostRepository().get_by_author_id(
+        db, s.author_id, after=(s.post_created_at, s.post_id)
+    ),
+    "PostRepository.get_all": lambda db, s: PostRepository().get_all(db),
+    "PostRepository.get_all(after)": lambda db, s: PostRepository().get_all(
+        db, after=(s.post_created_at, s.post_id)
+    ),
+    "PostRepository.get_records_by_author_id": lambda db, s: PostRepository().get_records_by_author_id(
+        db, s.author_id
+    ),
+    "PostRepository.get_all_records(after)": lambda db, s: PostRepository().get_all_records(
+        db, after=(s.post_created_at, s.post_id)
+    ),
+    "PostRepository.get_records_by_ids": lambda db, s: PostRepository().get_records_by_ids(
+        db, [s.post_id, s.post_id - 1]
+    ),
+    "PostRepository.stream_records(author)": lambda db, s: list(PostRepository().stream_records(
+        db, PostExportFilter(author_id=s.author_id)
+    )),
+    "PostRepository.stream_records(since)": lambda db, s: list(PostRepository().stream_records(
+        db, PostExportFilter(since=s.post_created_at)
+    )),
+    "UserRepository.get_by_id": lambda db, s: UserRepository().get_by_id(db, s.author_id),
+    "UserRepository.get_records_by_ids": lambda db, s: UserRepository().get_records_by_ids(
+        db, [s.author_id, s.author_id - 1]
+    ),
+    "CommentRepository.get_by_post_id": lambda db, s: CommentRepository().get_by_post_id(db, s.post_id),
+    "CommentRepository.get_by_post_id(after)": lambda db, s: CommentRepository().get_by_post_id(
+        db, s.post_id, after=(s.post_created_at, 0)
+    ),
+    "TimelineRepository.get_page": lambda db, s: TimelineRepository().get_page(
+        db, s.author_id, settings.FEED_FANOUT_THRESHOLD, 51
+    ),
+    "UserRepository.get_record_by_id": lambda db, s: UserRepository().get_record_by_id(db, s.author_id),
+    "UserRepository.get_version": lambda db, s: UserRepository().get_version(db, s.author_id),
+    "UserRepository.get_existing_ids": lambda db, s: UserRepository().get_existing_ids(
+        db, [s.author_id, s.user_id]
+    ),
+    "PostRepository.get_record_by_id": lambda db, s: PostRepository().get_record_by_id(db, s.post_id),
+    "PostRepository.get_version": lambda db, s: PostRepository().get_version(db, s.post_id),
+    "PostRepository.get_max_id": lambda db, s: PostRepository().get_max_id(db),
+    "FollowRepository.get_followee_ids": lambda db, s: FollowRepository().get_followee_ids(db, s.user_id),
+    # Writes run for real on the sample rows, in order (the follow exists when
+    # it is backfilled, the like when it is removed); all rolled back.
+    "LikeRepository.add": lambda db, s: LikeRepository().add(db, s.user_id, s.post_id),
+    "LikeRepository.remove": lambda db, s: LikeRepository().remove(db, s.user_id, s.post_id),
+    "LikeRepository.add_many": lambda db, s: LikeRepository().add_many(
+        db, [(s.user_id, s.post_id), (s.author_id, s.post_id)]
+    ),
+    "LikeRepository.remove_many": lambda db, s: LikeRepository().remove_many(
+        db, [(s.user_id, s.post_id), (s.author_id, s.post_id)]
+    ),
+    "FollowRepository.create": lambda db, s: FollowRepository().create(db, s.user_id, s.author_id),
+    "FollowRepository.adjust_follower_count": lambda db, s: FollowRepository().adjust_follower_count(
+        db, s.author_id, 1
+    ),
+    "TimelineRepository.fan_out": lambda db, s: TimelineRepository().fan_out(
+        db, s.post_id, settings.FEED_FANOUT_THRESHOLD
+    ),
+    "TimelineRepository.fan_out_many": lambda db, s: TimelineRepository().fan_out_many(
+        db, [s.post_id, s.post_id - 1], settings.FEED_FANOUT_THRESHOLD
+    ),
+    "TimelineRepository.backfill": lambda db, s: TimelineRepository().backfill(
+        db, s.user_id, s.author_id, settings.FEED_BACKFILL_LIMIT, settings.FEED_FANOUT_THRESHOLD
+    ),
+    "TimelineRepository.remove_author": lambda db, s: TimelineRepository().remove_author(
+        db, s.user_id, s.author_id
+    ),
+    "FollowRepository.delete": lambda db, s: FollowRepository().delete(db, s.user_id, s.author_id),
+    "PostRepository.update": lambda db, s: PostRepository().update(db, s.post_id, {"caption": "plan-check"}),
+    "PostRepository.apply_counter_deltas": lambda db, s: PostRepository().apply_counter_deltas(
+        db, {s.post_id: (1, 0), s.post_id - 1: (0, 1)}
+    ),
+    "PostRepository.reconcile_counters": lambda db, s: PostRepository().reconcile_counters(
+        db, s.post_id - 10_000, s.post_id + 1
+    ),
+    "PostRepository.delete": lambda db, s: PostRepository().delete(db, s.post_id),
+    "UserDeletionRepository.claim": lambda db, s: UserDeletionRepository().claim(db, "plan-check", 60),
+    # Run for real on the sample author; everything is rolled back at the end.
+    **{
+        f"UserDeletionRepository.purge_batch({step})": (
+            lambda db, s, step=step: UserDeletionRepository().purge_batch(
+                db, step, s.author_id, settings.USER_DELETION_BATCH_SIZE
+            )
+        )
+        for step in PURGE_STEPS
+    },
+}
+
+# Lookups Postgres runs for ON DELETE CASCADE / FK checks.
+FK_LOOKUPS: Dict[str, str] = {
+    "posts.author_id": "SELECT 1 FROM posts WHERE author_id = :author_id",
+    "comments.post_id": "SELECT 1 FROM comments WHERE post_id = :post_id",
+    "comments.author_id": "SELECT 1 FROM comments WHERE author_id = :author_id",
+    "likes.post_id": "SELECT 1 FROM likes WHERE post_id = :post_id",
+    "likes.user_id": "SELECT 1 FROM likes WHERE user_id = :author_id",
+    "follows.follower_id": "SELECT 1 FROM follows WHERE follower_id = :author_id",
+    "follows.followee_id": "SELECT 1 FROM follows WHERE followee_id = :author_id",
+    "timeline_entries.post_id": "SELECT 1 FROM timeline_entries WHERE post_id = :post_id",
+}
+
+
+def _load_sample(db: Session) -> Sample:
+    row = db.execute(
+        text(
+            "SELECT p.id, p.author_id, p.created_at, "
+            "(SELECT u.id FROM users u WHERE u.id <> p.author_id AND u.deleted_at IS NULL "
+            "ORDER BY u.id DESC LIMIT 1) "
+            "FROM posts p "
+            "WHERE p.deleted_at IS NULL ORDER BY p.id DESC LIMIT 1"
+        )
+    ).first()
+    if row is None:
+        sys.exit("Database has no posts; seed it before checking query plans.")
+    return Sample(*row)
+
+
+def _table_sizes(db: Session) -> Dict[str, float]:
+    rows = db.execute(
+        text(
+            "SELECT relname, reltuples FROM pg_class "
+            "WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace"
+        )
+    )
+    return {name: tuples for name, tuples in rows}
+
+
+def _capture(db: Session, fn: Callable[[], Any]) -> List[Tuple[str, Any]]:
+    captured: List[Tuple[str, Any]] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith("EXPLAIN"):
+            # An executemany has one plan; the first parameter set stands in.
+            captured.append((statement, parameters[0] if executemany else parameters))
+
+    event.listen(_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        fn()
+    finally:
+        event.remove(_engine, "before_cursor_execute", before_cursor_execute)
+    return captured
+
+
+def _explain(db: Session, statement: str, parameters: Any) -> dict:
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.execute("EXPLAIN (FORMAT JSON) " + statement, parameters)
+        plan = cursor.fetchone()[0]
+    finally:
+        cursor.close()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def _nodes(plan: dict) -> Iterator[dict]:
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _nodes(child)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--min-rows", type=int, default=10_000,
+        help="tables with at least this many rows must never be seq-scanned",
+    )
+    parser.add_argument("--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        db.execute(text("ANALYZE"))
+        sizes = _table_sizes(db)
+        sample = _load_sample(db)
+
+        checks: List[Tuple[str, str, Any]] = []
+        for name, query in REPOSITORY_QUERIES.items():
+            for statement, parameters in _capture(db, lambda: query(db, sample)):
+                checks.append((name, statement, parameters))
+        for name, sql in FK_LOOKUPS.items():
+            params = {"post_id": sample.post_id, "author_id": sample.author_id}
+            for statement, parameters in _capture(db, lambda: db.execute(text(sql), params)):
+                checks.append((f"fk {name}", statement, parameters))
+
+        failures = 0
+        for name, statement, parameters in checks:
+            plan = _explain(db, statement, parameters)
+            seq_scans = [
+                node["Relation Name"]
+                for node in _nodes(plan)
+                if node["Node Type"] == "Seq Scan"
+                and sizes.get(node["Relation Name"], 0) >= args.min_rows
+            ]
+            status = "FAIL" if seq_scans else "ok"
+            failures += bool(seq_scans)
+            detail = f" seq scan on {', '.join(seq_scans)}" if seq_scans else ""
+            print(f"{status:<5}{name}{detail}")
+            if args.verbose or seq_scans:
+                print(json.dumps(plan, indent=2, default=str))
+    finally:
+        db.rollback()
+        db.close()
+
+    if failures:
+        sys.exit(f"{failures} quer{'y' if failures == 1 else 'ies'} fell back to a seq scan.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Export live posts as NDJSON (the CLI counterpart of GET /posts/export).
+
+Rows are read through a server-side cursor in EXPORT_CHUNK_SIZE chunks and
+written as they arrive, so memory stays flat for any number of posts. The
+output is one JSON object per line, oldest post first, in the format
+scripts.import_data reads back.
+
+    python -m scripts.export_posts posts.ndjson.gz --since 2025-01-01
+    python -m scripts.export_posts - --author-id 42 | jq .id
+"""
+import argparse
+import gzip
+import sys
+import time
+from datetime import datetime
+from typing import IO
+
+from core.errors import DomainError
+from core.responses import ndjson_lines
+from db.session import SessionLocal
+from dtos.posts import PostExportFilter
+from services.post import PostService
+
+
+def _open(path: str) -> IO[bytes]:
+    if path == "-":
+        return sys.stdout.buffer
+    if path.endswith(".gz"):
+        return gzip.open(path, "wb", compresslevel=1)
+    return open(path, "wb")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("output", help="file path (.gz compresses) or - for stdout")
+    parser.add_argument("--author-id", type=int)
+    parser.add_argument("--since", type=datetime.fromisoformat, help="created_at >= this (ISO 8601)")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="created_at < this (ISO 8601)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    rows = 0
+    db = SessionLocal(read_only=True)
+    try:
+        chunks = PostService().export_posts(db, PostExportFilter(args.author_id, args.since, args.until))
+    except DomainError as exc:
+        db.close()
+        sys.exit(exc.message)
+    out = _open(args.output)
+    try:
+        for records in chunks:
+            out.write(ndjson_lines(records))
+            rows += len(records)
+    finally:
+        db.close()
+        if out is not sys.stdout.buffer:
+            out.close()
+    print(f"Exported {rows} posts in {time.perf_counter() - started:.1f}s.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
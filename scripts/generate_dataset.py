@@ -0,0 +1,183 @@
+"""
+Generate a synthetic, seeded dataset for scripts.import_data.
+
+Distributions follow what social graphs look like in practice:
+- follower counts are power-law: followees are drawn by Zipf popularity
+  (weight 1 / rank^--zipf over a shuffled ranking), so a few users end up
+  with a large share of all follows while most have a handful;
+- following counts, posts per user, likes and comments per post are
+  heavy-tailed (Pareto) around the requested means;
+- likes favour posts by popular authors.
+
+Files are written row by row (users.csv, posts.csv, follows.csv, likes.csv,
+comments.csv, optionally gzipped); only per-user arrays are kept in memory.
+Counter columns (follower_count, like_count, comment_count) are filled in,
+so the output imports without --recompute-counters.
+
+    python -m scripts.generate_dataset data/ --users 1000000 --seed 7 --gzip
+"""
+import argparse
+import bisect
+import csv
+import functools
+import gzip
+import itertools
+import os
+import random
+import time
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import IO, Callable, List
+
+
+def _open(directory: str, name: str, compress: bool) -> IO[str]:
+    path = os.path.join(directory, name + (".csv.gz" if compress else ".csv"))
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", newline="", compresslevel=1)
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def _heavy_tailed(rng: random.Random, mean: float, alpha: float, cap: int) -> int:
+    """
+    Integer with a Pareto(alpha) tail and (before capping) the given mean.
+    """
+    if mean <= 0:
+        return 0
+    scale = mean * (alpha - 1) / alpha
+    return min(cap, int(scale * rng.paretovariate(alpha)))
+
+
+class ZipfSampler:
+    """
+    Draws user ids with probability proportional to 1 / rank^s, where ranks
+    are a seeded shuffle of the ids (popularity independent of id order).
+    """
+
+    def __init__(self, rng: random.Random, n: int, s: float) -> None:
+        ranked = array("l", range(1, n + 1))
+        rng.shuffle(ranked)
+        self._ids = ranked
+        self._cumulative = array("d", itertools.accumulate(1.0 / (rank ** s) for rank in range(1, n + 1)))
+        self._total = self._cumulative[-1]
+        self._random = rng.random
+
+    def popularity(self) -> List[float]:
+        """
+        Relative weight of each user id (index 0 is id 1).
+        """
+        weights = [0.0] * len(self._ids)
+        previous = 0.0
+        for id, cumulative in zip(self._ids, self._cumulative):
+            weights[id - 1] = cumulative - previous
+            previous = cumulative
+        return weights
+
+    def __call__(self) -> int:
+        return self._ids[bisect.bisect(self._cumulative, self._random() * self._total)]
+
+
+def _progress(label: str, started: float, rows: int) -> None:
+    print(f"{label}: {rows:,} rows in {time.perf_counter() - started:.1f}s", flush=True)
+
+
+def _sample_distinct(draw: Callable[[], int], count: int, exclude: int, attempts: int) -> set:
+    chosen: set = set()
+    for _ in range(attempts):
+        if len(chosen) >= count:
+            break
+        id = draw()
+        if id != exclude:
+            chosen.add(id)
+    return chosen
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("directory")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--avg-following", type=float, default=40)
+    parser.add_argument("--posts-per-user", type=float, default=10)
+    parser.add_argument("--likes-per-post", type=float, default=8)
+    parser.add_argument("--comments-per-post", type=float, default=1.5)
+    parser.add_argument("--zipf", type=float, default=1.05, help="popularity exponent")
+    parser.add_argument("--days", type=int, default=365, help="spread created_at over this many days")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--gzip", action="store_true")
+    args = parser.parse_args()
+
+    os.makedirs(args.directory, exist_ok=True)
+    rng = random.Random(args.seed)
+    n = args.users
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    span = args.days * 86_400
+    popular = ZipfSampler(rng, n, args.zipf)
+
+    # follows: followee by popularity, following count heavy-tailed
+    started = time.perf_counter()
+    follower_count = array("l", bytes(8 * (n + 1)))
+    rows = 0
+    with _open(args.directory, "follows", args.gzip) as out:
+        writer = csv.writer(out)
+        writer.writerow(["follower_id", "followee_id", "created_at"])
+        for follower in range(1, n + 1):
+            want = _heavy_tailed(rng, args.avg_following, 1.8, n - 1)
+            for followee in _sample_distinct(popular, want, follower, want * 3):
+                follower_count[followee] += 1
+                writer.writerow([follower, followee, (now - timedelta(seconds=rng.randrange(span))).isoformat()])
+                rows += 1
+    _progress("follows", started, rows)
+
+    started = time.perf_counter()
+    with _open(args.directory, "users", args.gzip) as out:
+        writer = csv.writer(out)
+        writer.writerow(["id", "email", "name", "age", "follower_count", "created_at"])
+        for id in range(1, n + 1):
+            age = rng.randint(16, 80) if rng.random() < 0.7 else ""
+            created_at = now - timedelta(seconds=span + rng.randrange(span))
+            writer.writerow([id, f"user{id}@example.com", f"User {id}", age, follower_count[id], created_at.isoformat()])
+    _progress("users", started, n)
+    del follower_count
+
+    # posts with their likes and comments; popular authors get more likes
+    weights = popular.popularity()
+    mean_weight = 1.0 / n
+    started = time.perf_counter()
+    post_id = comment_id = likes = comments = 0
+    uniform = functools.partial(rng.randint, 1, n)
+    with _open(args.directory, "posts", args.gzip) as posts_out, \
+            _open(args.directory, "likes", args.gzip) as likes_out, \
+            _open(args.directory, "comments", args.gzip) as comments_out:
+        posts_writer, likes_writer, comments_writer = map(csv.writer, (posts_out, likes_out, comments_out))
+        posts_writer.writerow(["id", "author_id", "content", "caption", "created_at", "like_count", "comment_count"])
+        likes_writer.writerow(["user_id", "post_id", "created_at"])
+        comments_writer.writerow(["id", "post_id", "author_id", "content", "created_at"])
+        for author in range(1, n + 1):
+            boost = min(50.0, (weights[author - 1] / mean_weight) ** 0.5)
+            for _ in range(_heavy_tailed(rng, args.posts_per_user, 2.0, 10_000)):
+                post_id += 1
+                age = rng.randrange(span)
+                created_at = now - timedelta(seconds=age)
+                n_likes = _heavy_tailed(rng, args.likes_per_post * boost, 1.6, n - 1)
+                likers = _sample_distinct(uniform, n_likes, author, n_likes * 3)
+                for liker in likers:
+                    likes_writer.writerow([liker, post_id, (created_at + timedelta(seconds=rng.randrange(age + 1))).isoformat()])
+                n_comments = _heavy_tailed(rng, args.comments_per_post * boost, 1.8, 10_000)
+                for _ in range(n_comments):
+                    comment_id += 1
+                    comments_writer.writerow([
+                        comment_id, post_id, rng.randint(1, n), f"comment {comment_id}",
+                        (created_at + timedelta(seconds=rng.randrange(age + 1))).isoformat(),
+                    ])
+                caption = f"caption {post_id}" if rng.random() < 0.3 else ""
+                posts_writer.writerow([
+                    post_id, author, f"post {post_id} by user {author}", caption,
+                    created_at.isoformat(), len(likers), n_comments,
+                ])
+                likes += len(likers)
+                comments += n_comments
+    _progress("posts", started, post_id)
+    print(f"likes: {likes:,} rows, comments: {comments:,} rows")
+
+
+if __name__ == "__main__":
+    main()
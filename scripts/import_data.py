@@ -0,0 +1,242 @@
+"""
+Bulk-load CSV / NDJSON files into Postgres with COPY.
+
+Reads `<table>.csv` or `<table>.ndjson` (optionally `.gz`) from a directory
+for every table in models.Base.metadata and loads them parent-first
+(users before posts before likes, ...), one transaction per table. Files
+are streamed to COPY in small chunks, so memory stays constant regardless
+of file size. CSV files need a header row naming the columns; NDJSON takes
+its columns from the first object's keys.
+
+    python -m scripts.generate_dataset data/ --users 100000
+    python -m scripts.import_data data/ --truncate
+
+Afterwards id sequences are moved past the imported ids and the loaded
+tables are ANALYZEd. --recompute-counters rebuilds follower/like/comment
+counters for files that don't carry them; --timelines materializes home
+timelines for the imported follow graph.
+"""
+import argparse
+import csv
+import gzip
+import json
+import os
+import sys
+import time
+from typing import IO, Any, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Table
+
+import models  # noqa: F401  (registers every table on Base.metadata)
+from config.settings import settings
+from db.session import _engine
+from models.base import Base
+
+FORMATS = ("csv", "ndjson")
+# Bytes handed to COPY per read; bounds memory for any file size.
+COPY_CHUNK = 1 << 16
+
+
+def _open(path: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def _find_file(directory: str, table: str) -> Optional[Tuple[str, str]]:
+    for fmt in FORMATS:
+        for suffix in ("", ".gz"):
+            path = os.path.join(directory, f"{table}.{fmt}{suffix}")
+            if os.path.exists(path):
+                return path, fmt
+    return None
+
+
+def _csv_field(value: Any) -> str:
+    # Unquoted empty is NULL in COPY's CSV format; everything else is quoted
+    # so empty strings survive.
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if not isinstance(value, str):
+        value = json.dumps(value)
+    return '"' + value.replace('"', '""') + '"'
+
+
+class NdjsonAsCsv:
+    """
+    Read-only file object that turns NDJSON lines into COPY CSV text on
+    demand; psycopg2's copy_expert pulls it chunk by chunk.
+    """
+
+    def __init__(self, lines: Iterator[str], columns: List[str], first: Optional[dict] = None) -> None:
+        self._lines = lines
+        self._columns = columns
+        self._buffer = ""
+        if first is not None:
+            self._buffer = self._encode(first)
+
+    def _encode(self, row: dict) -> str:
+        return ",".join(_csv_field(row.get(column)) for column in self._columns) + "\n"
+
+    def read(self, size: int = -1) -> str:
+        parts, length = [self._buffer], len(self._buffer)
+        while size < 0 or length < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            if line.strip():
+                encoded = self._encode(json.loads(line))
+                parts.append(encoded)
+                length += len(encoded)
+        data = "".join(parts)
+        if size < 0:
+            self._buffer = ""
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def _copy_source(handle: IO[str], fmt: str) -> Tuple[List[str], Any]:
+    """
+    (columns, file-like CSV source without header) for one input file.
+    """
+    if fmt == "csv":
+        columns = next(csv.reader([handle.readline()]), [])
+        return columns, handle
+    lines = iter(handle)
+    first = None
+    for line in lines:
+        if line.strip():
+            first = json.loads(line)
+            break
+    columns = list(first) if first is not None else []
+    return columns, NdjsonAsCsv(lines, columns, first)
+
+
+def _copy_table(raw_conn: Any, table: Table, path: str, fmt: str) -> int:
+    with _open(path) as handle:
+        columns, source = _copy_source(handle, fmt)
+        unknown = set(columns) - set(table.c.keys())
+        if unknown:
+            sys.exit(f"{path}: unknown columns for {table.name}: {', '.join(sorted(unknown))}")
+        if not columns:
+            return 0
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        sql = f"COPY {table.name} ({column_list}) FROM STDIN WITH (FORMAT csv)"
+        with raw_conn.cursor() as cur:
+            cur.copy_expert(sql, source, size=COPY_CHUNK)
+            return cur.rowcount
+
+
+def _reset_sequence(raw_conn: Any, table: Table) -> None:
+    if "id" not in table.c or not table.c.id.autoincrement:
+        return
+    with raw_conn.cursor() as cur:
+        cur.execute(
+            f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+            f"coalesce(max(id), 1), max(id) IS NOT NULL) FROM {table.name}"
+        )
+
+
+# Derived columns, for input files that don't carry them.
+RECOMPUTE_COUNTERS = {
+    "users.follower_count": (
+        "UPDATE users u SET follower_count = "
+        "(SELECT count(*) FROM follows f WHERE f.followee_id = u.id)"
+    ),
+    "posts.like_count/comment_count": (
+        "UPDATE posts p SET "
+        "like_count = (SELECT count(*) FROM likes l WHERE l.post_id = p.id), "
+        "comment_count = (SELECT count(*) FROM comments c WHERE c.post_id = p.id)"
+    ),
+}
+
+# The latest FEED_BACKFILL_LIMIT posts of every followed author below the
+# fan-out threshold, i.e. what fan-out-on-write would have produced.
+MATERIALIZE_TIMELINES = """
+INSERT INTO timeline_entries (user_id, post_id, author_id, created_at)
+SELECT f.follower_id, p.id, p.author_id, p.created_at
+FROM follows f
+JOIN users u ON u.id = f.followee_id AND u.follower_count < %(threshold)s
+CROSS JOIN LATERAL (
+    SELECT id, author_id, created_at FROM posts
+    WHERE author_id = f.followee_id AND deleted_at IS NULL
+    ORDER BY created_at DESC, id DESC
+    LIMIT %(limit)s
+) p
+ON CONFLICT DO NOTHING
+"""
+
+
+def _run(raw_conn: Any, label: str, sql: str, params: Optional[dict] = None) -> None:
+    started = time.perf_counter()
+    with raw_conn.cursor() as cur:
+        cur.execute(sql, params)
+        rows = cur.rowcount
+    raw_conn.commit()
+    print(f"{label}: {max(rows, 0)} rows in {time.perf_counter() - started:.1f}s", flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("directory", help="directory containing <table>.csv / <table>.ndjson files")
+    parser.add_argument(
+        "--tables", nargs="+", help="only these tables (still loaded in FK order)"
+    )
+    parser.add_argument(
+        "--truncate", action="store_true",
+        help="TRUNCATE ... CASCADE every table being loaded first",
+    )
+    parser.add_argument("--recompute-counters", action="store_true")
+    parser.add_argument("--timelines", action="store_true")
+    args = parser.parse_args()
+
+    plan = []
+    for table in Base.metadata.sorted_tables:  # parents before children
+        if args.tables and table.name not in args.tables:
+            continue
+        found = _find_file(args.directory, table.name)
+        if found is not None:
+            plan.append((table, *found))
+    if not plan:
+        sys.exit(f"No importable files found in {args.directory}.")
+
+    raw_conn = _engine.raw_connection()
+    try:
+        if args.truncate:
+            names = ", ".join(table.name for table, _, _ in plan)
+            _run(raw_conn, f"truncate {names}", f"TRUNCATE {names} RESTART IDENTITY CASCADE")
+
+        for table, path, fmt in plan:
+            started = time.perf_counter()
+            rows = _copy_table(raw_conn, table, path, fmt)
+            _reset_sequence(raw_conn, table)
+            raw_conn.commit()
+            elapsed = time.perf_counter() - started
+            print(f"{table.name}: {rows} rows from {path} in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s)", flush=True)
+
+        if args.recompute_counters:
+            for label, sql in RECOMPUTE_COUNTERS.items():
+                _run(raw_conn, label, sql)
+        if args.timelines:
+            _run(
+                raw_conn, "timeline_entries", MATERIALIZE_TIMELINES,
+                {"threshold": settings.FEED_FANOUT_THRESHOLD, "limit": settings.FEED_BACKFILL_LIMIT},
+            )
+
+        with raw_conn.cursor() as cur:
+            cur.execute("ANALYZE " + ", ".join(table.name for table, _, _ in plan))
+        raw_conn.commit()
+    except BaseException:
+        raw_conn.rollback()
+        raise
+    finally:
+        raw_conn.close()
+
+
+if __name__ == "__main__":
+    main()
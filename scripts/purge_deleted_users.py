@@ -0,0 +1,27 @@
+"""
+Run the batched purge of deleted users until no job is left.
+
+For deployments with USER_DELETION_ENABLED=false in the API processes (or
+to drain a backlog); safe to run next to API workers, jobs are leased.
+
+    python -m scripts.purge_deleted_users --batch-size 1000 --pause-ms 50
+"""
+import argparse
+
+from config.settings import settings
+from services.user_deletion import UserDeletionWorker
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=settings.USER_DELETION_BATCH_SIZE)
+    parser.add_argument("--pause-ms", type=int, default=settings.USER_DELETION_BATCH_PAUSE_MS)
+    args = parser.parse_args()
+
+    worker = UserDeletionWorker(batch_size=args.batch_size, pause_ms=args.pause_ms)
+    finished = worker.run_pending()
+    print(f"Deleted {finished} users.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+Recompute posts.like_count / posts.comment_count from likes and comments.
+
+    python -m scripts.reconcile_counters --batch-size 10000
+"""
+import argparse
+
+from db.session import SessionLocal
+from services.counters import CounterService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        fixed = CounterService().reconcile(db, args.batch_size)
+    finally:
+        db.close()
+    print(f"Corrected counters on {fixed} posts.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from core.errors import NotFoundError
+from core.pagination import decode_cursor, split_page
+from db.routing import replica_read
+from dtos.comments import CommentPage
+from repositories.comment import CommentRepository
+
+
+class CommentService:
+    """
+    Application service that implements use-cases around Comment.
+    """
+
+    def __init__(self, comment_repo: Optional[CommentRepository] = None) -> None:
+        self._comment_repo = comment_repo or CommentRepository()
+
+    @replica_read
+    def get_comments(
+        self, db: Session, post_id: int, limit: int = 50, cursor: Optional[str] = None
+    ) -> CommentPage:
+        """
+        Get one page of a post's comments, oldest first.
+        - post must exist and not be deleted (checked by the page query itself)
+        """
+        comments = self._comment_repo.get_by_post_id(db, post_id, limit + 1, decode_cursor(cursor))
+        if comments is None:
+            raise NotFoundError(
+                "Post not found.",
+                details={"id": post_id},
+            )
+        return CommentPage(*split_page(comments, limit))
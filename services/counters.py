@@ -0,0 +1,132 @@
+import logging
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from db.session import SessionLocal
+from repositories.post import PostRepository
+
+logger = logging.getLogger(__name__)
+
+
+class CounterAggregator:
+    """
+    Write-behind aggregator for posts.like_count / posts.comment_count.
+
+    Writers call `add_likes` / `add_comments` (in memory, no SQL); a daemon
+    thread flushes the accumulated deltas every COUNTER_FLUSH_INTERVAL seconds
+    with one UPDATE per touched post, so a viral post taking 1,000 likes a
+    second costs one row update per interval instead of 1,000.
+
+    Deltas still in memory are lost if the process dies; the reconciliation
+    job (`CounterService.reconcile`) repairs that drift.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        post_repo: Optional[PostRepository] = None,
+        interval: Optional[float] = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._post_repo = post_repo or PostRepository()
+        self._interval = interval if interval is not None else settings.COUNTER_FLUSH_INTERVAL
+        self._lock = threading.Lock()
+        self._pending: Dict[int, List[int]] = defaultdict(lambda: [0, 0])
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_likes(self, post_id: int, delta: int = 1) -> None:
+        with self._lock:
+            self._pending[post_id][0] += delta
+
+    def add_comments(self, post_id: int, delta: int = 1) -> None:
+        with self._lock:
+            self._pending[post_id][1] += delta
+
+    def flush(self) -> int:
+        """
+        Apply and clear the pending deltas. Returns the number of posts updated.
+        On failure the deltas are merged back so the next flush retries them.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(lambda: [0, 0])
+
+        deltas = {
+            post_id: (likes, comments)
+            for post_id, (likes, comments) in pending.items()
+            if likes or comments
+        }
+        if not deltas:
+            return 0
+
+        db = self._session_factory()
+        try:
+            self._post_repo.apply_counter_deltas(db, deltas)
+            db.commit()
+        except Exception:
+            db.rollback()
+            with self._lock:
+                for post_id, (likes, comments) in deltas.items():
+                    self._pending[post_id][0] += likes
+                    self._pending[post_id][1] += comments
+            raise
+        finally:
+            db.close()
+        return len(deltas)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="counter-aggregator", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the flush thread and flush whatever is left.
+        """
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Counter flush failed; deltas kept for retry.")
+
+
+# Process-wide instance, started/stopped by the app lifespan.
+counter_aggregator = CounterAggregator()
+
+
+class CounterService:
+    """
+    Reconciliation of denormalized post counters against likes/comments.
+    """
+
+    def __init__(self, post_repo: Optional[PostRepository] = None) -> None:
+        self._post_repo = post_repo or PostRepository()
+
+    def reconcile(self, db: Session, batch_size: int = 10_000) -> int:
+        """
+        Recompute counters in id-range batches, committing after each batch
+        so no long transaction holds row locks. Returns posts corrected.
+
+        Deltas not yet flushed by a running aggregator are counted twice if
+        they land after the batch that covers their post; the next pass
+        fixes that.
+        """
+        fixed = 0
+        max_id = self._post_repo.get_max_id(db)
+        for start_id in range(1, max_id + 1, batch_size):
+            fixed += self._post_repo.reconcile_counters(db, start_id, start_id + batch_size)
+            db.commit()
+        return fixed
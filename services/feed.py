@@ -0,0 +1,98 @@
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from core.errors import NotFoundError, ValidationError
+from core.pagination import decode_cursor, split_page
+from db.routing import replica_read
+from dtos.feed import FollowDTO
+from dtos.posts import PostPage, PostRecord
+from repositories.follow import FollowRepository
+from repositories.timeline import TimelineRepository
+
+
+class FeedService:
+    """
+    Application service for the follow graph and the home timeline.
+
+    Hybrid fan-out: posts by authors below FEED_FANOUT_THRESHOLD followers are
+    written into each follower's timeline when created; posts by authors at
+    or above it are pulled in when the feed is read, so a celebrity post is
+    one row, not a write storm. An author who drops back below the threshold
+    only has posts from then on in timelines; earlier ones stay reachable
+    from their profile.
+    """
+
+    def __init__(
+        self,
+        follow_repo: Optional[FollowRepository] = None,
+        timeline_repo: Optional[TimelineRepository] = None,
+    ) -> None:
+        self._follow_repo = follow_repo or FollowRepository()
+        self._timeline_repo = timeline_repo or TimelineRepository()
+
+    def fan_out_post(self, db: Session, post: PostRecord) -> None:
+        """
+        Write-side half of the hybrid fan-out.
+        Runs inside the caller's transaction; does not commit.
+        """
+        self._timeline_repo.fan_out(db, post.id, settings.FEED_FANOUT_THRESHOLD)
+
+    def fan_out_posts(self, db: Session, post_ids: List[int]) -> None:
+        """
+        fan_out_post for a batch of new posts, in one statement.
+        """
+        self._timeline_repo.fan_out_many(db, post_ids, settings.FEED_FANOUT_THRESHOLD)
+
+    def follow(self, db: Session, data: FollowDTO) -> None:
+        """
+        Follow a user:
+        - users cannot follow themselves
+        - both users must exist and not be deleted
+        - following twice is a no-op
+        """
+        if data.follower_id == data.followee_id:
+            raise ValidationError(
+                "Users cannot follow themselves.",
+                details={"user_id": data.follower_id},
+            )
+
+        created = self._follow_repo.create(db, data.follower_id, data.followee_id)
+        if created is None:
+            raise NotFoundError(
+                "User not found.",
+                details={"follower_id": data.follower_id, "followee_id": data.followee_id},
+            )
+
+        if created:
+            self._follow_repo.adjust_follower_count(db, data.followee_id, 1)
+            self._timeline_repo.backfill(
+                db,
+                data.follower_id,
+                data.followee_id,
+                settings.FEED_BACKFILL_LIMIT,
+                settings.FEED_FANOUT_THRESHOLD,
+            )
+        db.commit()
+
+    def unfollow(self, db: Session, data: FollowDTO) -> None:
+        """
+        Unfollow a user. Unfollowing someone you don't follow is a no-op.
+        """
+        if self._follow_repo.delete(db, data.follower_id, data.followee_id):
+            self._follow_repo.adjust_follower_count(db, data.followee_id, -1)
+            self._timeline_repo.remove_author(db, data.follower_id, data.followee_id)
+        db.commit()
+
+    @replica_read
+    def get_feed(
+        self, db: Session, user_id: int, limit: int = 50, cursor: Optional[str] = None
+    ) -> PostPage:
+        """
+        Get one page of the user's home timeline, newest first.
+        """
+        posts = self._timeline_repo.get_page(
+            db, user_id, settings.FEED_FANOUT_THRESHOLD, limit + 1, decode_cursor(cursor)
+        )
+        return PostPage(*split_page(posts, limit))
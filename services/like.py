@@ -0,0 +1,186 @@
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from core.errors import NotFoundError
+from db.session import SessionLocal
+from dtos.likes import LikeDTO, LikeResultDTO
+from repositories.like import LikeRepository
+from services.counters import CounterAggregator, counter_aggregator
+
+logger = logging.getLogger(__name__)
+
+
+class LikeBuffer:
+    """
+    Optional in-process write coalescer for likes (LIKE_BUFFER_ENABLED).
+
+    Keeps only the latest desired state per (user_id, post_id), so a user
+    hammering like/unlike on one post within a window produces at most one
+    row change. Every LIKE_BUFFER_WINDOW_MS the window is written as one
+    multi-row INSERT ... ON CONFLICT DO NOTHING and one multi-row
+    DELETE ... RETURNING, and counter deltas come from the returned rows.
+
+    Trade-off: callers get "accepted", not the outcome; pairs pointing at
+    missing or deleted users/posts are skipped by the statement at flush
+    time. A flush that fails keeps its window for the next one.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        like_repo: Optional[LikeRepository] = None,
+        counters: CounterAggregator = counter_aggregator,
+        window_ms: Optional[int] = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._like_repo = like_repo or LikeRepository()
+        self._counters = counters
+        window_ms = window_ms if window_ms is not None else settings.LIKE_BUFFER_WINDOW_MS
+        self._interval = window_ms / 1000
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[int, int], bool] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, user_id: int, post_id: int, liked: bool) -> None:
+        with self._lock:
+            self._pending[(user_id, post_id)] = liked
+
+    def flush(self) -> None:
+        """
+        Write the pending window. On failure the toggles are merged back
+        (a newer toggle of the same pair wins) so the next flush retries them.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        to_add = [pair for pair, liked in pending.items() if liked]
+        to_remove = [pair for pair, liked in pending.items() if not liked]
+
+        try:
+            try:
+                added, removed = self._write(to_add, to_remove)
+            except IntegrityError:
+                # A user/post was purged between the join and the insert;
+                # the joins skip it when the window is written again.
+                added, removed = self._write(to_add, to_remove)
+        except Exception:
+            with self._lock:
+                for pair, liked in pending.items():
+                    self._pending.setdefault(pair, liked)
+            raise
+
+        for _, post_id in added:
+            self._counters.add_likes(post_id, 1)
+        for _, post_id in removed:
+            self._counters.add_likes(post_id, -1)
+
+    def _write(
+        self, to_add: List[Tuple[int, int]], to_remove: List[Tuple[int, int]]
+    ) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+        db = self._session_factory()
+        try:
+            added = self._like_repo.add_many(db, to_add)
+            removed = self._like_repo.remove_many(db, to_remove)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        return added, removed
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="like-buffer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the flush thread and write the last window.
+        """
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Like buffer flush failed; toggles kept for retry.")
+
+
+# Process-wide instance, started/stopped by the app lifespan when enabled.
+like_buffer = LikeBuffer()
+
+
+class LikeService:
+    """
+    Application service that implements use-cases around Like.
+    Like and unlike are idempotent: repeating them is a successful no-op.
+    """
+
+    def __init__(
+        self,
+        like_repo: Optional[LikeRepository] = None,
+        counters: CounterAggregator = counter_aggregator,
+        buffer: Optional[LikeBuffer] = None,
+    ) -> None:
+        self._like_repo = like_repo or LikeRepository()
+        self._counters = counters
+        if buffer is None and settings.LIKE_BUFFER_ENABLED:
+            buffer = like_buffer
+        self._buffer = buffer
+
+    def like(self, db: Session, data: LikeDTO) -> LikeResultDTO:
+        """
+        Like a post.
+        - post must exist and not be deleted
+        - user must exist and not be deleted
+        """
+        if self._buffer is not None:
+            self._buffer.submit(data.user_id, data.post_id, True)
+            return LikeResultDTO(data.user_id, data.post_id, liked=True, changed=None)
+
+        user_live, post_live, created = self._like_repo.add(db, data.user_id, data.post_id)
+        if not user_live:
+            raise NotFoundError(
+                "User not found.",
+                details={"user_id": data.user_id},
+            )
+        if not post_live:
+            raise NotFoundError(
+                "Post not found.",
+                details={"id": data.post_id},
+            )
+
+        db.commit()
+        if created:
+            self._counters.add_likes(data.post_id, 1)
+        return LikeResultDTO(data.user_id, data.post_id, liked=True, changed=created)
+
+    def unlike(self, db: Session, data: LikeDTO) -> LikeResultDTO:
+        """
+        Remove a like. Unliking something never liked is a no-op.
+        """
+        if self._buffer is not None:
+            self._buffer.submit(data.user_id, data.post_id, False)
+            return LikeResultDTO(data.user_id, data.post_id, liked=False, changed=None)
+
+        removed = self._like_repo.remove(db, data.user_id, data.post_id)
+        db.commit()
+        if removed:
+            self._counters.add_likes(data.post_id, -1)
+        return LikeResultDTO(data.user_id, data.post_id, liked=False, changed=removed)
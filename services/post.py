@@ -1,11 +1,81 @@
-from typing import Optional, List
+from datetime import datetime
+from typing import AsyncIterator, Iterator, Optional, List, Set, Tuple
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from dtos.posts import CreatePostDTO, UpdatePostDTO, DeletePostDTO
+from config.settings import settings
+from dtos.bulk import BulkItemResult
+from dtos.posts import (
+    CreatePostDTO,
+    UpdatePostDTO,
+    DeletePostDTO,
+    PostBatch,
+    PostExportFilter,
+    PostPage,
+    PostRecord,
+)
+from core.cache import MISSING, Cache, cache as default_cache, post_key
 from core.errors import NotFoundError, ValidationError
-from models.post import Post
-from repositories.post import PostRepository
+from core.pagination import batch_ids, decode_cursor, split_page
+from db.routing import replica_read, replica_stream, replica_stream_async
+from repositories.post import AsyncPostRepository, PostRepository
+from repositories.user import AsyncUserRepository, UserRepository
+from services.feed import FeedService
+
+
+def _validate_new_posts(
+    items: List[CreatePostDTO], existing_authors: Set[int]
+) -> Tuple[List[BulkItemResult], List[dict]]:
+    """
+    Apply create_post's rules to every item of a bulk create up front.
+    Returns one result per item (error set for rejected ones) and the
+    column dicts of the accepted items, in the same order.
+    """
+    results, rows = [], []
+    for index, data in enumerate(items):
+        result = BulkItemResult(index)
+        if not data.content or not data.content.strip():
+            result.error = ValidationError(
+                "Post content cannot be empty.",
+                details={"content": data.content},
+            )
+        elif data.author_id not in existing_authors:
+            result.error = NotFoundError(
+                "Author not found.",
+                details={"author_id": data.author_id},
+            )
+        else:
+            rows.append(
+                {"author_id": data.author_id, "content": data.content, "caption": data.caption}
+            )
+        results.append(result)
+    return results, rows
+
+
+def _update_values(data: UpdatePostDTO) -> dict:
+    """
+    Columns to set for an update; content must not be blank.
+    """
+    values: dict = {}
+    if data.content is not None:
+        if not data.content.strip():
+            raise ValidationError(
+                "Post content cannot be empty.",
+                details={"content": data.content},
+            )
+        values["content"] = data.content
+    if data.caption is not None:
+        values["caption"] = data.caption
+    return values
+
+
+def _validate_export_filter(filters: PostExportFilter) -> None:
+    if filters.since is not None and filters.until is not None and filters.since >= filters.until:
+        raise ValidationError(
+            "since must be before until.",
+            details={"since": filters.since.isoformat(), "until": filters.until.isoformat()},
+        )
 
 
 class PostService:
@@ -13,13 +83,23 @@ class PostService:
     Application service that implements use-cases around Post.
     """
 
-    def __init__(self, post_repo: Optional[PostRepository] = None) -> None:
+    def __init__(
+        self,
+        post_repo: Optional[PostRepository] = None,
+        feed_service: Optional[FeedService] = None,
+        cache: Optional[Cache] = None,
+        user_repo: Optional[UserRepository] = None,
+    ) -> None:
         self._post_repo = post_repo or PostRepository()
+        self._user_repo = user_repo or UserRepository()
+        self._feed = feed_service or FeedService()
+        self._cache = cache or default_cache
 
-    def create_post(self, db: Session, data: CreatePostDTO) -> Post:
+    def create_post(self, db: Session, data: CreatePostDTO) -> PostRecord:
         """
         Create a new post with basic business rules:
         - content must not be empty
+        - author must exist and not be deleted (checked by the INSERT itself)
         """
         if not data.content or not data.content.strip():
             raise ValidationError(
@@ -27,44 +107,60 @@ class PostService:
                 details={"content": data.content},
             )
 
-        post = Post(
-            author_id=data.author_id,
-            content=data.content,
-            caption=data.caption,
+        post = self._post_repo.create(
+            db, {"author_id": data.author_id, "content": data.content, "caption": data.caption}
         )
-
-        post = self._post_repo.create(db, post)
+        if post is None:
+            raise NotFoundError(
+                "Author not found.",
+                details={"author_id": data.author_id},
+            )
+        self._feed.fan_out_post(db, post)
         db.commit()
-        db.refresh(post)
+        self._cache.set(post_key(post.id), post)
+        self._post_repo.loader(db).prime([post])
         return post
 
-    def update_post(self, db: Session, data: UpdatePostDTO) -> Post:
+    def create_posts(self, db: Session, items: List[CreatePostDTO]) -> List[BulkItemResult]:
+        """
+        Bulk create: every item is validated first (create_post's rules plus
+        one query for author existence), accepted items are inserted with a
+        single multi-row INSERT ... RETURNING, fanned out, and committed once.
+        Rejected items are reported per index and do not fail the batch.
+        """
+        author_ids = list({data.author_id for data in items})
+        existing = self._user_repo.get_existing_ids(db, author_ids)
+        results, rows = _validate_new_posts(items, existing)
+        if rows:
+            created = iter(self._post_repo.create_many(db, rows))
+            for result in results:
+                if result.error is None:
+                    result.data = next(created)
+            post_ids = [result.data.id for result in results if result.error is None]
+            self._feed.fan_out_posts(db, post_ids)
+            db.commit()
+        return results
+
+    def update_post(self, db: Session, data: UpdatePostDTO) -> PostRecord:
         """
         Update an existing post.
         - post must exist
         - at least one field must be provided for update
         """
-        existing = self._post_repo.get_by_id(db, data.id)
-        if existing is None:
+        values = _update_values(data)
+        if values:
+            post = self._post_repo.update(db, data.id, values)
+        else:
+            post = self._post_repo.get_record_by_id(db, data.id)
+        if post is None:
             raise NotFoundError(
                 "Post not found.",
                 details={"id": data.id},
             )
 
-        if data.content is not None:
-            if not data.content.strip():
-                raise ValidationError(
-                    "Post content cannot be empty.",
-                    details={"content": data.content},
-                )
-            existing.content = data.content
-
-        if data.caption is not None:
-            existing.caption = data.caption
-
-        post = self._post_repo.update(db, existing)
         db.commit()
-        db.refresh(post)
+        self._cache.set(post_key(post.id), post)
+        self._post_repo.loader(db).prime([post])
         return post
 
     def delete_post(self, db: Session, data: DeletePostDTO) -> None:
@@ -72,37 +168,303 @@ class PostService:
         Soft delete a post.
         - post must exist
         """
-        existing = self._post_repo.get_by_id(db, data.id)
-        if existing is None:
+        if not self._post_repo.delete(db, data.id):
             raise NotFoundError(
                 "Post not found.",
                 details={"id": data.id},
             )
 
-        self._post_repo.delete(db, existing)
         db.commit()
+        self._cache.delete(post_key(data.id))
+        self._post_repo.loader(db).clear(data.id)
+
+    @replica_read
+    def get_posts_by_ids(self, db: Session, ids: List[int]) -> PostBatch:
+        """
+        Batch lookup by id: cache first, then one query for the rest
+        (cached unless it was served by a replica).
+        - at most BATCH_MAX_IDS distinct ids
+        Found posts keep request order; unknown ids are reported as missing.
+        """
+        ids = batch_ids(ids, settings.BATCH_MAX_IDS)
+        cached = self._cache.get_many([post_key(id) for id in ids])
+        found = {post.id: post for post in cached.values()}
+        misses = [id for id in ids if id not in found]
+        if misses:
+            loaded = self._post_repo.loader(db).load_many(misses)
+            if not db.reads_from_replica():
+                self._cache.set_many({post_key(id): post for id, post in loaded.items()})
+            found.update(loaded)
+        return PostBatch(
+            [found[id] for id in ids if id in found],
+            [id for id in ids if id not in found],
+        )
 
-    def get_post_by_id(self, db: Session, id: int) -> Post:
+    @replica_read
+    def get_post_version(self, db: Session, id: int) -> Tuple[int, datetime]:
         """
-        Get a post by id.
+        (version, updated_at) of a post, read from the database (never the
+        cache) so conditional GETs validate against the current row.
         - post must exist
         """
-        existing = self._post_repo.get_by_id(db, id)
-        if existing is None:
+        version = self._post_repo.get_version(db, id)
+        if version is None:
             raise NotFoundError(
                 "Post not found.",
                 details={"id": id},
             )
-        return existing
+        return version
+
+    @replica_read
+    def get_post_by_id(
+        self, db: Session, id: int, min_version: Optional[int] = None
+    ) -> PostRecord:
+        """
+        Get a post by id (read-through cache; writes refresh or invalidate
+        it, and rows read from a replica are not cached).
+        - post must exist
+        - a cached copy older than `min_version` is reloaded
+        """
+        key = post_key(id)
+        post = self._cache.get(key)
+        if post is MISSING or (min_version is not None and post.version < min_version):
+            post = self._post_repo.loader(db).load(id)
+            if post is None:
+                raise NotFoundError(
+                    "Post not found.",
+                    details={"id": id},
+                )
+            if not db.reads_from_replica():
+                self._cache.set(key, post)
+        return post
+
+    @replica_read
+    def get_posts_by_author(
+        self, db: Session, author_id: int, limit: int = 50, cursor: Optional[str] = None
+    ) -> PostPage:
+        """
+        Get one page of posts by a specific author, newest first.
+        """
+        posts = self._post_repo.get_records_by_author_id(
+            db, author_id, limit + 1, decode_cursor(cursor)
+        )
+        self._post_repo.loader(db).prime(posts)
+        return PostPage(*split_page(posts, limit))
 
-    def get_posts_by_author(self, db: Session, author_id: int) -> List[Post]:
+    @replica_read
+    def get_all_posts(
+        self, db: Session, limit: int = 100, cursor: Optional[str] = None
+    ) -> PostPage:
         """
-        Get all posts by a specific author.
+        Get one page of posts, newest first (keyset pagination).
         """
-        return self._post_repo.get_by_author_id(db, author_id)
+        posts = self._post_repo.get_all_records(db, limit + 1, decode_cursor(cursor))
+        self._post_repo.loader(db).prime(posts)
+        return PostPage(*split_page(posts, limit))
 
-    def get_all_posts(self, db: Session, limit: int = 100, offset: int = 0) -> List[Post]:
+    def export_posts(self, db: Session, filters: PostExportFilter) -> Iterator[List[PostRecord]]:
         """
-        Get all posts with pagination.
+        Every live post matching `filters`, oldest first, in chunks of
+        EXPORT_CHUNK_SIZE.
+        - since must be before until
+        Filters are validated on call; rows are read (from a replica when
+        there is one) as the iterator is consumed, so `db` must stay open
+        until then.
         """
-        return self._post_repo.get_all(db, limit, offset)
+        _validate_export_filter(filters)
+        return replica_stream(self._post_repo.stream_records(db, filters, settings.EXPORT_CHUNK_SIZE))
+
+
+class AsyncPostService:
+    """
+    AsyncSession counterpart of PostService (used when DB_ASYNC is enabled).
+    Business rules must stay identical to PostService.
+    """
+
+    def __init__(
+        self,
+        post_repo: Optional[AsyncPostRepository] = None,
+        feed_service: Optional[FeedService] = None,
+        cache: Optional[Cache] = None,
+        user_repo: Optional[AsyncUserRepository] = None,
+    ) -> None:
+        self._post_repo = post_repo or AsyncPostRepository()
+        self._user_repo = user_repo or AsyncUserRepository()
+        self._feed = feed_service or FeedService()
+        self._cache = cache or default_cache
+
+    async def create_post(self, db: AsyncSession, data: CreatePostDTO) -> PostRecord:
+        """
+        Create a new post with basic business rules:
+        - content must not be empty
+        - author must exist and not be deleted (checked by the INSERT itself)
+        """
+        if not data.content or not data.content.strip():
+            raise ValidationError(
+                "Post content cannot be empty.",
+                details={"content": data.content},
+            )
+
+        post = await self._post_repo.create(
+            db, {"author_id": data.author_id, "content": data.content, "caption": data.caption}
+        )
+        if post is None:
+            raise NotFoundError(
+                "Author not found.",
+                details={"author_id": data.author_id},
+            )
+        # FeedService is sync-only; run_sync executes it on this session's
+        # connection inside the greenlet, without a worker thread.
+        await db.run_sync(lambda session: self._feed.fan_out_post(session, post))
+        await db.commit()
+        self._cache.set(post_key(post.id), post)
+        self._post_repo.loader(db).prime([post])
+        return post
+
+    async def create_posts(self, db: AsyncSession, items: List[CreatePostDTO]) -> List[BulkItemResult]:
+        """
+        Bulk create: every item is validated first (create_post's rules plus
+        one query for author existence), accepted items are inserted with a
+        single multi-row INSERT ... RETURNING, fanned out, and committed once.
+        Rejected items are reported per index and do not fail the batch.
+        """
+        author_ids = list({data.author_id for data in items})
+        existing = await self._user_repo.get_existing_ids(db, author_ids)
+        results, rows = _validate_new_posts(items, existing)
+        if rows:
+            created = iter(await self._post_repo.create_many(db, rows))
+            for result in results:
+                if result.error is None:
+                    result.data = next(created)
+            post_ids = [result.data.id for result in results if result.error is None]
+            # FeedService is sync-only; see create_post.
+            await db.run_sync(lambda session: self._feed.fan_out_posts(session, post_ids))
+            await db.commit()
+        return results
+
+    async def update_post(self, db: AsyncSession, data: UpdatePostDTO) -> PostRecord:
+        """
+        Update an existing post.
+        - post must exist
+        - at least one field must be provided for update
+        """
+        values = _update_values(data)
+        if values:
+            post = await self._post_repo.update(db, data.id, values)
+        else:
+            post = await self._post_repo.get_record_by_id(db, data.id)
+        if post is None:
+            raise NotFoundError(
+                "Post not found.",
+                details={"id": data.id},
+            )
+
+        await db.commit()
+        self._cache.set(post_key(post.id), post)
+        self._post_repo.loader(db).prime([post])
+        return post
+
+    async def delete_post(self, db: AsyncSession, data: DeletePostDTO) -> None:
+        """
+        Soft delete a post.
+        - post must exist
+        """
+        if not await self._post_repo.delete(db, data.id):
+            raise NotFoundError(
+                "Post not found.",
+                details={"id": data.id},
+            )
+
+        await db.commit()
+        self._cache.delete(post_key(data.id))
+        self._post_repo.loader(db).clear(data.id)
+
+    @replica_read
+    async def get_posts_by_ids(self, db: AsyncSession, ids: List[int]) -> PostBatch:
+        """
+        Batch lookup by id: cache first, then one query for the rest
+        (cached unless it was served by a replica).
+        - at most BATCH_MAX_IDS distinct ids
+        Found posts keep request order; unknown ids are reported as missing.
+        """
+        ids = batch_ids(ids, settings.BATCH_MAX_IDS)
+        cached = self._cache.get_many([post_key(id) for id in ids])
+        found = {post.id: post for post in cached.values()}
+        misses = [id for id in ids if id not in found]
+        if misses:
+            loaded = await self._post_repo.loader(db).load_many(misses)
+            if not db.sync_session.reads_from_replica():
+                self._cache.set_many({post_key(id): post for id, post in loaded.items()})
+            found.update(loaded)
+        return PostBatch(
+            [found[id] for id in ids if id in found],
+            [id for id in ids if id not in found],
+        )
+
+    @replica_read
+    async def get_post_version(self, db: AsyncSession, id: int) -> Tuple[int, datetime]:
+        """
+        (version, updated_at) of a post, read from the database (never the
+        cache) so conditional GETs validate against the current row.
+        - post must exist
+        """
+        version = await self._post_repo.get_version(db, id)
+        if version is None:
+            raise NotFoundError(
+                "Post not found.",
+                details={"id": id},
+            )
+        return version
+
+    @replica_read
+    async def get_post_by_id(
+        self, db: AsyncSession, id: int, min_version: Optional[int] = None
+    ) -> PostRecord:
+        """
+        Get a post by id (read-through cache; writes refresh or invalidate
+        it, and rows read from a replica are not cached).
+        - post must exist
+        - a cached copy older than `min_version` is reloaded
+        """
+        key = post_key(id)
+        post = self._cache.get(key)
+        if post is MISSING or (min_version is not None and post.version < min_version):
+            post = await self._post_repo.loader(db).load(id)
+            if post is None:
+                raise NotFoundError(
+                    "Post not found.",
+                    details={"id": id},
+                )
+            if not db.sync_session.reads_from_replica():
+                self._cache.set(key, post)
+        return post
+
+    @replica_read
+    async def get_posts_by_author(
+        self, db: AsyncSession, author_id: int, limit: int = 50, cursor: Optional[str] = None
+    ) -> PostPage:
+        """
+        Get one page of posts by a specific author, newest first.
+        """
+        posts = await self._post_repo.get_records_by_author_id(
+            db, author_id, limit + 1, decode_cursor(cursor)
+        )
+        self._post_repo.loader(db).prime(posts)
+        return PostPage(*split_page(posts, limit))
+
+    @replica_read
+    async def get_all_posts(
+        self, db: AsyncSession, limit: int = 100, cursor: Optional[str] = None
+    ) -> PostPage:
+        """
+        Get one page of posts, newest first (keyset pagination).
+        """
+        posts = await self._post_repo.get_all_records(db, limit + 1, decode_cursor(cursor))
+        self._post_repo.loader(db).prime(posts)
+        return PostPage(*split_page(posts, limit))
+
+    def export_posts(
+        self, db: AsyncSession, filters: PostExportFilter
+    ) -> AsyncIterator[List[PostRecord]]:
+        _validate_export_filter(filters)
+        return replica_stream_async(self._post_repo.stream_records(db, filters, settings.EXPORT_CHUNK_SIZE))
@@ -1,11 +1,19 @@
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from dtos.users import CreateUserDTO, DeleteUserDTO
+from config.settings import settings
+from dtos.bulk import BulkItemResult
+from dtos.users import CreateUserDTO, DeleteUserDTO, UserBatch, UserDeletionRecord, UserRecord
+from core.cache import MISSING, Cache, cache as default_cache, post_key, user_key
 from core.errors import ConflictError, NotFoundError
-from models.user import User
-from repositories.user import UserRepository
+from core.pagination import batch_ids
+from db.routing import replica_read
+from repositories.user import AsyncUserRepository, UserRepository
+from repositories.user_deletion import AsyncUserDeletionRepository, UserDeletionRepository
+from services.user_deletion import user_deletion_worker
 
 
 class UserService:
@@ -13,56 +21,317 @@ class UserService:
     Application service that implements use-cases around User.
     """
 
-    def __init__(self, user_repo: Optional[UserRepository] = None) -> None:
+    def __init__(
+        self,
+        user_repo: Optional[UserRepository] = None,
+        deletion_repo: Optional[UserDeletionRepository] = None,
+        cache: Optional[Cache] = None,
+    ) -> None:
         self._user_repo = user_repo or UserRepository()
+        self._deletion_repo = deletion_repo or UserDeletionRepository()
+        self._cache = cache or default_cache
 
-    def create_user(self, db: Session, data: CreateUserDTO) -> User:
+    def create_user(self, db: Session, data: CreateUserDTO) -> UserRecord:
         """
         Create a new user with basic business rules:
-        - email must be unique
+        - email must be unique (ON CONFLICT DO NOTHING; no row back means taken)
         """
-        existing = self._user_repo.get_by_email(db, data.email)
-        if existing is not None:
+        user = self._user_repo.create(db, {"email": data.email, "name": data.name, "age": data.age})
+        if user is None:
             raise ConflictError(
                 "User with this email already exists.",
                 details={"email": data.email},
             )
 
-        user = User(
-            email=data.email,
-            name=data.name,
-            age=data.age,
-        )
-
-        user = self._user_repo.create(db, user)
         db.commit()
-        db.refresh(user)
+        self._cache.set(user_key(user.id), user)
+        self._user_repo.loader(db).prime([user])
         return user
 
+    def create_users(self, db: Session, items: List[CreateUserDTO]) -> List[BulkItemResult]:
+        """
+        Bulk create in one multi-row INSERT ... ON CONFLICT DO NOTHING
+        RETURNING and a single commit.
+        - email must be unique: repeats within the batch and emails that
+          already exist are reported per item as conflicts
+        """
+        results = [BulkItemResult(index) for index in range(len(items))]
+        first_by_email = {}
+        for result, data in zip(results, items):
+            if first_by_email.setdefault(data.email, result.index) != result.index:
+                result.error = ConflictError(
+                    "Duplicate email in batch.",
+                    details={"email": data.email, "index": first_by_email[data.email]},
+                )
+        rows = [
+            {"email": data.email, "name": data.name, "age": data.age}
+            for result, data in zip(results, items)
+            if result.error is None
+        ]
+        if rows:
+            created = {user.email: user for user in self._user_repo.create_many(db, rows)}
+            db.commit()
+            for result, data in zip(results, items):
+                if result.error is None:
+                    result.data = created.get(data.email)
+                    if result.data is None:
+                        result.error = ConflictError(
+                            "User with this email already exists.",
+                            details={"email": data.email},
+                        )
+        return results
+
     def delete_user(self, db: Session, id: int) -> None:
         """
-        Delete a user.
-        - user must exist
+        Delete a user: tombstone it (hidden from every read from now on,
+        its posts included) and queue the batched purge of the row and
+        everything referencing it (services.user_deletion), in one statement.
+        - user must exist and not already be deleted
         """
-        existing = self._user_repo.get_by_id(db, id)
-        if existing is None:
+        post_ids = self._deletion_repo.schedule(db, id)
+        if post_ids is None:
             raise NotFoundError(
                 "User not found.",
                 details={"id": id},
             )
 
-        self._user_repo.delete(db, existing)
         db.commit()
+        # The posts are hidden from reads now; their cached copies go too.
+        self._cache.delete_many([user_key(id), *map(post_key, post_ids)])
+        self._user_repo.loader(db).clear(id)
+        user_deletion_worker.wake()
+
+    @replica_read
+    def get_user_deletion(self, db: Session, id: int) -> UserDeletionRecord:
+        """
+        Progress of a user's deletion.
+        - the user must have been deleted
+        """
+        deletion = self._deletion_repo.get(db, id)
+        if deletion is None:
+            raise NotFoundError(
+                "User deletion not found.",
+                details={"id": id},
+            )
+        return deletion
+
+    @replica_read
+    def get_users_by_ids(self, db: Session, ids: List[int]) -> UserBatch:
+        """
+        Batch lookup by id: cache first, then one query for the rest
+        (cached unless it was served by a replica).
+        - at most BATCH_MAX_IDS distinct ids
+        Found users keep request order; unknown ids are reported as missing.
+        """
+        ids = batch_ids(ids, settings.BATCH_MAX_IDS)
+        cached = self._cache.get_many([user_key(id) for id in ids])
+        found = {user.id: user for user in cached.values()}
+        misses = [id for id in ids if id not in found]
+        if misses:
+            loaded = self._user_repo.loader(db).load_many(misses)
+            if not db.reads_from_replica():
+                self._cache.set_many({user_key(id): user for id, user in loaded.items()})
+            found.update(loaded)
+        return UserBatch(
+            [found[id] for id in ids if id in found],
+            [id for id in ids if id not in found],
+        )
+
+    @replica_read
+    def get_user_version(self, db: Session, id: int) -> Tuple[int, datetime]:
+        """
+        (version, updated_at) of a user, read from the database (never the
+        cache) so conditional GETs validate against the current row.
+        - user must exist
+        """
+        version = self._user_repo.get_version(db, id)
+        if version is None:
+            raise NotFoundError(
+                "User not found.",
+                details={"id": id},
+            )
+        return version
+
+    @replica_read
+    def get_user_by_id(
+        self, db: Session, id: int, min_version: Optional[int] = None
+    ) -> UserRecord:
+        """
+        Get a user by id (read-through cache; delete_user invalidates it,
+        and rows read from a replica are not cached).
+        - user must exist
+        - a cached copy older than `min_version` is reloaded
+        """
+        key = user_key(id)
+        user = self._cache.get(key)
+        if user is MISSING or (min_version is not None and user.version < min_version):
+            user = self._user_repo.loader(db).load(id)
+            if user is None:
+                raise NotFoundError(
+                    "User not found.",
+                    details={"id": id},
+                )
+            if not db.reads_from_replica():
+                self._cache.set(key, user)
+        return user
+
+
+class AsyncUserService:
+    """
+    AsyncSession counterpart of UserService (used when DB_ASYNC is enabled).
+    Business rules must stay identical to UserService.
+    """
+
+    def __init__(
+        self,
+        user_repo: Optional[AsyncUserRepository] = None,
+        deletion_repo: Optional[AsyncUserDeletionRepository] = None,
+        cache: Optional[Cache] = None,
+    ) -> None:
+        self._user_repo = user_repo or AsyncUserRepository()
+        self._deletion_repo = deletion_repo or AsyncUserDeletionRepository()
+        self._cache = cache or default_cache
+
+    async def create_user(self, db: AsyncSession, data: CreateUserDTO) -> UserRecord:
+        """
+        Create a new user with basic business rules:
+        - email must be unique (ON CONFLICT DO NOTHING; no row back means taken)
+        """
+        user = await self._user_repo.create(db, {"email": data.email, "name": data.name, "age": data.age})
+        if user is None:
+            raise ConflictError(
+                "User with this email already exists.",
+                details={"email": data.email},
+            )
+
+        await db.commit()
+        self._cache.set(user_key(user.id), user)
+        self._user_repo.loader(db).prime([user])
+        return user
 
-    def get_user_by_id(self, db: Session, id: int) -> User:
+    async def create_users(self, db: AsyncSession, items: List[CreateUserDTO]) -> List[BulkItemResult]:
         """
-        Get a user by id.
+        Bulk create in one multi-row INSERT ... ON CONFLICT DO NOTHING
+        RETURNING and a single commit.
+        - email must be unique: repeats within the batch and emails that
+          already exist are reported per item as conflicts
+        """
+        results = [BulkItemResult(index) for index in range(len(items))]
+        first_by_email = {}
+        for result, data in zip(results, items):
+            if first_by_email.setdefault(data.email, result.index) != result.index:
+                result.error = ConflictError(
+                    "Duplicate email in batch.",
+                    details={"email": data.email, "index": first_by_email[data.email]},
+                )
+        rows = [
+            {"email": data.email, "name": data.name, "age": data.age}
+            for result, data in zip(results, items)
+            if result.error is None
+        ]
+        if rows:
+            created = {user.email: user for user in await self._user_repo.create_many(db, rows)}
+            await db.commit()
+            for result, data in zip(results, items):
+                if result.error is None:
+                    result.data = created.get(data.email)
+                    if result.data is None:
+                        result.error = ConflictError(
+                            "User with this email already exists.",
+                            details={"email": data.email},
+                        )
+        return results
+
+    async def delete_user(self, db: AsyncSession, id: int) -> None:
+        """
+        Delete a user: tombstone it (hidden from every read from now on,
+        its posts included) and queue the batched purge of the row and
+        everything referencing it (services.user_deletion), in one statement.
+        - user must exist and not already be deleted
+        """
+        post_ids = await self._deletion_repo.schedule(db, id)
+        if post_ids is None:
+            raise NotFoundError(
+                "User not found.",
+                details={"id": id},
+            )
+
+        await db.commit()
+        # The posts are hidden from reads now; their cached copies go too.
+        self._cache.delete_many([user_key(id), *map(post_key, post_ids)])
+        self._user_repo.loader(db).clear(id)
+        user_deletion_worker.wake()
+
+    @replica_read
+    async def get_user_deletion(self, db: AsyncSession, id: int) -> UserDeletionRecord:
+        """
+        Progress of a user's deletion.
+        - the user must have been deleted
+        """
+        deletion = await self._deletion_repo.get(db, id)
+        if deletion is None:
+            raise NotFoundError(
+                "User deletion not found.",
+                details={"id": id},
+            )
+        return deletion
+
+    @replica_read
+    async def get_users_by_ids(self, db: AsyncSession, ids: List[int]) -> UserBatch:
+        """
+        Batch lookup by id: cache first, then one query for the rest
+        (cached unless it was served by a replica).
+        - at most BATCH_MAX_IDS distinct ids
+        Found users keep request order; unknown ids are reported as missing.
+        """
+        ids = batch_ids(ids, settings.BATCH_MAX_IDS)
+        cached = self._cache.get_many([user_key(id) for id in ids])
+        found = {user.id: user for user in cached.values()}
+        misses = [id for id in ids if id not in found]
+        if misses:
+            loaded = await self._user_repo.loader(db).load_many(misses)
+            if not db.sync_session.reads_from_replica():
+                self._cache.set_many({user_key(id): user for id, user in loaded.items()})
+            found.update(loaded)
+        return UserBatch(
+            [found[id] for id in ids if id in found],
+            [id for id in ids if id not in found],
+        )
+
+    @replica_read
+    async def get_user_version(self, db: AsyncSession, id: int) -> Tuple[int, datetime]:
+        """
+        (version, updated_at) of a user, read from the database (never the
+        cache) so conditional GETs validate against the current row.
         - user must exist
         """
-        existing = self._user_repo.get_by_id(db, id)
-        if existing is None:
+        version = await self._user_repo.get_version(db, id)
+        if version is None:
             raise NotFoundError(
                 "User not found.",
                 details={"id": id},
             )
-        return existing
\ No newline at end of file
+        return version
+
+    @replica_read
+    async def get_user_by_id(
+        self, db: AsyncSession, id: int, min_version: Optional[int] = None
+    ) -> UserRecord:
+        """
+        Get a user by id (read-through cache; delete_user invalidates it,
+        and rows read from a replica are not cached).
+        - user must exist
+        - a cached copy older than `min_version` is reloaded
+        """
+        key = user_key(id)
+        user = self._cache.get(key)
+        if user is MISSING or (min_version is not None and user.version < min_version):
+            user = await self._user_repo.loader(db).load(id)
+            if user is None:
+                raise NotFoundError(
+                    "User not found.",
+                    details={"id": id},
+                )
+            if not db.sync_session.reads_from_replica():
+                self._cache.set(key, user)
+        return user
@@ -0,0 +1,204 @@
+import logging
+import threading
+import uuid
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from core.cache import Cache, cache as default_cache, post_key
+from core.metrics import registry
+from db.session import SessionLocal
+from repositories.post import PostRepository
+from repositories.user_deletion import DONE, PURGE_STEPS, UserDeletionRepository
+
+logger = logging.getLogger(__name__)
+
+user_deletion_rows = registry.counter(
+    "user_deletion_rows_total",
+    "Rows removed (or, for hide_posts, soft-deleted) by the user purge, by step.",
+    ("step",),
+)
+
+
+def _counter_deltas(step: str, post_ids: List[int]) -> Dict[int, Tuple[int, int]]:
+    """
+    (likes, comments) deltas for the posts of a likes/comments batch, one
+    row removed per returned id.
+    """
+    if step == "likes":
+        return {post_id: (-count, 0) for post_id, count in Counter(post_ids).items()}
+    return {post_id: (0, -count) for post_id, count in Counter(post_ids).items()}
+
+
+class UserDeletionWorker:
+    """
+    Background purge of users tombstoned by UserService.delete_user.
+
+    Deleting a heavy user in one statement would cascade through millions of
+    likes, comments, follows and timeline rows in a single transaction,
+    holding their locks and writing all of the WAL at once. Instead each job
+    runs the steps of repositories.user_deletion.PURGE_STEPS in batches of
+    USER_DELETION_BATCH_SIZE rows: one short transaction per batch, which
+    also records the progress in user_deletions, with a pause of
+    USER_DELETION_BATCH_PAUSE_MS between batches so foreground traffic and
+    replicas keep up.
+
+    The counters the removed rows contributed to (posts' like and comment
+    counts, users' follower counts) are decremented in the batch's own
+    transaction, so a crash between batches loses nothing.
+
+    Jobs are leased (USER_DELETION_LEASE_SECONDS, renewed by every batch),
+    so several processes can run workers, and a job left behind by a crash
+    or shutdown is resumed at its recorded step. Re-running part of a step
+    is harmless: every batch deletes whatever is left.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        repo: Optional[UserDeletionRepository] = None,
+        post_repo: Optional[PostRepository] = None,
+        cache: Optional[Cache] = None,
+        batch_size: Optional[int] = None,
+        pause_ms: Optional[int] = None,
+        interval: Optional[float] = None,
+        lease_seconds: Optional[float] = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._repo = repo or UserDeletionRepository()
+        self._post_repo = post_repo or PostRepository()
+        self._cache = cache or default_cache
+        self._batch_size = batch_size or settings.USER_DELETION_BATCH_SIZE
+        pause_ms = pause_ms if pause_ms is not None else settings.USER_DELETION_BATCH_PAUSE_MS
+        self._pause = pause_ms / 1000
+        self._interval = interval if interval is not None else settings.USER_DELETION_POLL_INTERVAL
+        self._lease = lease_seconds if lease_seconds is not None else settings.USER_DELETION_LEASE_SECONDS
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def wake(self) -> None:
+        """
+        A job was queued; look for it now rather than at the next poll.
+        """
+        self._wake.set()
+
+    def run_pending(self) -> int:
+        """
+        Claim and finish jobs until none is left (or stop() is called).
+        Returns the number of jobs finished.
+        """
+        finished = 0
+        while not self._stop.is_set():
+            owner = uuid.uuid4().hex
+            db = self._session_factory()
+            try:
+                job = self._repo.claim(db, owner, self._lease)
+                db.commit()
+            finally:
+                db.close()
+            if job is None:
+                break
+            user_id, step = job
+            if self._purge(user_id, step, owner):
+                finished += 1
+        return finished
+
+    def _purge(self, user_id: int, step: str, owner: str) -> bool:
+        """
+        Run the job from `step` to the end. False if it was interrupted by
+        stop() (lease released) or lost to another worker.
+        """
+        while step != DONE:
+            if self._stop.is_set():
+                self._release(user_id, owner)
+                return False
+            next_step = self._batch(user_id, step, owner)
+            if next_step is None:
+                logger.warning("Lost the lease on the deletion of user %s.", user_id)
+                return False
+            if next_step == step:
+                self._stop.wait(self._pause)
+            step = next_step
+        logger.info("Deleted user %s.", user_id)
+        return True
+
+    def _batch(self, user_id: int, step: str, owner: str) -> Optional[str]:
+        """
+        One batch of `step`, committed together with the progress. Returns
+        the step to run next, or None if `owner` no longer holds the job.
+        """
+        db = self._session_factory()
+        try:
+            ids = self._repo.purge_batch(db, step, user_id, self._batch_size)
+            if step == "following":
+                self._repo.decrement_follower_counts(db, ids)
+            elif step in ("likes", "comments"):
+                self._post_repo.apply_counter_deltas(db, _counter_deltas(step, ids))
+            next_step = step
+            if len(ids) < self._batch_size:
+                index = PURGE_STEPS.index(step) + 1
+                next_step = PURGE_STEPS[index] if index < len(PURGE_STEPS) else DONE
+            # Hidden posts are counted when the "posts" step deletes them.
+            deleted = 0 if step == "hide_posts" else len(ids)
+            if not self._repo.advance(db, user_id, owner, next_step, deleted, self._lease):
+                db.rollback()
+                return None
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        self._after_commit(step, ids)
+        return next_step
+
+    def _after_commit(self, step: str, ids: List[int]) -> None:
+        if not ids:
+            return
+        user_deletion_rows.labels(step).inc(len(ids))
+        if step == "hide_posts":
+            self._cache.delete_many([post_key(post_id) for post_id in ids])
+
+    def _release(self, user_id: int, owner: str) -> None:
+        db = self._session_factory()
+        try:
+            self._repo.release(db, user_id, owner)
+            db.commit()
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._wake.set()  # pick up jobs left over from a previous run
+        self._thread = threading.Thread(target=self._run, name="user-deletion", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop after the current batch; an unfinished job is released and
+        resumed by the next worker to start.
+        """
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self._interval)
+            self._wake.clear()
+            try:
+                self.run_pending()
+            except Exception:
+                logger.exception("User deletion failed; the job is retried once its lease expires.")
+
+
+# Process-wide instance, started/stopped by the app lifespan when enabled.
+user_deletion_worker = UserDeletionWorker()